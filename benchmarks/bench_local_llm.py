@@ -0,0 +1,161 @@
+"""
+本地LLM翻译器连接池基准测试
+
+启动 `translate mock-server`（OpenAI兼容的模拟服务，真实的HTTP请求），用 LocalLLMTranslator
+在相同并发下分别以「每个请求新建客户端」和「复用连接池」两种方式翻译同一批段落，
+记录吞吐量（请求/秒）和耗时，结果保存为JSON以便在不同提交之间对比。
+
+两种方式都走同一条异步并发路径，只有HTTP客户端的创建方式不同，差异只来自连接复用。
+
+用法:
+    uv run python -m benchmarks.bench_local_llm
+    uv run python -m benchmarks.bench_local_llm --requests 400 --concurrency 8,64 --latency 0.01
+"""
+
+import json
+import platform
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import click
+import httpx
+from loguru import logger
+
+from .bench_pipeline import ROOT, _int_list, git_commit
+from src.translators import LocalLLMTranslator
+
+# 翻译的段落：长度相近、内容互不相同（模拟服务不缓存，仍避免结果完全一样）
+PARAGRAPH = (
+    "Paragraph {}: the proposed network was trained on photographs of the middle and "
+    "anterior face and evaluated against clinical measurements."
+)
+
+
+class PerRequestClientTranslator(LocalLLMTranslator):
+    """每个请求新建并关闭HTTP客户端（连接池之前的做法），作为对比基线"""
+
+    async def _request_async(self, system_prompt: str, content: str) -> str:
+        async with httpx.AsyncClient(**self._client_kwargs()) as client:
+            response = await client.post(
+                f"{self.base_url}/chat/completions",
+                json=self._build_payload(content, system_prompt),
+            )
+            return self._extract_content(response)
+
+
+def free_port() -> int:
+    """本机可用的端口"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mock_server(port: int, latency: float) -> subprocess.Popen:
+    """在子进程中启动模拟服务，等待其可以接受请求"""
+    process = subprocess.Popen(
+        [
+            sys.executable, str(ROOT / "translate.py"), "mock-server",
+            "--port", str(port), "--latency", str(latency), "--distribution", "fixed",
+        ],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise click.ClickException("模拟服务启动失败")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/v1/models", timeout=1).raise_for_status()
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise click.ClickException("等待模拟服务启动超时")
+
+
+def run_mode(
+    translator_class: type,
+    base_url: str,
+    texts: List[str],
+    concurrency: int,
+) -> dict:
+    """用指定方式翻译全部段落，返回耗时和吞吐量"""
+    translator = translator_class(
+        base_url=base_url,
+        model="mock",
+        max_concurrency=concurrency,
+        max_connections=concurrency,
+        max_keepalive_connections=concurrency,
+    )
+    try:
+        start = time.perf_counter()
+        results = translator.translate_batch(texts)
+        wall = time.perf_counter() - start
+    finally:
+        translator.close()
+    failed = sum(1 for result in results if result.error is not None)
+    return {
+        "wall_seconds": round(wall, 4),
+        "requests_per_second": round(len(texts) / wall, 2) if wall > 0 else None,
+        "requests": int(translator.metrics.counter("requests_total")),
+        "failed": failed,
+    }
+
+
+@click.command()
+@click.option("--requests", "count", type=int, default=400, show_default=True, help="每种方式发送的请求数")
+@click.option("--concurrency", default="8,64", show_default=True, help="最大并发请求数（逗号分隔）")
+@click.option("--latency", type=float, default=0.01, show_default=True, help="模拟服务的请求延迟（秒）")
+@click.option("-o", "--output", type=click.Path(path_type=Path), default=Path("benchmark_local_llm.json"),
+              show_default=True, help="结果JSON文件")
+def main(count: int, concurrency: str, latency: float, output: Path):
+    """对比LocalLLMTranslator每请求新建客户端与复用连接池的吞吐量"""
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}/v1"
+    texts = [PARAGRAPH.format(i) for i in range(count)]
+    modes = (("per_request", PerRequestClientTranslator), ("pooled", LocalLLMTranslator))
+
+    results = []
+    server = start_mock_server(port, latency)
+    try:
+        for conc in _int_list(concurrency):
+            speeds = {}
+            for name, translator_class in modes:
+                result = run_mode(translator_class, base_url, texts, conc)
+                results.append({"key": f"{name}|c{conc}", "mode": name, "concurrency": conc, **result})
+                speeds[name] = result["requests_per_second"]
+                click.echo(
+                    f"并发{conc} {name}: {count} 请求, {result['wall_seconds']:.2f}s, "
+                    f"{result['requests_per_second']} 请求/s, 失败 {result['failed']}"
+                )
+            if speeds["per_request"]:
+                click.echo(f"并发{conc} 连接池加速: {speeds['pooled'] / speeds['per_request']:.2f}x")
+    finally:
+        server.terminate()
+        server.wait()
+
+    summary = {
+        "commit": git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "requests": count,
+        "latency": latency,
+        "results": results,
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    click.echo(f"结果已保存: {output}")
+
+
+if __name__ == "__main__":
+    main()
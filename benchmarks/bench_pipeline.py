@@ -0,0 +1,265 @@
+"""
+端到端翻译流水线基准测试
+
+回放已记录的MinerU输出（data/ 下的Markdown），以及将其放大10倍、100倍的合成文档，
+使用模拟翻译器（不消耗API配额）在不同的并发、打包和批量设置下运行 PDFProcessor，
+记录吞吐量（段落/秒）、耗时、峰值内存和请求数，结果保存为JSON以便在不同提交之间对比。
+
+用法:
+    uv run python -m benchmarks.bench_pipeline
+    uv run python -m benchmarks.bench_pipeline --scales 1,10 --concurrency 8,32 -o bench.json
+    uv run python -m benchmarks.bench_pipeline --baseline bench.json  # 与上次结果对比
+"""
+
+import hashlib
+import itertools
+import io
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr
+from dataclasses import asdict, dataclass
+from multiprocessing import get_context
+from pathlib import Path
+from typing import List, Optional
+
+import click
+from loguru import logger
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SOURCE = ROOT / "data"
+
+
+@dataclass
+class BenchCase:
+    """一组基准测试设置"""
+    document: str  # 已记录的Markdown文件路径
+    scale: int  # 文档放大倍数
+    concurrency: int  # 翻译器最大并发请求数
+    pack_tokens: int  # 打包翻译的token预算，0表示不打包
+    batch_size: int  # 每批提交给翻译器的段落数
+    latency: float  # 模拟请求延迟（秒）
+    latency_per_token: float  # 每个输出token增加的延迟（秒）
+    distribution: str  # 延迟分布
+    seed: Optional[int]  # 随机种子
+
+    @property
+    def key(self) -> str:
+        """用于在不同运行之间匹配同一设置的标识"""
+        return (
+            f"{Path(self.document).stem}|x{self.scale}|c{self.concurrency}"
+            f"|pack{self.pack_tokens}|batch{self.batch_size}"
+        )
+
+
+def find_documents(source: Path) -> List[Path]:
+    """查找已记录的MinerU Markdown输出"""
+    if source.is_file():
+        return [source]
+    return sorted(source.rglob("*.md"))
+
+
+def scale_markdown(markdown: str, scale: int) -> str:
+    """将文档重复scale次，合成更大的文档"""
+    return "\n\n".join([markdown.strip()] * scale) + "\n"
+
+
+def peak_rss_mb() -> Optional[float]:
+    """当前进程的峰值常驻内存（MB），不支持的平台返回None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux以KB为单位，macOS以字节为单位
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def git_commit() -> Optional[str]:
+    """当前提交，不在git仓库中时返回None"""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run_case(case: BenchCase) -> dict:
+    """
+    运行一组设置（在独立子进程中调用，使峰值内存互不影响）
+
+    Returns:
+        该设置的测试结果
+    """
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    from src.pdf import PDFProcessor
+    from src.pdf.mineru_parser import ParsedDocument
+    from src.translators import MockTranslator
+
+    markdown = scale_markdown(Path(case.document).read_text(encoding="utf-8"), case.scale)
+    parsed = ParsedDocument(markdown_content=markdown, images_dir=None, content_list=None)
+
+    # 已记录的样例是中文译文，按中译英运行，避免被当作已是目标语言的段落跳过
+    translator = MockTranslator(
+        source_lang="zh",
+        target_lang="en",
+        latency=case.latency,
+        latency_per_token=case.latency_per_token,
+        distribution=case.distribution,
+        seed=case.seed,
+        max_concurrency=case.concurrency,
+        pack_tokens=case.pack_tokens,
+    )
+    with tempfile.TemporaryDirectory() as tmp, PDFProcessor(translator, batch_size=case.batch_size) as processor:
+        input_path = Path(tmp) / f"{Path(case.document).stem}.pdf"
+        md_output_path = Path(tmp) / "out" / f"{input_path.stem}_translated.md"
+
+        # 不显示翻译进度条（日志警告仍输出到原stderr）
+        with redirect_stderr(io.StringIO()):
+            start = time.perf_counter()
+            processor.translate_parsed(input_path, parsed, md_output_path)
+            wall = time.perf_counter() - start
+
+        output = md_output_path.read_bytes()
+        report = processor.report
+        metrics = processor.metrics
+
+    return {
+        "key": case.key,
+        **asdict(case),
+        "document": Path(case.document).name,
+        "input_chars": len(markdown),
+        "paragraphs": report.paragraphs,
+        "translated": report.translated,
+        "failed": report.failed,
+        "wall_seconds": round(wall, 4),
+        "paragraphs_per_second": round(report.paragraphs / wall, 2) if wall > 0 else None,
+        "requests": int(metrics.counter("requests_total")),
+        "request_errors": int(metrics.counter("request_errors_total")),
+        "peak_rss_mb": peak_rss_mb(),
+        "output_bytes": len(output),
+        "output_sha256": hashlib.sha256(output).hexdigest(),
+    }
+
+
+def compare(results: List[dict], baseline_path: Path) -> None:
+    """与之前保存的结果对比并输出吞吐量和内存变化"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {item["key"]: item for item in json.load(f).get("results", [])}
+
+    click.echo(f"\n对比基线: {baseline_path}")
+    for item in results:
+        old = baseline.get(item["key"])
+        if old is None:
+            click.echo(f"  {item['key']}: 基线中无此设置")
+            continue
+        speed = _ratio(item["paragraphs_per_second"], old.get("paragraphs_per_second"))
+        rss = _ratio(item["peak_rss_mb"], old.get("peak_rss_mb"))
+        same = "一致" if item["output_sha256"] == old.get("output_sha256") else "不同"
+        click.echo(
+            f"  {item['key']}: 吞吐量 {speed}, 峰值内存 {rss}, "
+            f"请求数 {old.get('requests')} -> {item['requests']}, 输出{same}"
+        )
+
+
+def _ratio(new: Optional[float], old: Optional[float]) -> str:
+    if not new or not old:
+        return "n/a"
+    return f"{(new / old - 1) * 100:+.1f}%"
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+@click.command()
+@click.option("--source", type=click.Path(exists=True, path_type=Path), default=DEFAULT_SOURCE,
+              show_default=True, help="已记录的MinerU Markdown文件或目录")
+@click.option("--scales", default="1,10,100", show_default=True, help="文档放大倍数（逗号分隔）")
+@click.option("--concurrency", default="1,8,32", show_default=True, help="最大并发请求数（逗号分隔）")
+@click.option("--pack-tokens", default="0,1024", show_default=True, help="打包翻译的token预算（逗号分隔）")
+@click.option("--batch-size", default="32", show_default=True, help="每批提交的段落数（逗号分隔）")
+@click.option("--latency", type=float, default=0.005, show_default=True, help="模拟请求延迟（秒）")
+@click.option("--latency-per-token", type=float, default=0.0, show_default=True, help="每个输出token增加的延迟（秒）")
+@click.option("--distribution", default="fixed", show_default=True, help="延迟分布")
+@click.option("--seed", type=int, default=0, show_default=True, help="随机种子")
+@click.option("-o", "--output", type=click.Path(path_type=Path), default=Path("benchmark_results.json"),
+              show_default=True, help="结果JSON文件")
+@click.option("--baseline", type=click.Path(exists=True, path_type=Path), help="与之前保存的结果对比")
+def main(
+    source: Path,
+    scales: str,
+    concurrency: str,
+    pack_tokens: str,
+    batch_size: str,
+    latency: float,
+    latency_per_token: float,
+    distribution: str,
+    seed: int,
+    output: Path,
+    baseline: Optional[Path],
+):
+    """运行端到端翻译流水线基准测试"""
+    documents = find_documents(source)
+    if not documents:
+        raise click.ClickException(f"未找到Markdown文件: {source}")
+
+    cases = [
+        BenchCase(
+            document=str(document),
+            scale=scale,
+            concurrency=conc,
+            pack_tokens=pack,
+            batch_size=batch,
+            latency=latency,
+            latency_per_token=latency_per_token,
+            distribution=distribution,
+            seed=seed,
+        )
+        for document, scale, conc, pack, batch in itertools.product(
+            documents, _int_list(scales), _int_list(concurrency),
+            _int_list(pack_tokens), _int_list(batch_size),
+        )
+    ]
+
+    results = []
+    for i, case in enumerate(cases, 1):
+        # 每组设置使用新的子进程，峰值内存只反映本组设置
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            result = pool.submit(run_case, case).result()
+        results.append(result)
+        click.echo(
+            f"[{i}/{len(cases)}] {Path(case.document).stem[:40]} x{case.scale} "
+            f"并发{case.concurrency} 打包{case.pack_tokens} 批量{case.batch_size}: {result['paragraphs']} 段, "
+            f"{result['wall_seconds']:.2f}s, {result['paragraphs_per_second']} 段/s, "
+            f"{result['requests']} 请求, 峰值内存 {result['peak_rss_mb']} MB"
+        )
+
+    summary = {
+        "commit": git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    click.echo(f"结果已保存: {output}")
+
+    if baseline is not None:
+        compare(results, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,24 @@ import os
 import re
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import List, Optional
 
 import yaml
 
+# 默认原样保留、不翻译的章节（参考文献、致谢等），与标题开头匹配，不区分大小写
+DEFAULT_SKIP_SECTIONS = (
+    "References",
+    "Bibliography",
+    "Literature Cited",
+    "Works Cited",
+    "Acknowledgements",
+    "Acknowledgments",
+    "Acknowledgement",
+    "Acknowledgment",
+    "参考文献",
+    "致谢",
+)
+
 
 @dataclass
 class GoogleConfig:
@@ -25,6 +39,8 @@ class OpenAIConfig:
     model: str = "gpt-4o"
     base_url: str = "https://api.openai.com/v1"
     system_prompt: str = ""
+    max_concurrency: int = 8  # 批量翻译时的最大并发请求数
+    pack_tokens: int = 0  # 打包翻译的原文token预算，0表示不打包
 
 
 @dataclass
@@ -34,6 +50,28 @@ class LocalLLMConfig:
     model: str = "qwen2.5-72b-instruct"
     api_key: str = "not-needed"
     system_prompt: str = ""
+    timeout: float = 120.0
+    max_concurrency: int = 8  # 批量翻译时的最大并发请求数
+    pack_tokens: int = 0  # 打包翻译的原文token预算，0表示不打包
+    max_connections: int = 32  # 连接池最大连接数
+    max_keepalive_connections: int = 16  # 保持的最大空闲长连接数
+    keepalive_expiry: float = 30.0  # 空闲长连接保持时间（秒）
+    http2: bool = False  # 是否启用HTTP/2（需要安装 h2）
+
+
+@dataclass
+class MockConfig:
+    """模拟翻译器配置（离线基准测试，也用于 translate mock-server）"""
+    latency: float = 0.05  # 每个请求的基础延迟（秒）
+    latency_per_token: float = 0.0  # 每个输出token增加的延迟（秒）
+    distribution: str = "fixed"  # 延迟分布: fixed / uniform / exponential / lognormal
+    spread: float = 0.5  # uniform为±比例，lognormal为sigma
+    error_rate: float = 0.0  # 返回500错误的概率
+    throttle_rate: float = 0.0  # 返回429限流的概率
+    retry_after: float = 1.0  # 429响应的Retry-After（秒）
+    seed: Optional[int] = None  # 随机种子
+    max_concurrency: int = 8  # 批量翻译时的最大并发请求数
+    pack_tokens: int = 0  # 打包翻译的原文token预算，0表示不打包
 
 
 @dataclass
@@ -42,6 +80,87 @@ class PDFConfig:
     bilingual: bool = False
     font_scale: float = 0.9
     fallback_font: Optional[str] = None
+    batch_size: int = 32  # 每批提交给翻译器的段落数
+    stream_chunk_pages: int = 0  # 流式处理每块页数，0表示先解析完整文档再翻译
+    stream_queue_size: int = 2  # 已解析、等待翻译的最大块数
+    mask_spans: bool = True  # 翻译前把行内公式、文献引用和链接替换为占位符
+    mask_retries: int = 1  # 译文中占位符缺失时的重试次数
+    skip_target_language: bool = True  # 已是目标语言的段落（如中文摘要）不翻译
+    use_content_list: bool = False  # 按MinerU内容列表的块类型翻译，再渲染为Markdown
+    translate_tables: bool = True  # 翻译表格中的文字单元格，保持表格结构不变
+    table_pack_tokens: int = 1024  # 表格单元格打包翻译的原文token预算
+    # 原样保留、不翻译的章节标题（匹配标题开头，不区分大小写），空列表表示翻译所有章节
+    skip_sections: List[str] = field(default_factory=lambda: list(DEFAULT_SKIP_SECTIONS))
+
+
+@dataclass
+class BatchConfig:
+    """批量处理配置（translate batch）"""
+    parse_workers: int = 1  # 同时运行的解析任务数
+    parse_batch_size: int = 4  # 每个解析任务合并推理的文档数（pipeline后端）
+    translate_workers: int = 2  # 同时翻译的文档数量
+    skip_existing: bool = True  # 跳过已有翻译结果的文件
+
+
+@dataclass
+class ServerConfig:
+    """本地翻译服务配置（translate serve）"""
+    host: str = "127.0.0.1"
+    port: int = 8765
+    workers: int = 1  # 同时处理的任务数
+    work_dir: str = "~/.cache/academic-pdf-translator/jobs"  # 任务输入输出目录
+    max_upload_mb: int = 200  # 单个PDF的大小上限
+    client: bool = True  # translate命令检测到服务运行时是否提交给服务处理
+    max_jobs: int = 100  # 最多保留的已结束任务数，超出时删除最早结束的任务及其目录
+    job_ttl_hours: float = 24.0  # 已结束任务的保留时间（小时），0表示不按时间清理
+    
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+
+@dataclass
+class RateLimitConfig:
+    """限流配置（OpenAI及本地LLM批量翻译）"""
+    requests_per_minute: int = 0  # 每分钟请求数上限，0表示不限制
+    tokens_per_minute: int = 0  # 每分钟token数上限，0表示不限制
+    min_concurrency: int = 1  # 遇到限流时并发数的下限
+    max_throttle_retries: int = 8  # 单个请求被限流后的最大重试次数
+
+
+@dataclass
+class RetryConfig:
+    """请求重试与对冲配置（作用于所有翻译器）"""
+    max_attempts: int = 3  # 总尝试次数（含首次），1表示不重试
+    base_delay: float = 1.0  # 首次重试的基础等待时间（秒），之后指数增长
+    max_delay: float = 30.0  # 单次等待时间上限（秒）
+    jitter: float = 0.5  # 退避时间的随机抖动比例
+    retryable_status: List[int] = field(
+        default_factory=lambda: [408, 409, 429, 500, 502, 503, 504]
+    )
+    hedge: bool = False  # 是否对慢请求发送对冲副本（openai/local_llm批量翻译）
+    hedge_percentile: float = 0.95  # 请求耗时超过该分位数时发送副本
+    hedge_min_samples: int = 20  # 延迟样本数达到该值后才启用对冲
+
+
+@dataclass
+class CacheConfig:
+    """翻译缓存配置"""
+    enabled: bool = True
+    path: str = "~/.cache/academic-pdf-translator/translations.db"
+    max_entries: int = 200000  # 超出后按LRU淘汰
+    parse_enabled: bool = True  # 是否缓存MinerU解析结果
+    parse_dir: str = "~/.cache/academic-pdf-translator/parse"
+
+
+@dataclass
+class EstimateConfig:
+    """预估配置（translate --dry-run）"""
+    input_price: float = 0.0  # 每百万输入token的价格（google为每百万字符），两项价格都为0时不计算费用
+    output_price: float = 0.0  # 每百万输出token的价格
+    currency: str = "USD"
+    request_latency: float = 1.0  # 单个请求的固定耗时（秒）
+    output_tokens_per_second: float = 50.0  # 模型输出速度（token/秒）
 
 
 @dataclass
@@ -53,7 +172,19 @@ class Config:
     google: GoogleConfig = field(default_factory=GoogleConfig)
     openai: OpenAIConfig = field(default_factory=OpenAIConfig)
     local_llm: LocalLLMConfig = field(default_factory=LocalLLMConfig)
+    mock: MockConfig = field(default_factory=MockConfig)
     pdf: PDFConfig = field(default_factory=PDFConfig)
+    batch: BatchConfig = field(default_factory=BatchConfig)
+    server: ServerConfig = field(default_factory=ServerConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    rate_limit: RateLimitConfig = field(default_factory=RateLimitConfig)
+    retry: RetryConfig = field(default_factory=RetryConfig)
+    estimate: EstimateConfig = field(default_factory=EstimateConfig)
+    
+    def translator_model(self, translator_name: Optional[str] = None) -> str:
+        """翻译器使用的模型，没有模型设置的翻译器（如Google）返回空字符串"""
+        section = getattr(self, translator_name or self.default_translator, None)
+        return getattr(section, "model", "") or ""
 
 
 def _expand_env_vars(value: str) -> str:
@@ -122,8 +253,29 @@ def load_config(config_path: Optional[str] = None) -> Config:
         if "local_llm" in raw_config:
             config.local_llm = LocalLLMConfig(**raw_config["local_llm"])
         
+        if "mock" in raw_config:
+            config.mock = MockConfig(**raw_config["mock"])
+        
         if "pdf" in raw_config:
             config.pdf = PDFConfig(**raw_config["pdf"])
+        
+        if "batch" in raw_config:
+            config.batch = BatchConfig(**raw_config["batch"])
+        
+        if "server" in raw_config:
+            config.server = ServerConfig(**raw_config["server"])
+        
+        if "cache" in raw_config:
+            config.cache = CacheConfig(**raw_config["cache"])
+        
+        if "rate_limit" in raw_config:
+            config.rate_limit = RateLimitConfig(**raw_config["rate_limit"])
+        
+        if "retry" in raw_config:
+            config.retry = RetryConfig(**raw_config["retry"])
+        
+        if "estimate" in raw_config:
+            config.estimate = EstimateConfig(**raw_config["estimate"])
     
     # 从环境变量覆盖关键配置
     if os.environ.get("OPENAI_API_KEY"):
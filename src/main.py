@@ -5,17 +5,65 @@
 
 import click
 from pathlib import Path
+from tqdm import tqdm
 from typing import Optional, List
 
 from .config import load_config, Config
-from .translators import get_translator
-from .pdf import PDFProcessor
+from .translators import get_translator, TranslationCache, CachedTranslator
+from .translators.mock import LATENCY_DISTRIBUTIONS, MockBehavior, serve_mock_api
+from .translators.rate_limit import RateLimiter
+from .translators.retry import HedgingPolicy, RetryPolicy
+from .pdf import PDFProcessor, ParseCache, BatchProcessor, CostEstimate, TranslationEstimator
 from .pdf.processor import OutputFormat
+from .server import ServiceClient, TranslationService, serve as run_server
+
+
+def create_rate_limiter(config: Config, max_concurrency: int) -> RateLimiter:
+    """
+    根据配置创建限流器
+    
+    Args:
+        config: 配置对象
+        max_concurrency: 翻译器的最大并发请求数
+    
+    Returns:
+        RateLimiter实例
+    """
+    return RateLimiter(
+        requests_per_minute=config.rate_limit.requests_per_minute,
+        tokens_per_minute=config.rate_limit.tokens_per_minute,
+        max_concurrency=max_concurrency,
+        min_concurrency=config.rate_limit.min_concurrency,
+        max_throttle_retries=config.rate_limit.max_throttle_retries,
+    )
+
+
+def create_retry_policy(config: Config) -> RetryPolicy:
+    """根据配置创建请求重试策略"""
+    return RetryPolicy(
+        max_attempts=config.retry.max_attempts,
+        base_delay=config.retry.base_delay,
+        max_delay=config.retry.max_delay,
+        jitter=config.retry.jitter,
+        retryable_status=tuple(config.retry.retryable_status),
+    )
+
+
+def create_hedging_policy(config: Config) -> Optional[HedgingPolicy]:
+    """根据配置创建请求对冲策略，未启用时返回None"""
+    if not config.retry.hedge:
+        return None
+    return HedgingPolicy(
+        percentile=config.retry.hedge_percentile,
+        min_samples=config.retry.hedge_min_samples,
+    )
 
 
 def create_processor(
     config: Config,
     translator_name: Optional[str] = None,
+    use_cache: Optional[bool] = None,
+    use_parse_cache: Optional[bool] = None,
 ) -> PDFProcessor:
     """
     根据配置创建PDF处理器
@@ -23,6 +71,8 @@ def create_processor(
     Args:
         config: 配置对象
         translator_name: 翻译器名称，默认使用配置中的默认翻译器
+        use_cache: 是否使用翻译缓存，默认遵循配置
+        use_parse_cache: 是否使用MinerU解析缓存，默认遵循配置
     
     Returns:
         PDFProcessor实例
@@ -36,6 +86,7 @@ def create_processor(
             source_lang=config.source_lang,
             target_lang=config.target_lang,
             project_id=config.google.project_id,
+            retry_policy=create_retry_policy(config),
         )
     elif translator_name == "openai":
         translator = get_translator(
@@ -46,6 +97,11 @@ def create_processor(
             model=config.openai.model,
             base_url=config.openai.base_url,
             system_prompt=config.openai.system_prompt or None,
+            max_concurrency=config.openai.max_concurrency,
+            pack_tokens=config.openai.pack_tokens,
+            rate_limiter=create_rate_limiter(config, config.openai.max_concurrency),
+            retry_policy=create_retry_policy(config),
+            hedging=create_hedging_policy(config),
         )
     elif translator_name == "local_llm":
         translator = get_translator(
@@ -56,16 +112,170 @@ def create_processor(
             model=config.local_llm.model,
             api_key=config.local_llm.api_key,
             system_prompt=config.local_llm.system_prompt or None,
+            timeout=config.local_llm.timeout,
+            max_concurrency=config.local_llm.max_concurrency,
+            max_connections=config.local_llm.max_connections,
+            max_keepalive_connections=config.local_llm.max_keepalive_connections,
+            keepalive_expiry=config.local_llm.keepalive_expiry,
+            http2=config.local_llm.http2,
+            pack_tokens=config.local_llm.pack_tokens,
+            rate_limiter=create_rate_limiter(config, config.local_llm.max_concurrency),
+            retry_policy=create_retry_policy(config),
+            hedging=create_hedging_policy(config),
+        )
+    elif translator_name == "mock":
+        translator = get_translator(
+            "mock",
+            source_lang=config.source_lang,
+            target_lang=config.target_lang,
+            latency=config.mock.latency,
+            latency_per_token=config.mock.latency_per_token,
+            distribution=config.mock.distribution,
+            spread=config.mock.spread,
+            error_rate=config.mock.error_rate,
+            throttle_rate=config.mock.throttle_rate,
+            retry_after=config.mock.retry_after,
+            seed=config.mock.seed,
+            max_concurrency=config.mock.max_concurrency,
+            pack_tokens=config.mock.pack_tokens,
+            rate_limiter=create_rate_limiter(config, config.mock.max_concurrency),
+            retry_policy=create_retry_policy(config),
+            hedging=create_hedging_policy(config),
         )
     else:
         raise ValueError(f"未知的翻译器: {translator_name}")
     
+    if use_cache is None:
+        use_cache = config.cache.enabled
+    if use_cache:
+        cache = TranslationCache(config.cache.path, max_entries=config.cache.max_entries)
+        translator = CachedTranslator(translator, cache)
+    
+    if use_parse_cache is None:
+        use_parse_cache = config.cache.parse_enabled
+    parse_cache = ParseCache(config.cache.parse_dir) if use_parse_cache else None
+    
     return PDFProcessor(
         translator=translator,
         bilingual=config.pdf.bilingual,
+        batch_size=config.pdf.batch_size,
+        parse_cache=parse_cache,
+        stream_chunk_pages=config.pdf.stream_chunk_pages,
+        stream_queue_size=config.pdf.stream_queue_size,
+        mask_spans=config.pdf.mask_spans,
+        mask_retries=config.pdf.mask_retries,
+        skip_sections=config.pdf.skip_sections,
+        skip_target_language=config.pdf.skip_target_language,
+        use_content_list=config.pdf.use_content_list,
+        translate_tables=config.pdf.translate_tables,
+        table_pack_tokens=config.pdf.table_pack_tokens,
+    )
+
+
+def create_estimator(config: Config, processor: PDFProcessor) -> TranslationEstimator:
+    """根据配置创建翻译预估器（价格、请求耗时和限流）"""
+    return TranslationEstimator(
+        processor.translator,
+        batch_size=processor.batch_size,
+        input_price=config.estimate.input_price,
+        output_price=config.estimate.output_price,
+        currency=config.estimate.currency,
+        request_latency=config.estimate.request_latency,
+        output_tokens_per_second=config.estimate.output_tokens_per_second,
+        requests_per_minute=config.rate_limit.requests_per_minute,
+        tokens_per_minute=config.rate_limit.tokens_per_minute,
+    )
+
+
+def echo_estimate(estimate: CostEstimate) -> None:
+    """输出预估结果"""
+    bottlenecks = {
+        "concurrency": "并发上限",
+        "requests_per_minute": "每分钟请求数限制",
+        "tokens_per_minute": "每分钟token数限制",
+    }
+    click.echo(
+        f"段落: {estimate.paragraphs} 段（已缓存 {estimate.cached} 段），"
+        f"预计请求 {estimate.requests} 次"
+    )
+    if estimate.in_target_lang:
+        click.echo(f"已是目标语言: {estimate.in_target_lang} 段（不发送请求）")
+    if estimate.table_cells:
+        click.echo(f"表格单元格: {estimate.table_cells} 个（去重后打包翻译）")
+    if estimate.skipped:
+        saved = f"（{estimate.skipped_cost:.4f} {estimate.currency}）" if estimate.priced else ""
+        click.echo(
+            f"跳过参考文献等章节: {estimate.skipped} 段，"
+            f"节省约 {estimate.skipped_tokens} token{saved}"
+        )
+    click.echo(
+        f"输入token: {estimate.input_tokens}（其中系统提示词 {estimate.prompt_tokens}），"
+        f"输出token: {estimate.output_tokens}"
+    )
+    if estimate.priced:
+        click.echo(f"预计费用: {estimate.cost:.4f} {estimate.currency}")
+    else:
+        click.echo("预计费用: 未配置价格（在配置文件的 estimate.input_price / estimate.output_price 中设置）")
+    if estimate.seconds < 120:
+        duration = f"{estimate.seconds:.1f} 秒"
+    else:
+        duration = f"{estimate.seconds / 60:.1f} 分钟"
+    click.echo(
+        f"预计翻译耗时: {duration}"
+        f"（瓶颈: {bottlenecks.get(estimate.bottleneck, estimate.bottleneck)}，不含解析时间）"
     )
 
 
+def translate_via_service(
+    config: Config,
+    translator_name: Optional[str],
+    input_pdf: str,
+    output: Optional[str],
+    pages: Optional[List[int]],
+) -> Optional[str]:
+    """
+    检测到本地翻译服务时，把任务提交给服务处理
+    
+    服务使用的翻译器、模型或语言对与本次请求不一致时不使用服务
+    
+    Returns:
+        输出的Markdown文件路径，未使用服务时返回None
+    """
+    with ServiceClient(config.server.url) as client:
+        info = client.health()
+        if info is None:
+            return None
+        translator_name = translator_name or config.default_translator
+        expected = {
+            "translator": translator_name,
+            "model": config.translator_model(translator_name),
+            "source_lang": config.source_lang,
+            "target_lang": config.target_lang,
+        }
+        if any(info.get(key) != value for key, value in expected.items()):
+            click.echo(f"翻译服务 {config.server.url} 的翻译器、模型或语言设置不同，改为本地处理")
+            return None
+        
+        click.echo(f"使用翻译服务: {config.server.url}")
+        job = client.submit(input_pdf, pages=pages, bilingual=config.pdf.bilingual)
+        click.echo(f"任务ID: {job['id']}")
+        
+        with tqdm(desc="翻译中", unit="段") as pbar:
+            def on_progress(status: dict) -> None:
+                pbar.total = status["total"] or None
+                pbar.n = status["progress"]
+                pbar.set_postfix_str(status["status"])
+                pbar.refresh()
+            
+            job = client.wait(job["id"], on_progress)
+        
+        if job["status"] != "done":
+            raise click.ClickException(f"翻译服务处理失败: {job.get('error')}")
+        
+        _, md_output_path = PDFProcessor.get_output_paths(input_pdf, output)
+        return client.download(job, md_output_path)
+
+
 class DefaultGroup(click.Group):
     """支持默认命令的 Click Group"""
     
@@ -94,11 +304,29 @@ def cli():
 @click.argument("input_pdf", type=click.Path(exists=True))
 @click.option("-o", "--output", type=click.Path(), help="输出文件路径")
 @click.option("-c", "--config", "config_path", type=click.Path(exists=True), help="配置文件路径")
-@click.option("-t", "--translator", type=click.Choice(["google", "openai", "local_llm"]), help="翻译器")
+@click.option("-t", "--translator", type=click.Choice(["google", "openai", "local_llm", "mock"]), help="翻译器")
 @click.option("--source-lang", default="en", help="源语言 (默认: en)")
 @click.option("--target-lang", default="zh", help="目标语言 (默认: zh)")
 @click.option("--pages", help="要翻译的页码，如 '1,2,3' 或 '1-5'")
 @click.option("--bilingual", is_flag=True, help="生成双语对照版本")
+@click.option("--no-cache", is_flag=True, help="不使用翻译缓存")
+@click.option("--clear-cache", is_flag=True, help="翻译前清空翻译缓存")
+@click.option("--no-parse-cache", is_flag=True, help="不使用MinerU解析缓存，强制重新解析PDF")
+@click.option("--resume", is_flag=True, help="从上次中断的检查点日志恢复，只翻译缺失的段落")
+@click.option(
+    "--previous",
+    type=click.Path(exists=True),
+    help="上一次运行的输出目录或检查点日志，内容未变的段落直接复用旧译文（如论文新版本）",
+)
+@click.option(
+    "--stream-pages",
+    type=int,
+    help="流式处理：每解析N页即开始翻译，同时继续解析后续页面",
+)
+@click.option("--local", "force_local", is_flag=True, help="不使用本地翻译服务，在当前进程中处理")
+@click.option("--metrics-out", type=click.Path(), help="把运行指标（耗时、请求、token、缓存等）保存为JSON文件")
+@click.option("--dry-run", is_flag=True, help="只解析和预估token用量、费用和耗时，不发送翻译请求")
+@click.option("--content-list", is_flag=True, help="按MinerU内容列表的块类型翻译（标题集中翻译，按页写出）")
 @click.option(
     "-f", "--format",
     "output_format",
@@ -115,6 +343,16 @@ def translate(
     target_lang: str,
     pages: Optional[str],
     bilingual: bool,
+    no_cache: bool,
+    clear_cache: bool,
+    no_parse_cache: bool,
+    resume: bool,
+    previous: Optional[str],
+    stream_pages: Optional[int],
+    force_local: bool,
+    metrics_out: Optional[str],
+    dry_run: bool,
+    content_list: bool,
     output_format: str,
 ):
     """翻译PDF学术论文
@@ -134,6 +372,11 @@ def translate(
       
       # 双语对照的Markdown
       translate paper.pdf -f markdown --bilingual
+      
+      # 预估费用和耗时（不翻译）
+      translate paper.pdf --dry-run
+    
+    已通过 translate serve 启动翻译服务时，任务会提交给服务处理（--local 强制本地处理）。
     """
     # 加载配置
     config = load_config(config_path)
@@ -145,6 +388,10 @@ def translate(
         config.target_lang = target_lang
     if bilingual:
         config.pdf.bilingual = bilingual
+    if stream_pages is not None:
+        config.pdf.stream_chunk_pages = stream_pages
+    if content_list:
+        config.pdf.use_content_list = True
     
     # 解析页码
     page_list = None
@@ -159,8 +406,38 @@ def translate(
     else:
         fmt = OutputFormat.PDF
     
+    # 只有服务端能处理的选项时才使用翻译服务
+    local_only = (
+        resume or previous or no_cache or clear_cache or no_parse_cache or stream_pages
+        or metrics_out or dry_run or content_list
+    )
+    if config.server.client and not force_local and not local_only:
+        output_path = translate_via_service(config, translator, input_pdf, output, page_list)
+        if output_path is not None:
+            click.echo(f"翻译完成: {output_path}")
+            return
+    
+    if clear_cache and not dry_run:
+        cache = TranslationCache(config.cache.path)
+        cache.clear()
+        cache.close()
+        click.echo("已清空翻译缓存")
+    
     # 创建处理器
-    processor = create_processor(config, translator)
+    processor = create_processor(
+        config,
+        translator,
+        use_cache=False if no_cache else None,
+        use_parse_cache=False if no_parse_cache else None,
+    )
+    
+    if dry_run:
+        with processor:
+            click.echo(f"预估: {input_pdf}")
+            click.echo(f"翻译器: {translator or config.default_translator}")
+            estimate = processor.estimate(input_pdf, page_list, create_estimator(config, processor))
+            echo_estimate(estimate)
+        return
     
     click.echo(f"正在翻译: {input_pdf}")
     click.echo(f"翻译器: {translator or config.default_translator}")
@@ -168,19 +445,315 @@ def translate(
     click.echo(f"输出格式: {output_format}")
     
     # 执行翻译
-    output_path = processor.process(
-        input_path=input_pdf,
-        output_path=output,
-        pages=page_list,
-    )
-    
-    click.echo(f"翻译完成: {output_path}")
+    with processor:
+        output_path = processor.process(
+            input_path=input_pdf,
+            output_path=output,
+            pages=page_list,
+            resume=resume,
+            previous=previous,
+        )
+        
+        click.echo(f"翻译完成: {output_path}")
+        
+        report = processor.report
+        if report.skipped:
+            click.echo(f"跳过参考文献等章节: {report.skipped} 段（原样保留）")
+        if report.in_target_lang:
+            click.echo(f"已是目标语言: {report.in_target_lang} 段（原样保留）")
+        if report.reused or report.resumed:
+            click.echo(
+                f"段落统计: 共 {report.paragraphs} 段，复用旧版本 {report.reused} 段，"
+                f"从检查点恢复 {report.resumed} 段，新翻译 {report.translated} 段"
+            )
+        
+        if isinstance(processor.translator, CachedTranslator):
+            stats = processor.translator.cache.stats()
+            click.echo(
+                f"翻译缓存: 命中 {stats['hits']}，未命中 {stats['misses']}，"
+                f"命中率 {stats['hit_ratio']:.1%}"
+            )
+        
+        request_stats = processor.translator.request_stats
+        if request_stats.retries or request_stats.hedges:
+            click.echo(
+                f"请求统计: 重试 {request_stats.retries} 次，对冲 {request_stats.hedges} 次"
+                f"（对冲胜出 {request_stats.hedge_wins} 次）"
+            )
+        
+        if metrics_out:
+            processor.metrics.save(metrics_out)
+            click.echo(f"运行指标: {metrics_out}")
     
     if fmt == OutputFormat.BOTH:
         pdf_path = Path(output_path).with_suffix(".pdf")
         click.echo(f"PDF输出: {pdf_path}")
 
 
+@cli.command(name="batch")
+@click.argument("source")
+@click.option("-o", "--output", type=click.Path(), help="输出根目录，默认输出到每个PDF所在目录")
+@click.option("-c", "--config", "config_path", type=click.Path(exists=True), help="配置文件路径")
+@click.option("-t", "--translator", type=click.Choice(["google", "openai", "local_llm", "mock"]), help="翻译器")
+@click.option("--source-lang", default="en", help="源语言 (默认: en)")
+@click.option("--target-lang", default="zh", help="目标语言 (默认: zh)")
+@click.option("--bilingual", is_flag=True, help="生成双语对照版本")
+@click.option("--no-cache", is_flag=True, help="不使用翻译缓存")
+@click.option("--no-parse-cache", is_flag=True, help="不使用MinerU解析缓存，强制重新解析PDF")
+@click.option("--parse-workers", type=int, help="同时运行的解析任务数")
+@click.option("--parse-batch-size", type=int, help="每次MinerU推理合并的文档数（pipeline后端）")
+@click.option("--translate-workers", type=int, help="同时翻译的文档数量")
+@click.option("--overwrite", is_flag=True, help="重新处理已有翻译结果的文件")
+@click.option("--summary", "summary_path", type=click.Path(), help="JSON汇总文件路径")
+@click.option("--metrics-out", type=click.Path(), help="把运行指标（耗时、请求、token、缓存等）保存为JSON文件")
+@click.option("--dry-run", is_flag=True, help="只解析和预估token用量、费用和耗时，不发送翻译请求")
+@click.option("--content-list", is_flag=True, help="按MinerU内容列表的块类型翻译（标题集中翻译，按页写出）")
+def batch(
+    source: str,
+    output: Optional[str],
+    config_path: Optional[str],
+    translator: Optional[str],
+    source_lang: str,
+    target_lang: str,
+    bilingual: bool,
+    no_cache: bool,
+    no_parse_cache: bool,
+    parse_workers: Optional[int],
+    parse_batch_size: Optional[int],
+    translate_workers: Optional[int],
+    overwrite: bool,
+    summary_path: Optional[str],
+    metrics_out: Optional[str],
+    dry_run: bool,
+    content_list: bool,
+):
+    """批量翻译目录或glob模式匹配的多个PDF
+    
+    所有文件在同一进程中处理，共享翻译器、缓存和MinerU模型。
+    
+    \b
+    示例:
+      translate batch papers/
+      translate batch "papers/**/*.pdf" -o output/ --translate-workers 4
+      translate batch papers/ --dry-run
+    """
+    config = load_config(config_path)
+    
+    if source_lang:
+        config.source_lang = source_lang
+    if target_lang:
+        config.target_lang = target_lang
+    if bilingual:
+        config.pdf.bilingual = bilingual
+    if content_list:
+        config.pdf.use_content_list = True
+    if parse_workers is not None:
+        config.batch.parse_workers = parse_workers
+    if parse_batch_size is not None:
+        config.batch.parse_batch_size = parse_batch_size
+    if translate_workers is not None:
+        config.batch.translate_workers = translate_workers
+    if overwrite:
+        config.batch.skip_existing = False
+    
+    processor = create_processor(
+        config,
+        translator,
+        use_cache=False if no_cache else None,
+        use_parse_cache=False if no_parse_cache else None,
+    )
+    
+    click.echo(f"翻译器: {translator or config.default_translator}")
+    click.echo(f"语言: {config.source_lang} -> {config.target_lang}")
+    
+    batch_processor = BatchProcessor(
+        processor,
+        parse_workers=config.batch.parse_workers,
+        translate_workers=config.batch.translate_workers,
+        skip_existing=config.batch.skip_existing,
+        parse_batch_size=config.batch.parse_batch_size,
+    )
+    
+    if dry_run:
+        with processor:
+            estimates, total = batch_processor.estimate(
+                source, output_dir=output, estimator=create_estimator(config, processor),
+            )
+        for pdf_path, estimate in estimates:
+            click.echo(
+                f"  {pdf_path}: {estimate.paragraphs} 段，{estimate.requests} 次请求，"
+                f"{estimate.input_tokens + estimate.output_tokens} token，"
+                f"{estimate.cost:.4f} {estimate.currency}"
+            )
+        click.echo(f"共 {total.documents} 个文档")
+        echo_estimate(total)
+        return
+    
+    with processor:
+        summary = batch_processor.run(source, output_dir=output, summary_path=summary_path)
+        
+        if isinstance(processor.translator, CachedTranslator):
+            stats = processor.translator.cache.stats()
+            click.echo(
+                f"翻译缓存: 命中 {stats['hits']}，未命中 {stats['misses']}，"
+                f"命中率 {stats['hit_ratio']:.1%}"
+            )
+        
+        if metrics_out:
+            processor.metrics.save(metrics_out)
+            click.echo(f"运行指标: {metrics_out}")
+    
+    click.echo(
+        f"批量翻译完成: 共 {len(summary.items)} 个，成功 {summary.count('done')}，"
+        f"跳过 {summary.count('skipped')}，失败 {summary.count('failed')}，"
+        f"耗时 {summary.wall_seconds:.1f}秒"
+    )
+    for item in summary.items:
+        if item.status == "failed":
+            click.echo(f"  ✗ {item.input}: {item.error}")
+
+
+@cli.command(name="serve")
+@click.option("-c", "--config", "config_path", type=click.Path(exists=True), help="配置文件路径")
+@click.option("-t", "--translator", type=click.Choice(["google", "openai", "local_llm", "mock"]), help="翻译器")
+@click.option("--source-lang", default="en", help="源语言 (默认: en)")
+@click.option("--target-lang", default="zh", help="目标语言 (默认: zh)")
+@click.option("--host", help="监听地址 (默认: 127.0.0.1)")
+@click.option("--port", type=int, help="监听端口 (默认: 8765)")
+@click.option("--workers", type=int, help="同时处理的任务数")
+def serve(
+    config_path: Optional[str],
+    translator: Optional[str],
+    source_lang: str,
+    target_lang: str,
+    host: Optional[str],
+    port: Optional[int],
+    workers: Optional[int],
+):
+    """启动本地翻译服务
+    
+    常驻进程保持MinerU模型和翻译器连接，translate 命令检测到服务后会把任务提交给它。
+    
+    \b
+    接口:
+      POST /jobs?filename=paper.pdf    请求体为PDF内容，返回任务ID
+      GET  /jobs/<id>                  任务状态
+      GET  /jobs/<id>/events           推送任务进度 (Server-Sent Events)
+      GET  /jobs/<id>/result           翻译后的Markdown
+      GET  /jobs/<id>/images/<name>    图片
+      GET  /metrics                    运行指标 (Prometheus文本格式)
+    """
+    config = load_config(config_path)
+    
+    if source_lang:
+        config.source_lang = source_lang
+    if target_lang:
+        config.target_lang = target_lang
+    if host:
+        config.server.host = host
+    if port is not None:
+        config.server.port = port
+    if workers is not None:
+        config.server.workers = workers
+    
+    translator_name = translator or config.default_translator
+    processor = create_processor(config, translator_name)
+    
+    with processor:
+        service = TranslationService(
+            processor,
+            work_dir=config.server.work_dir,
+            workers=config.server.workers,
+            max_jobs=config.server.max_jobs,
+            job_ttl=config.server.job_ttl_hours * 3600,
+            info={
+                "translator": translator_name,
+                "model": config.translator_model(translator_name),
+                "source_lang": config.source_lang,
+                "target_lang": config.target_lang,
+            },
+        )
+        click.echo(f"翻译器: {translator_name}")
+        click.echo(f"语言: {config.source_lang} -> {config.target_lang}")
+        click.echo(f"翻译服务: {config.server.url}")
+        run_server(
+            service,
+            host=config.server.host,
+            port=config.server.port,
+            max_upload_mb=config.server.max_upload_mb,
+        )
+
+
+@cli.command(name="mock-server")
+@click.option("-c", "--config", "config_path", type=click.Path(exists=True), help="配置文件路径")
+@click.option("--host", default="127.0.0.1", help="监听地址 (默认: 127.0.0.1)")
+@click.option("--port", type=int, default=8000, help="监听端口 (默认: 8000)")
+@click.option("--target-lang", default="zh", help="伪译文的目标语言标记 (默认: zh)")
+@click.option("--latency", type=float, help="每个请求的基础延迟（秒）")
+@click.option("--latency-per-token", type=float, help="每个输出token增加的延迟（秒）")
+@click.option("--distribution", type=click.Choice(LATENCY_DISTRIBUTIONS), help="延迟分布")
+@click.option("--spread", type=float, help="分布参数：uniform为±比例，lognormal为sigma")
+@click.option("--error-rate", type=float, help="返回500错误的概率")
+@click.option("--throttle-rate", type=float, help="返回429限流的概率")
+@click.option("--retry-after", type=float, help="429响应的Retry-After（秒）")
+@click.option("--max-concurrency", type=int, default=0, help="同时处理的最大请求数，超出返回429 (默认: 不限制)")
+@click.option("--seed", type=int, help="随机种子")
+def mock_server(
+    config_path: Optional[str],
+    host: str,
+    port: int,
+    target_lang: str,
+    latency: Optional[float],
+    latency_per_token: Optional[float],
+    distribution: Optional[str],
+    spread: Optional[float],
+    error_rate: Optional[float],
+    throttle_rate: Optional[float],
+    retry_after: Optional[float],
+    max_concurrency: int,
+    seed: Optional[int],
+):
+    """启动OpenAI兼容的模拟翻译服务
+    
+    返回确定性的伪译文，可注入延迟、错误和429限流，
+    用于在不消耗API配额的情况下压测 openai / local_llm 翻译器。
+    未指定的参数使用配置文件 mock 段的设置。
+    
+    \b
+    示例:
+      translate mock-server --port 8000 --latency 0.2 --throttle-rate 0.05
+      # 另一个终端
+      OPENAI_BASE_URL=http://127.0.0.1:8000/v1 translate paper.pdf -t openai
+    """
+    mock = load_config(config_path).mock
+    overrides = {
+        "latency": latency,
+        "latency_per_token": latency_per_token,
+        "distribution": distribution,
+        "spread": spread,
+        "error_rate": error_rate,
+        "throttle_rate": throttle_rate,
+        "retry_after": retry_after,
+        "seed": seed,
+    }
+    for name, value in overrides.items():
+        if value is not None:
+            setattr(mock, name, value)
+    
+    behavior = MockBehavior(
+        latency=mock.latency,
+        latency_per_token=mock.latency_per_token,
+        distribution=mock.distribution,
+        spread=mock.spread,
+        error_rate=mock.error_rate,
+        throttle_rate=mock.throttle_rate,
+        retry_after=mock.retry_after,
+        seed=mock.seed,
+    )
+    click.echo(f"模拟翻译服务: http://{host}:{port}/v1")
+    serve_mock_api(behavior, host=host, port=port, target_lang=target_lang, max_concurrency=max_concurrency)
+
+
 @cli.command()
 @click.argument("input_pdf", type=click.Path(exists=True))
 @click.option("-o", "--output", type=click.Path(), help="输出文件路径")
@@ -218,7 +791,7 @@ def extract(input_pdf: str, output: Optional[str]):
 
 
 @cli.command()
-@click.option("-t", "--translator", type=click.Choice(["google", "openai", "local_llm"]), default="openai")
+@click.option("-t", "--translator", type=click.Choice(["google", "openai", "local_llm", "mock"]), default="openai")
 @click.option("-c", "--config", "config_path", type=click.Path(exists=True), help="配置文件路径")
 def test_connection(translator: str, config_path: Optional[str]):
     """测试翻译API连接"""
@@ -237,10 +810,12 @@ def test_connection(translator: str, config_path: Optional[str]):
                 click.echo("✓ 连接成功!")
             else:
                 click.echo("✗ 连接失败")
+            t.close()
         else:
-            # 简单测试翻译
-            processor = create_processor(config, translator)
-            result = processor.translator.translate("Hello, world!")
+            # 简单测试翻译（绕过缓存，确保真正请求API）
+            processor = create_processor(config, translator, use_cache=False)
+            with processor:
+                result = processor.translator.translate("Hello, world!")
             click.echo(f"✓ 连接成功!")
             click.echo(f"测试翻译: 'Hello, world!' -> '{result.translated}'")
             
@@ -355,11 +930,12 @@ def translate_pdf(
     
     processor = create_processor(config, translator)
     
-    return processor.process(
-        input_path=input_path,
-        output_path=output_path,
-        pages=pages,
-    )
+    with processor:
+        return processor.process(
+            input_path=input_path,
+            output_path=output_path,
+            pages=pages,
+        )
 
 
 if __name__ == "__main__":
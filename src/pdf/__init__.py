@@ -4,10 +4,18 @@ PDF处理模块
 """
 
 from .mineru_parser import MineruParser, ParsedDocument
+from .parse_cache import ParseCache
 from .processor import PDFProcessor
+from .batch import BatchProcessor, BatchSummary
+from .estimate import CostEstimate, TranslationEstimator
 
 __all__ = [
     "MineruParser",
     "ParsedDocument",
+    "ParseCache",
     "PDFProcessor",
+    "BatchProcessor",
+    "BatchSummary",
+    "CostEstimate",
+    "TranslationEstimator",
 ]
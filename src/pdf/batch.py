@@ -0,0 +1,316 @@
+"""
+批量处理
+在同一进程中处理多个PDF，共享翻译器、缓存和MinerU模型，解析与翻译分别由独立的线程池执行
+"""
+
+import glob
+import json
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from loguru import logger
+
+from .estimate import CostEstimate, TranslationEstimator
+from .processor import PDFProcessor
+
+
+def find_pdfs(source: Union[str, Path]) -> List[Path]:
+    """
+    查找待处理的PDF
+
+    Args:
+        source: 目录（递归查找其中的PDF）、单个PDF文件或glob模式（支持 **）
+
+    Returns:
+        排序后的PDF路径列表
+    """
+    path = Path(source)
+    if path.is_dir():
+        return sorted(p for p in path.rglob("*") if p.suffix.lower() == ".pdf" and p.is_file())
+    if path.is_file():
+        return [path]
+    return sorted(
+        Path(p) for p in glob.glob(str(source), recursive=True)
+        if p.lower().endswith(".pdf") and Path(p).is_file()
+    )
+
+
+@dataclass
+class BatchItem:
+    """单个文件的处理结果"""
+    input: str
+    output: Optional[str] = None
+    status: str = "pending"  # done / skipped / failed
+    error: Optional[str] = None
+    parse_seconds: float = 0.0  # 解析耗时（批量解析时为所在组的总耗时）
+    translate_seconds: float = 0.0  # 翻译及写出耗时
+    wait_seconds: float = 0.0  # 解析完成后等待翻译线程的时间
+    report: dict = field(default_factory=dict)  # 段落统计（ProcessReport）
+
+
+@dataclass
+class BatchSummary:
+    """批量处理汇总"""
+    items: List[BatchItem] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+    def count(self, status: str) -> int:
+        return sum(1 for item in self.items if item.status == status)
+
+    def as_dict(self) -> dict:
+        return {
+            "total": len(self.items),
+            "done": self.count("done"),
+            "skipped": self.count("skipped"),
+            "failed": self.count("failed"),
+            "wall_seconds": round(self.wall_seconds, 3),
+            "items": [asdict(item) for item in self.items],
+        }
+
+    def save(self, path: Union[str, Path]) -> None:
+        """写出JSON汇总"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, ensure_ascii=False, indent=2)
+
+
+class BatchProcessor:
+    """
+    批量PDF处理器
+
+    解析线程池按parse_workers并发运行MinerU，每个解析任务把parse_batch_size个文档
+    合并为一次推理；解析完成的文档交给翻译线程池，最多translate_workers个文档同时翻译
+    （每个文档内部仍按翻译器的并发设置批量请求），因此后续文档的解析与前面文档的翻译
+    重叠进行。已解析、尚未翻译完成的文档数不超过max_parsed，解析快于翻译时解析线程等待，
+    内存占用不随文档总数增长。已有输出的文件默认跳过，中断后重新运行会从各文档的检查点日志继续。
+    """
+
+    def __init__(
+        self,
+        processor: PDFProcessor,
+        parse_workers: int = 1,
+        translate_workers: int = 2,
+        skip_existing: bool = True,
+        parse_batch_size: int = 4,
+    ):
+        """
+        初始化批量处理器
+
+        Args:
+            processor: PDF处理器，其翻译器、缓存和解析器在所有文档间共享
+            parse_workers: 同时解析的PDF数量
+            translate_workers: 同时翻译的文档数量
+            skip_existing: 是否跳过已存在翻译结果的文件
+            parse_batch_size: 每次MinerU推理合并的文档数，1表示逐个解析
+        """
+        self.processor = processor
+        self.parse_workers = max(1, parse_workers)
+        self.translate_workers = max(1, translate_workers)
+        self.skip_existing = skip_existing
+        self.parse_batch_size = max(1, parse_batch_size)
+        # 已解析未翻译完的文档上限（至少容纳一个解析任务的全部文档）
+        self.max_parsed = max(self.translate_workers * 2, self.parse_batch_size)
+
+    def _output_root(self, pdf_path: Path, source_root: Optional[Path], output_root: Optional[Path]) -> Optional[str]:
+        """单个PDF的输出目录：保留其相对于输入目录的子目录结构"""
+        if output_root is None:
+            return None
+        relative = pdf_path.parent.relative_to(source_root) if source_root else Path()
+        return str(output_root / relative / pdf_path.stem)
+
+    def estimate(
+        self,
+        source: Union[str, Path],
+        output_dir: Optional[str] = None,
+        estimator: Optional[TranslationEstimator] = None,
+    ) -> Tuple[List[Tuple[Path, CostEstimate]], CostEstimate]:
+        """
+        预估批量翻译的token用量、费用和耗时（不调用翻译接口）
+
+        与run相同地跳过已有输出的文件；解析结果写入解析缓存，正式翻译时可直接复用
+
+        Args:
+            source: 输入目录、glob模式或PDF文件
+            output_dir: 输出根目录（用于判断哪些文件已完成）
+            estimator: 预估器，默认按处理器的翻译器和批量大小创建（不含价格）
+
+        Returns:
+            (各文档的预估结果, 汇总结果)，解析失败的文档不计入
+        """
+        estimator = estimator or TranslationEstimator(
+            self.processor.translator, batch_size=self.processor.batch_size,
+        )
+        pdfs = find_pdfs(source)
+        source_root = Path(source) if Path(source).is_dir() else None
+        output_root = Path(output_dir) if output_dir else None
+
+        pending = []
+        for pdf_path in pdfs:
+            _, md_output_path = self.processor.get_output_paths(
+                pdf_path, self._output_root(pdf_path, source_root, output_root),
+            )
+            if self.skip_existing and md_output_path.exists():
+                continue
+            pending.append(pdf_path)
+
+        logger.info(f"预估 {len(pending)} 个PDF（跳过已完成 {len(pdfs) - len(pending)} 个）")
+
+        estimates: List[Tuple[Path, CostEstimate]] = []
+        with tempfile.TemporaryDirectory(prefix="pdf-translator-estimate-") as tmp:
+            for start in range(0, len(pending), self.parse_batch_size):
+                group = pending[start:start + self.parse_batch_size]
+                results = self.processor.parse_many(
+                    group,
+                    [Path(tmp) / str(start + i) for i in range(len(group))],
+                    batch_size=self.parse_batch_size,
+                )
+                for pdf_path, parsed in zip(group, results):
+                    if isinstance(parsed, BaseException):
+                        logger.error(f"解析失败 {pdf_path}: {parsed!r}")
+                        continue
+                    estimates.append((
+                        pdf_path,
+                        self.processor.estimate_parsed(parsed, estimator),
+                    ))
+
+        total = estimator.combine(
+            (estimate for _, estimate in estimates), workers=self.translate_workers,
+        )
+        return estimates, total
+
+    def run(
+        self,
+        source: Union[str, Path],
+        output_dir: Optional[str] = None,
+        summary_path: Optional[str] = None,
+    ) -> BatchSummary:
+        """
+        批量处理目录或glob模式匹配的PDF
+
+        Args:
+            source: 输入目录、glob模式或PDF文件
+            output_dir: 输出根目录，默认每个PDF输出到其所在目录下的同名目录
+            summary_path: JSON汇总文件路径，默认写入输出根目录（或输入目录）下的batch_summary.json
+
+        Returns:
+            批量处理汇总
+        """
+        pdfs = find_pdfs(source)
+        source_root = Path(source) if Path(source).is_dir() else None
+        output_root = Path(output_dir) if output_dir else None
+        if summary_path is None:
+            summary_dir = output_root or source_root or Path.cwd()
+            summary_path = str(summary_dir / "batch_summary.json")
+
+        logger.info(
+            f"批量处理 {len(pdfs)} 个PDF（解析并发 {self.parse_workers}，"
+            f"翻译并发 {self.translate_workers}）"
+        )
+
+        summary = BatchSummary()
+        lock = threading.Lock()
+        # 已解析未翻译完的文档名额：解析前领取，翻译结束（或解析失败）时归还
+        parsed_slots = threading.BoundedSemaphore(self.max_parsed)
+        # 解析任务依次领取整组名额，避免多个任务各领一部分后互相等待
+        slots_lock = threading.Lock()
+        finished = 0
+        started = time.monotonic()
+
+        def finish(item: BatchItem) -> None:
+            nonlocal finished
+            with lock:
+                finished += 1
+                index = finished
+            logger.info(f"[{index}/{len(pdfs)}] {item.status}: {item.input}")
+
+        def translate_job(item: BatchItem, pdf_path: Path, parsed, md_output_path: Path, parsed_at: float) -> None:
+            begin = time.monotonic()
+            item.wait_seconds = begin - parsed_at
+            self.processor.metrics.observe("queue_wait_seconds", item.wait_seconds)
+            worker = self.processor.spawn()
+            try:
+                item.output = worker.translate_parsed(pdf_path, parsed, md_output_path, resume=True)
+                item.status = "done"
+            except Exception as e:
+                logger.error(f"翻译失败 {pdf_path}: {e!r}")
+                item.status = "failed"
+                item.error = repr(e)
+            finally:
+                item.translate_seconds = time.monotonic() - begin
+                item.report = worker.report.as_dict()
+                parsed_slots.release()
+            finish(item)
+
+        with ThreadPoolExecutor(self.parse_workers, thread_name_prefix="batch-parse") as parse_pool, \
+                ThreadPoolExecutor(self.translate_workers, thread_name_prefix="batch-translate") as translate_pool:
+            translate_futures: List[Future] = []
+            futures_lock = threading.Lock()
+
+            def parse_job(jobs: List[tuple]) -> None:
+                with slots_lock:
+                    for _ in jobs:
+                        parsed_slots.acquire()
+                begin = time.monotonic()
+                try:
+                    results = self.processor.parse_many(
+                        [pdf_path for _, pdf_path, _, _ in jobs],
+                        [doc_output_dir for _, _, doc_output_dir, _ in jobs],
+                        batch_size=self.parse_batch_size,
+                    )
+                except Exception as e:
+                    results = [e] * len(jobs)
+                parsed_at = time.monotonic()
+                
+                for (item, pdf_path, _, md_output_path), parsed in zip(jobs, results):
+                    item.parse_seconds = parsed_at - begin
+                    if isinstance(parsed, BaseException):
+                        logger.error(f"解析失败 {pdf_path}: {parsed!r}")
+                        item.status = "failed"
+                        item.error = repr(parsed)
+                        parsed_slots.release()
+                        finish(item)
+                        continue
+                    future = translate_pool.submit(
+                        translate_job, item, pdf_path, parsed, md_output_path, parsed_at,
+                    )
+                    with futures_lock:
+                        translate_futures.append(future)
+
+            pending = []
+            for pdf_path in pdfs:
+                item = BatchItem(input=str(pdf_path))
+                summary.items.append(item)
+
+                doc_output_dir, md_output_path = self.processor.get_output_paths(
+                    pdf_path, self._output_root(pdf_path, source_root, output_root),
+                )
+                if self.skip_existing and md_output_path.exists():
+                    item.status = "skipped"
+                    item.output = str(md_output_path)
+                    finish(item)
+                    continue
+                pending.append((item, pdf_path, doc_output_dir, md_output_path))
+
+            parse_futures = [
+                parse_pool.submit(parse_job, pending[start:start + self.parse_batch_size])
+                for start in range(0, len(pending), self.parse_batch_size)
+            ]
+
+            for future in parse_futures:
+                future.result()
+            for future in translate_futures:
+                future.result()
+
+        summary.wall_seconds = time.monotonic() - started
+        summary.save(summary_path)
+        logger.info(
+            f"批量处理完成: 成功 {summary.count('done')}，跳过 {summary.count('skipped')}，"
+            f"失败 {summary.count('failed')}，耗时 {summary.wall_seconds:.1f}秒，汇总: {summary_path}"
+        )
+        return summary
@@ -0,0 +1,178 @@
+"""
+MinerU内容列表
+直接按 content_list 中的块类型（标题、正文、表格、公式、图片等）提取待翻译文本，
+翻译后再渲染为Markdown，无需从渲染好的Markdown中逐行推断结构
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+# 不出现在Markdown中的块（页眉、页脚、页码等）
+DISCARDED_TYPES = frozenset({"header", "footer", "page_number", "aside_text", "page_footnote"})
+
+# 各类型块中需要翻译的标题/脚注字段（旧版本MinerU的图片字段为 img_caption / img_footnote）
+CAPTION_FIELDS = {
+    "image": (("image_caption", "img_caption"), ("image_footnote", "img_footnote")),
+    "table": (("table_caption",), ("table_footnote",)),
+    "code": (("code_caption",), ()),
+}
+
+# 文本单元类型
+TITLE = "title"
+TEXT = "text"
+CAPTION = "caption"
+TABLE_BODY = "table_body"  # HTML表格主体，只翻译其中的单元格
+
+# 字段位置：(字段名, 列表下标)，字段不是列表时下标为None
+FieldKey = Tuple[str, Optional[int]]
+
+
+@dataclass
+class ContentUnit:
+    """内容列表中需要翻译的一段文字"""
+    block: int  # 所在块在内容列表中的下标
+    key: str  # 字段名
+    index: Optional[int]  # 字段为列表时的下标
+    text: str  # 渲染到Markdown中的原文（标题带 # 标记）
+    kind: str  # TITLE / TEXT / CAPTION / TABLE_BODY
+    page: int  # 所在页码 (0-based)
+    level: int = 0  # 标题级别，非标题为0
+
+
+def block_page(item: Mapping) -> int:
+    """块所在页码，缺失时为0"""
+    page = item.get("page_idx")
+    return page if isinstance(page, int) else 0
+
+
+def _heading(item: Mapping) -> Tuple[int, str]:
+    """正文块的标题级别和渲染后的文本"""
+    text = item.get("text") or ""
+    level = item.get("text_level")
+    if isinstance(level, int) and level > 0:
+        level = min(level, 6)
+        return level, f"{'#' * level} {text}"
+    return 0, text
+
+
+def _caption_key(item: Mapping, candidates: Iterable[str]) -> Optional[str]:
+    """块中实际存在的标题/脚注字段名"""
+    for key in candidates:
+        if isinstance(item.get(key), list):
+            return key
+    return None
+
+
+def extract_units(content_list: List[Mapping]) -> List[ContentUnit]:
+    """
+    按文档顺序提取需要翻译的文字
+
+    正文和标题整体作为一段，列表逐项、图片/表格/代码的标题和脚注逐条作为一段，
+    表格主体整体作为一个TABLE_BODY单元（由调用方只翻译其中的单元格）；公式和代码主体不翻译。
+
+    Args:
+        content_list: MinerU的内容列表
+
+    Returns:
+        文本单元列表
+    """
+    units: List[ContentUnit] = []
+    for i, item in enumerate(content_list):
+        block_type = item.get("type")
+        page = block_page(item)
+        if block_type == "text":
+            level, text = _heading(item)
+            if text.strip():
+                units.append(ContentUnit(i, "text", None, text, TITLE if level else TEXT, page, level))
+        elif block_type == "list":
+            for j, text in enumerate(item.get("list_items") or []):
+                if isinstance(text, str) and text.strip():
+                    units.append(ContentUnit(i, "list_items", j, text, TEXT, page))
+        elif block_type in CAPTION_FIELDS:
+            for candidates in CAPTION_FIELDS[block_type]:
+                key = _caption_key(item, candidates)
+                if key is None:
+                    continue
+                for j, text in enumerate(item[key]):
+                    if isinstance(text, str) and text.strip():
+                        units.append(ContentUnit(i, key, j, text, CAPTION, page))
+            if block_type == "table" and item.get("table_body"):
+                units.append(ContentUnit(i, "table_body", None, item["table_body"], TABLE_BODY, page))
+    return units
+
+
+def render_block(item: Mapping, overrides: Optional[Dict[FieldKey, str]] = None) -> str:
+    """
+    把单个块渲染为Markdown（与MinerU生成的Markdown格式一致）
+
+    Args:
+        item: 内容列表中的块
+        overrides: 替换的字段内容（如译文），键为 (字段名, 列表下标)
+
+    Returns:
+        Markdown文本，不出现在Markdown中的块返回空字符串
+    """
+    overrides = overrides or {}
+    block_type = item.get("type")
+
+    def captions(candidates: Iterable[str]) -> List[str]:
+        key = _caption_key(item, candidates)
+        if key is None:
+            return []
+        return [
+            overrides.get((key, j), text)
+            for j, text in enumerate(item[key])
+            if isinstance(text, str) and text.strip()
+        ]
+
+    if block_type in DISCARDED_TYPES:
+        return ""
+
+    if block_type == "text":
+        return overrides.get(("text", None), _heading(item)[1])
+
+    if block_type == "equation":
+        return item.get("text") or ""
+
+    if block_type == "list":
+        # 替换后的列表项可能含多段（如双语模式下的原文引用块），需要用空行分隔，
+        # 否则下一项会被并入上一项的引用块
+        separator = "\n\n" if any(key == "list_items" for key, _ in overrides) else "\n"
+        return separator.join(
+            overrides.get(("list_items", j), text)
+            for j, text in enumerate(item.get("list_items") or [])
+            if isinstance(text, str)
+        )
+
+    if block_type == "image":
+        caption_keys, footnote_keys = CAPTION_FIELDS["image"]
+        image = f"![]({item['img_path']})" if item.get("img_path") else ""
+        footnotes = captions(footnote_keys)
+        if footnotes:
+            # 有脚注时标题在图片之前，脚注在图片之后
+            return "".join(
+                [f"{caption}  \n" for caption in captions(caption_keys)]
+                + [image]
+                + [f"  \n{footnote}" for footnote in footnotes]
+            )
+        return image + "".join(f"  \n{caption}" for caption in captions(caption_keys))
+
+    if block_type == "table":
+        caption_keys, footnote_keys = CAPTION_FIELDS["table"]
+        parts = [f"{caption}  \n" for caption in captions(caption_keys)]
+        if item.get("table_body"):
+            parts.append(f"\n{overrides.get(('table_body', None), item['table_body'])}\n")
+        elif item.get("img_path"):
+            parts.append(f"![]({item['img_path']})")
+        parts.extend(f"\n{footnote}  " for footnote in captions(footnote_keys))
+        return "".join(parts)
+
+    if block_type == "code":
+        caption_keys, _ = CAPTION_FIELDS["code"]
+        body = item.get("code_body") or ""
+        if body and not body.lstrip().startswith("```"):
+            body = f"```\n{body}\n```"
+        return "".join(f"{caption}  \n" for caption in captions(caption_keys)) + body
+
+    # 未知类型：有文本时按正文输出
+    return item.get("text") or ""
@@ -0,0 +1,266 @@
+"""
+翻译预估
+在不调用翻译接口的情况下估算token用量、费用和耗时（translate --dry-run）
+"""
+
+import heapq
+from dataclasses import asdict, dataclass
+from typing import Iterable, List, Optional, Tuple
+
+from ..translators import BaseTranslator, CachedTranslator, GoogleTranslator
+from ..translators.packing import build_packed_input, pack_texts
+from ..translators.prompts import get_packed_translation_prompt
+from ..utils.text import estimate_output_tokens, estimate_tokens
+
+
+@dataclass
+class CostEstimate:
+    """预估结果"""
+    documents: int = 0
+    paragraphs: int = 0  # 需要翻译的段落数
+    cached: int = 0  # 已有缓存译文、不会发送请求的段落数
+    skipped: int = 0  # 位于参考文献等章节、原样保留的段落数
+    skipped_tokens: int = 0  # 因跳过这些段落节省的输入和输出token
+    skipped_cost: float = 0.0  # 因跳过这些段落节省的费用
+    in_target_lang: int = 0  # 已是目标语言、不会发送请求的段落数
+    table_cells: int = 0  # 需要翻译的表格单元格数（去重后，含已缓存的）
+    requests: int = 0  # 预计请求数
+    input_chars: int = 0  # 需要翻译的原文字符数
+    input_tokens: int = 0  # 预计输入token（含系统提示词）
+    prompt_tokens: int = 0  # 其中系统提示词的token
+    output_tokens: int = 0  # 预计输出token
+    cost: float = 0.0  # 预计费用
+    currency: str = "USD"
+    priced: bool = False  # 是否配置了价格，未配置时费用均为0
+    seconds: float = 0.0  # 预计翻译耗时（秒）
+    bottleneck: str = ""  # 决定耗时的因素: concurrency / requests_per_minute / tokens_per_minute
+    schedule_seconds: float = 0.0  # 只受并发上限约束时各文档的翻译耗时之和
+    busy_seconds: float = 0.0  # 所有请求耗时之和
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class TranslationEstimator:
+    """
+    翻译预估器
+
+    按处理器的批量大小和翻译器的打包、并发设置模拟请求的划分，
+    用 estimate_tokens 估算输入、estimate_output_tokens 估算输出，
+    再按配置的价格、请求耗时和限流（RPM/TPM）推算费用与耗时。
+    """
+
+    def __init__(
+        self,
+        translator: BaseTranslator,
+        batch_size: int = 32,
+        input_price: float = 0.0,
+        output_price: float = 0.0,
+        currency: str = "USD",
+        request_latency: float = 1.0,
+        output_tokens_per_second: float = 50.0,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+    ):
+        """
+        初始化预估器
+
+        Args:
+            translator: 翻译器（带缓存时已缓存的段落不计入请求）
+            batch_size: 每次提交给翻译器的段落数
+            input_price: 每百万输入token的价格（google为每百万字符）
+            output_price: 每百万输出token的价格
+            currency: 货币单位
+            request_latency: 单个请求的固定耗时（秒）
+            output_tokens_per_second: 模型输出速度（token/秒）
+            requests_per_minute: 每分钟请求数上限，0表示不限制
+            tokens_per_minute: 每分钟token数上限，0表示不限制
+        """
+        self.translator = translator
+        self.backend = translator.translator if isinstance(translator, CachedTranslator) else translator
+        self.batch_size = max(1, batch_size)
+        self.input_price = input_price
+        self.output_price = output_price
+        self.currency = currency
+        self.request_latency = request_latency
+        self.output_tokens_per_second = output_tokens_per_second
+        self.max_concurrency = max(1, getattr(self.backend, "max_concurrency", 1))
+
+        # 限流只作用于带限流器的翻译器
+        has_limiter = getattr(self.backend, "rate_limiter", None) is not None
+        self.requests_per_minute = requests_per_minute if has_limiter else 0
+        self.tokens_per_minute = tokens_per_minute if has_limiter else 0
+
+    def _plan_batch(self, texts: List[str], pack_tokens: Optional[int] = None) -> List[Tuple[int, int, int]]:
+        """
+        一批段落会产生的请求
+
+        Args:
+            texts: 一次提交给翻译器的段落
+            pack_tokens: 打包的token预算，None表示使用翻译器的pack_tokens设置
+
+        Returns:
+            每个请求的 (输入token, 其中提示词token, 输出token)
+        """
+        source_lang = self.backend.source_lang
+        target_lang = self.backend.target_lang
+        outputs = [estimate_output_tokens(text, source_lang, target_lang) for text in texts]
+
+        # Google按批发送一次请求，没有系统提示词
+        if isinstance(self.backend, GoogleTranslator):
+            return [(sum(estimate_tokens(text) for text in texts), 0, sum(outputs))]
+
+        system_prompt = getattr(self.backend, "system_prompt", "") or ""
+        prompt_tokens = estimate_tokens(system_prompt)
+        if pack_tokens is None:
+            pack_tokens = getattr(self.backend, "pack_tokens", 0)
+        if pack_tokens <= 0:
+            return [
+                (prompt_tokens + estimate_tokens(text), prompt_tokens, output)
+                for text, output in zip(texts, outputs)
+            ]
+
+        packed_prompt_tokens = estimate_tokens(get_packed_translation_prompt(system_prompt))
+        requests = []
+        for group in pack_texts(texts, pack_tokens):
+            if len(group) == 1:
+                i = group[0]
+                requests.append((prompt_tokens + estimate_tokens(texts[i]), prompt_tokens, outputs[i]))
+                continue
+            content = build_packed_input([texts[i] for i in group])
+            requests.append((
+                packed_prompt_tokens + estimate_tokens(content),
+                packed_prompt_tokens,
+                sum(outputs[i] for i in group),
+            ))
+        return requests
+
+    def _request_seconds(self, output_tokens: int) -> float:
+        """单个请求的预计耗时"""
+        if isinstance(self.backend, GoogleTranslator) or self.output_tokens_per_second <= 0:
+            return self.request_latency
+        return self.request_latency + output_tokens / self.output_tokens_per_second
+
+    def _schedule(self, durations: List[float]) -> float:
+        """按并发上限同时执行一批请求的总耗时"""
+        slots = [0.0] * min(self.max_concurrency, len(durations))
+        for duration in durations:
+            heapq.heappush(slots, heapq.heappop(slots) + duration)
+        return max(slots, default=0.0)
+
+    def estimate(
+        self,
+        texts: List[str],
+        skipped: Optional[List[str]] = None,
+        table_cells: Optional[List[str]] = None,
+        table_pack_tokens: int = 0,
+    ) -> CostEstimate:
+        """
+        预估一个文档中待翻译段落的用量、费用和耗时
+
+        Args:
+            texts: 发送给翻译器的段落（已经过处理器的段落过滤）
+            skipped: 因位于参考文献等章节而不翻译的段落，用于统计节省的用量
+            table_cells: 去重后的表格单元格，在段落之前一次提交并按table_pack_tokens打包
+            table_pack_tokens: 表格单元格打包的token预算
+
+        Returns:
+            预估结果
+        """
+        result = CostEstimate(documents=1, paragraphs=len(texts), currency=self.currency)
+        if skipped:
+            result.skipped = len(skipped)
+            input_tokens = sum(estimate_tokens(text) for text in skipped)
+            output_tokens = sum(
+                estimate_output_tokens(text, self.backend.source_lang, self.backend.target_lang)
+                for text in skipped
+            )
+            result.skipped_tokens = input_tokens + output_tokens
+            if isinstance(self.backend, GoogleTranslator):
+                result.skipped_cost = sum(len(text) for text in skipped) / 1e6 * self.input_price
+            else:
+                result.skipped_cost = (
+                    input_tokens / 1e6 * self.input_price + output_tokens / 1e6 * self.output_price
+                )
+
+        # 表格单元格在段落之前一次提交
+        if table_cells:
+            result.table_cells = len(table_cells)
+            cells = self._uncached(table_cells, result)
+            if cells:
+                self._add_batch(result, cells, self._plan_batch(cells, table_pack_tokens))
+
+        texts = self._uncached(texts, result)
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            self._add_batch(result, batch, self._plan_batch(batch))
+
+        return self._finish(result)
+
+    def _uncached(self, texts: List[str], result: CostEstimate) -> List[str]:
+        """去掉翻译器会直接跳过的文本（如空白）和已缓存的文本，缓存命中数计入result"""
+        texts = [text for text in texts if not self.backend._should_skip(text)]
+        if isinstance(self.translator, CachedTranslator) and texts:
+            cached = self.translator.is_cached(texts)
+            result.cached += sum(cached)
+            texts = [text for text, hit in zip(texts, cached) if not hit]
+        return texts
+
+    def _add_batch(self, result: CostEstimate, batch: List[str], requests: List[Tuple[int, int, int]]) -> None:
+        """累计一次提交产生的请求"""
+        durations = [self._request_seconds(output) for _, _, output in requests]
+        result.input_chars += sum(len(text) for text in batch)
+        result.requests += len(requests)
+        result.input_tokens += sum(tokens for tokens, _, _ in requests)
+        result.prompt_tokens += sum(prompt for _, prompt, _ in requests)
+        result.output_tokens += sum(output for _, _, output in requests)
+        result.busy_seconds += sum(durations)
+        # 处理器逐批提交，批内请求按并发上限同时进行
+        result.schedule_seconds += self._schedule(durations)
+
+    def combine(self, estimates: Iterable[CostEstimate], workers: int = 1) -> CostEstimate:
+        """
+        合并多个文档的预估结果
+
+        Args:
+            estimates: 各文档的预估结果
+            workers: 同时翻译的文档数（共享同一翻译器的并发上限和限流）
+
+        Returns:
+            合并后的预估结果
+        """
+        total = CostEstimate(currency=self.currency)
+        for estimate in estimates:
+            for name in (
+                "documents", "paragraphs", "cached", "skipped", "skipped_tokens", "skipped_cost",
+                "in_target_lang", "table_cells",
+                "requests", "input_chars",
+                "input_tokens", "prompt_tokens", "output_tokens",
+                "schedule_seconds", "busy_seconds",
+            ):
+                setattr(total, name, getattr(total, name) + getattr(estimate, name))
+        return self._finish(total, workers)
+
+    def _finish(self, result: CostEstimate, workers: int = 1) -> CostEstimate:
+        """根据累计用量计算费用和耗时"""
+        result.priced = self.input_price > 0 or self.output_price > 0
+        if isinstance(self.backend, GoogleTranslator):
+            result.cost = result.input_chars / 1e6 * self.input_price
+        else:
+            result.cost = (
+                result.input_tokens / 1e6 * self.input_price
+                + result.output_tokens / 1e6 * self.output_price
+            )
+
+        # 多个文档同时翻译时，总并发仍受翻译器的并发上限约束
+        candidates = [(
+            max(result.schedule_seconds / max(1, workers), result.busy_seconds / self.max_concurrency),
+            "concurrency",
+        )]
+        if self.requests_per_minute > 0:
+            candidates.append((result.requests / self.requests_per_minute * 60, "requests_per_minute"))
+        if self.tokens_per_minute > 0:
+            tokens = result.input_tokens + result.output_tokens
+            candidates.append((tokens / self.tokens_per_minute * 60, "tokens_per_minute"))
+        result.seconds, result.bottleneck = max(candidates, key=lambda item: item[0])
+        return result
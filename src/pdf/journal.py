@@ -0,0 +1,206 @@
+"""
+翻译检查点日志
+逐段追加记录已完成的翻译，任务中断后可从日志恢复，只翻译缺失的段落
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Optional, Tuple, Union
+
+from loguru import logger
+
+from ..translators import BaseTranslator, CachedTranslator
+
+
+def hash_paragraph(text: str) -> str:
+    """段落内容哈希（日志和增量翻译的匹配键）"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def journal_meta(translator: BaseTranslator) -> dict:
+    """
+    日志元信息：与翻译缓存键相同的翻译器、模型、系统提示词哈希和语言对，
+    任何一项变化时旧日志中的译文都不会被复用
+    """
+    backend = translator.translator if isinstance(translator, CachedTranslator) else translator
+    system_prompt = getattr(backend, "system_prompt", "") or ""
+    return {
+        "backend": type(backend).__name__,
+        "model": getattr(backend, "model", "") or "",
+        "prompt_hash": hashlib.sha256(system_prompt.encode("utf-8")).hexdigest(),
+        "source_lang": translator.source_lang,
+        "target_lang": translator.target_lang,
+    }
+
+
+class TranslationJournal:
+    """
+    追加写入的段落翻译日志（JSON Lines）
+
+    首行记录翻译器、模型和语言对等元信息，其后每行为 {"h": 原文哈希, "t": 译文}。
+    每次写入都会flush到操作系统，fsync按条数或时间间隔批量执行，
+    进程被杀死时最多丢失最后一小批记录；末尾不完整的行在读取时忽略。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        meta: Optional[dict] = None,
+        fsync_every: int = 32,
+        fsync_interval: float = 2.0,
+    ):
+        """
+        初始化检查点日志
+
+        Args:
+            path: 日志文件路径
+            meta: 元信息（如语言对），恢复时元信息不一致的日志会被忽略
+            fsync_every: 每写入多少条记录执行一次fsync
+            fsync_interval: 距上次fsync超过该秒数时执行fsync
+        """
+        self.path = Path(path)
+        self.meta = meta or {}
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @staticmethod
+    def read(path: str, meta: Optional[dict] = None) -> Dict[str, str]:
+        """
+        读取日志中的全部记录
+
+        Args:
+            path: 日志文件路径
+            meta: 期望的元信息，不一致时返回空结果
+
+        Returns:
+            {原文哈希: 译文}
+        """
+        path = Path(path)
+        if not path.exists():
+            return {}
+
+        entries: Dict[str, str] = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 进程中断时最后一行可能不完整
+                    logger.debug(f"忽略日志中不完整的记录: {path}:{line_no + 1}")
+                    continue
+                if "meta" in record:
+                    if meta is not None and record["meta"] != meta:
+                        logger.warning(f"检查点日志的语言/配置与当前任务不一致，已忽略: {path}")
+                        return {}
+                    continue
+                entries[record["h"]] = record["t"]
+        return entries
+
+    def load(self) -> Dict[str, str]:
+        """读取本日志中已有的记录"""
+        return self.read(str(self.path), self.meta)
+
+    def _meta_matches(self) -> bool:
+        """已有日志的元信息是否与当前任务一致"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                header = json.loads(f.readline())
+        except (OSError, json.JSONDecodeError):
+            return False
+        return header.get("meta") == self.meta
+
+    def open(self, resume: bool = False) -> None:
+        """
+        打开日志准备写入
+
+        Args:
+            resume: 是否在已有日志后追加；否则（或元信息不一致时）清空重写
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        append = resume and self.path.exists() and self._meta_matches()
+        self._file = open(self.path, "a" if append else "w", encoding="utf-8")
+        if not append:
+            self._file.write(json.dumps({"meta": self.meta}, ensure_ascii=False) + "\n")
+            self._sync()
+
+    def record_many(self, pairs: Iterable[Tuple[str, str]]) -> None:
+        """
+        追加记录多段翻译
+
+        Args:
+            pairs: (原文, 译文) 序列
+        """
+        if self._file is None:
+            return
+        count = 0
+        for source, translated in pairs:
+            self._file.write(json.dumps(
+                {"h": hash_paragraph(source), "t": translated},
+                ensure_ascii=False,
+            ) + "\n")
+            count += 1
+        if not count:
+            return
+        self._file.flush()
+        self._unsynced += count
+        if (
+            self._unsynced >= self.fsync_every
+            or time.monotonic() - self._last_sync >= self.fsync_interval
+        ):
+            self._sync()
+
+    def record(self, source: str, translated: str) -> None:
+        """追加记录单段翻译"""
+        self.record_many([(source, translated)])
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """同步并关闭日志"""
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+
+def load_previous_translations(
+    previous: Union[str, Path, Mapping[str, str]],
+    meta: Optional[dict] = None,
+) -> Dict[str, str]:
+    """
+    加载上一次运行的译文，用于增量翻译
+
+    Args:
+        previous: 上一次运行的检查点日志文件、输出目录（递归查找其中的日志），
+            或 {原文: 译文} 映射
+        meta: 期望的日志元信息，不一致的日志会被忽略
+
+    Returns:
+        {原文哈希: 译文}
+    """
+    if isinstance(previous, Mapping):
+        return {hash_paragraph(source): translated for source, translated in previous.items()}
+
+    path = Path(previous)
+    if path.is_dir():
+        journals = sorted(path.rglob("*.journal.jsonl"), key=lambda p: p.stat().st_mtime)
+    else:
+        journals = [path]
+    if not journals or not journals[0].exists():
+        logger.warning(f"未找到上一次运行的检查点日志: {previous}")
+        return {}
+
+    entries: Dict[str, str] = {}
+    for journal_path in journals:
+        entries.update(TranslationJournal.read(str(journal_path), meta))
+    return entries
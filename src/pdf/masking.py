@@ -0,0 +1,104 @@
+"""
+占位符遮蔽
+翻译前把行内公式、文献引用和链接替换为简短占位符，翻译后还原，
+减少请求的token数并避免模型改写这些内容
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# 占位符格式，编号从1开始
+PLACEHOLDER = "{{{{{}}}}}"
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(\d+)\s*\}\}")
+
+# 需要遮蔽的片段：行内公式、数字引用、URL/DOI
+# 行内 $...$ 的规则与pandoc相同：定界符内侧不能是空白，结束的 $ 后不能紧跟数字，
+# 这样 "costs $5 and ... $10" 中的金额不会被当作公式
+MASK_PATTERN = re.compile(
+    r"""
+    \$\$.+?\$\$                                     # 行内 $$...$$
+    | (?<![\\$])\$(?![\s$])(?:\\.|[^$\\\n])+?(?<!\s)\$(?!\d)  # 行内 $...$（允许 \$ 转义）
+    | \[\d+(?:\s*[,，;–—-]\s*\d+)*\]                # 数字引用 [12] [1, 3-5]
+    | (?:https?://|www\.)[^\s<>()\[\]{}"']+         # URL
+    | \b(?:doi:\s*)?10\.\d{4,9}/[^\s<>()\[\]{}"']+  # DOI
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+
+# URL/DOI末尾通常是句子标点而不是链接的一部分
+TRAILING_PUNCTUATION = ".,;:!?。，；：！？"
+
+# 去掉占位符后不含任何字母的文本无需翻译
+WORD_PATTERN = re.compile(r"[^\W\d_]", re.UNICODE)
+
+
+@dataclass
+class MaskedText:
+    """遮蔽后的文本"""
+    text: str  # 用占位符替换后的文本
+    spans: List[str] = field(default_factory=list)  # 第n个占位符对应spans[n-1]
+
+    @property
+    def translatable(self) -> bool:
+        """去掉占位符后是否还有需要翻译的文字"""
+        return bool(WORD_PATTERN.search(PLACEHOLDER_PATTERN.sub("", self.text)))
+
+
+def mask_text(text: str) -> MaskedText:
+    """
+    把行内公式、数字引用和链接替换为 {{n}} 占位符
+
+    只替换比占位符更长的片段；原文中已有类似占位符的文本不做处理
+
+    Args:
+        text: 原文
+
+    Returns:
+        遮蔽后的文本及被替换的片段
+    """
+    if PLACEHOLDER_PATTERN.search(text):
+        return MaskedText(text)
+
+    spans: List[str] = []
+
+    def replace(match: re.Match) -> str:
+        span = match.group(0)
+        trailing = ""
+        if not span.startswith(("$", "[")):
+            stripped = span.rstrip(TRAILING_PUNCTUATION)
+            trailing = span[len(stripped):]
+            span = stripped
+        placeholder = PLACEHOLDER.format(len(spans) + 1)
+        if len(span) <= len(placeholder):
+            return match.group(0)
+        spans.append(span)
+        return placeholder + trailing
+
+    return MaskedText(MASK_PATTERN.sub(replace, text), spans)
+
+
+def strip_spans(text: str) -> str:
+    """去掉公式、引用和链接（用于语言检测等只关心正文文字的场景）"""
+    return MASK_PATTERN.sub(" ", text)
+
+
+def unmask_text(translated: str, masked: MaskedText) -> Optional[str]:
+    """
+    把译文中的占位符还原为原始片段
+
+    Args:
+        translated: 模型返回的译文
+        masked: 翻译前的遮蔽结果
+
+    Returns:
+        还原后的译文；有占位符缺失或出现未知编号时返回None
+    """
+    if not masked.spans:
+        return translated
+
+    found = {int(n) for n in PLACEHOLDER_PATTERN.findall(translated)}
+    if found != set(range(1, len(masked.spans) + 1)):
+        return None
+
+    return PLACEHOLDER_PATTERN.sub(lambda m: masked.spans[int(m.group(1)) - 1], translated)
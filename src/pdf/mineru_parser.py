@@ -8,11 +8,14 @@ import json
 import shutil
 import tempfile
 from pathlib import Path
-from typing import Optional, List
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 
 from loguru import logger
 
+if TYPE_CHECKING:
+    from .parse_cache import ParseCache
+
 
 @dataclass
 class ParsedDocument:
@@ -26,6 +29,9 @@ class MineruParser:
     """
     MinerU PDF解析器
     将PDF转换为Markdown格式
+
+    页码范围一律为 [start_page, end_page)：页码从0开始，结束页不含在内，
+    None表示到最后一页；传给MinerU时由_slice_pages转换为其包含结束页的约定
     """
     
     def __init__(
@@ -35,6 +41,7 @@ class MineruParser:
         method: str = "auto",
         formula_enable: bool = True,
         table_enable: bool = True,
+        cache: Optional["ParseCache"] = None,
     ):
         """
         初始化MinerU解析器
@@ -45,12 +52,14 @@ class MineruParser:
             method: 解析方法 ('auto', 'txt', 'ocr')
             formula_enable: 是否启用公式解析
             table_enable: 是否启用表格解析
+            cache: 解析结果缓存，相同PDF和参数重复解析时直接复用
         """
         self.backend = backend
         self.lang = lang
         self.method = method
         self.formula_enable = formula_enable
         self.table_enable = table_enable
+        self.cache = cache
         
         # 延迟导入检查
         self._mineru_available = None
@@ -66,6 +75,116 @@ class MineruParser:
                 logger.warning("MinerU未安装，请运行: pip install mineru")
         return self._mineru_available
     
+    def get_page_count(self, pdf_path: str) -> int:
+        """
+        获取PDF总页数
+        
+        Args:
+            pdf_path: PDF文件路径
+        
+        Returns:
+            页数
+        """
+        try:
+            import pypdfium2 as pdfium
+        except ImportError:
+            raise ImportError("MinerU未安装，请运行: pip install mineru")
+        
+        pdf = pdfium.PdfDocument(str(pdf_path))
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    
+    def _load_cached(
+        self,
+        pdf_path: Path,
+        output_dir: str,
+        start_page: int,
+        end_page: Optional[int],
+    ) -> Tuple[Optional[str], Optional[ParsedDocument]]:
+        """
+        查询解析缓存
+        
+        Returns:
+            (缓存键, 命中的解析结果)，未启用缓存时均为None
+        """
+        if self.cache is None:
+            return None, None
+        cache_key = self.cache.make_key(
+            str(pdf_path),
+            backend=self.backend,
+            method=self.method,
+            lang=self.lang,
+            formula_enable=self.formula_enable,
+            table_enable=self.table_enable,
+            start_page=start_page,
+            end_page=end_page,
+        )
+        method_dir = self.method if self.backend == "pipeline" else "vlm"
+        image_dir = os.path.join(output_dir, pdf_path.stem, method_dir, "images")
+        return cache_key, self.cache.load(cache_key, image_dir)
+    
+    def _build_pipeline_document(
+        self,
+        output_dir: str,
+        pdf_file_name: str,
+        infer_result,
+        image_list,
+        pdf_doc,
+        lang: str,
+        ocr_enabled: bool,
+    ) -> ParsedDocument:
+        """把pipeline后端单个文档的推理结果转换为Markdown和内容列表"""
+        from mineru.cli.common import prepare_env
+        from mineru.data.data_reader_writer import FileBasedDataWriter
+        from mineru.utils.enum_class import MakeMode
+        from mineru.backend.pipeline.model_json_to_middle_json import result_to_middle_json as pipeline_result_to_middle_json
+        from mineru.backend.pipeline.pipeline_middle_json_mkcontent import union_make as pipeline_union_make
+        
+        # 准备输出环境
+        local_image_dir, local_md_dir = prepare_env(output_dir, pdf_file_name, self.method)
+        image_writer = FileBasedDataWriter(local_image_dir)
+        
+        # 转换结果
+        middle_json = pipeline_result_to_middle_json(
+            infer_result,
+            image_list,
+            pdf_doc,
+            image_writer,
+            lang,
+            ocr_enabled,
+            self.formula_enable,
+        )
+        
+        pdf_info = middle_json["pdf_info"]
+        image_dir = os.path.basename(local_image_dir)
+        
+        # 生成Markdown内容
+        md_content = pipeline_union_make(pdf_info, MakeMode.MM_MD, image_dir)
+        
+        # 生成内容列表
+        content_list = pipeline_union_make(pdf_info, MakeMode.CONTENT_LIST, image_dir)
+        
+        return ParsedDocument(
+            markdown_content=md_content,
+            images_dir=local_image_dir,
+            content_list=content_list,
+        )
+    
+    @staticmethod
+    def _slice_pages(pdf_bytes: bytes, start_page: int, end_page: Optional[int]) -> bytes:
+        """
+        截取 [start_page, end_page) 范围内的页面
+
+        MinerU的convert_pdf_bytes_to_bytes_by_pypdfium2中结束页包含在内，
+        页码范围只在这里转换，其余代码一律使用不含结束页的约定
+        """
+        from mineru.cli.common import convert_pdf_bytes_to_bytes_by_pypdfium2
+
+        last_page = None if end_page is None else end_page - 1
+        return convert_pdf_bytes_to_bytes_by_pypdfium2(pdf_bytes, start_page, last_page)
+    
     def parse_pdf(
         self,
         pdf_path: str,
@@ -79,48 +198,45 @@ class MineruParser:
         Args:
             pdf_path: PDF文件路径
             output_dir: 输出目录，默认使用临时目录
-            start_page: 起始页码 (0-based)
-            end_page: 结束页码 (0-based)，None表示到最后
+            start_page: 起始页码 (0-based，包含)
+            end_page: 结束页码 (0-based，不含)，None表示到最后
         
         Returns:
             ParsedDocument: 解析后的文档对象
         """
+        pdf_path = Path(pdf_path)
+        pdf_file_name = pdf_path.stem
+        
+        # 确定输出目录
+        if output_dir is None:
+            output_dir = tempfile.mkdtemp(prefix="mineru_")
+            cleanup_temp = True
+        else:
+            output_dir = str(output_dir)
+            cleanup_temp = False
+        
+        # 命中解析缓存时跳过MinerU
+        cache_key, cached = self._load_cached(pdf_path, output_dir, start_page, end_page)
+        if cached is not None:
+            return cached
+        
         if not self._check_mineru():
             raise ImportError("MinerU未安装，请运行: pip install mineru")
         
-        from mineru.cli.common import (
-            convert_pdf_bytes_to_bytes_by_pypdfium2,
-            prepare_env,
-            read_fn,
-        )
+        from mineru.cli.common import prepare_env, read_fn
         from mineru.data.data_reader_writer import FileBasedDataWriter
         from mineru.utils.enum_class import MakeMode
         from mineru.backend.pipeline.pipeline_analyze import doc_analyze as pipeline_doc_analyze
-        from mineru.backend.pipeline.model_json_to_middle_json import result_to_middle_json as pipeline_result_to_middle_json
-        from mineru.backend.pipeline.pipeline_middle_json_mkcontent import union_make as pipeline_union_make
         from mineru.backend.vlm.vlm_analyze import doc_analyze as vlm_doc_analyze
         from mineru.backend.vlm.vlm_middle_json_mkcontent import union_make as vlm_union_make
         
-        pdf_path = Path(pdf_path)
-        pdf_file_name = pdf_path.stem
-        
         # 读取PDF字节
         pdf_bytes = read_fn(str(pdf_path))
         
-        # 确定输出目录
-        if output_dir is None:
-            output_dir = tempfile.mkdtemp(prefix="mineru_")
-            cleanup_temp = True
-        else:
-            output_dir = str(output_dir)
-            cleanup_temp = False
-        
         try:
             if self.backend == "pipeline":
                 # 处理页码范围
-                pdf_bytes = convert_pdf_bytes_to_bytes_by_pypdfium2(
-                    pdf_bytes, start_page, end_page
-                )
+                pdf_bytes = self._slice_pages(pdf_bytes, start_page, end_page)
                 
                 # 进行文档分析
                 infer_results, all_image_lists, all_pdf_docs, lang_list, ocr_enabled_list = \
@@ -132,38 +248,22 @@ class MineruParser:
                         table_enable=self.table_enable,
                     )
                 
-                # 准备输出环境
-                local_image_dir, local_md_dir = prepare_env(output_dir, pdf_file_name, self.method)
-                image_writer = FileBasedDataWriter(local_image_dir)
-                
-                # 转换结果
-                middle_json = pipeline_result_to_middle_json(
+                parsed = self._build_pipeline_document(
+                    output_dir,
+                    pdf_file_name,
                     infer_results[0],
                     all_image_lists[0],
                     all_pdf_docs[0],
-                    image_writer,
                     lang_list[0],
                     ocr_enabled_list[0],
-                    self.formula_enable,
                 )
                 
-                pdf_info = middle_json["pdf_info"]
-                image_dir = os.path.basename(local_image_dir)
-                
-                # 生成Markdown内容
-                md_content = pipeline_union_make(pdf_info, MakeMode.MM_MD, image_dir)
-                
-                # 生成内容列表
-                content_list = pipeline_union_make(pdf_info, MakeMode.CONTENT_LIST, image_dir)
-                
             else:
                 # VLM后端
                 backend_name = self.backend[4:] if self.backend.startswith("vlm-") else self.backend
                 
                 # 处理页码范围
-                pdf_bytes = convert_pdf_bytes_to_bytes_by_pypdfium2(
-                    pdf_bytes, start_page, end_page
-                )
+                pdf_bytes = self._slice_pages(pdf_bytes, start_page, end_page)
                 
                 local_image_dir, local_md_dir = prepare_env(output_dir, pdf_file_name, "vlm")
                 image_writer = FileBasedDataWriter(local_image_dir)
@@ -182,12 +282,17 @@ class MineruParser:
                 
                 # 生成内容列表
                 content_list = vlm_union_make(pdf_info, MakeMode.CONTENT_LIST, image_dir)
+                
+                parsed = ParsedDocument(
+                    markdown_content=md_content,
+                    images_dir=local_image_dir,
+                    content_list=content_list,
+                )
             
-            return ParsedDocument(
-                markdown_content=md_content,
-                images_dir=local_image_dir,
-                content_list=content_list,
-            )
+            if self.cache is not None:
+                self.cache.store(cache_key, parsed)
+            
+            return parsed
             
         except Exception as e:
             logger.exception(f"解析PDF失败: {e}")
@@ -195,6 +300,136 @@ class MineruParser:
                 shutil.rmtree(output_dir, ignore_errors=True)
             raise
     
+    def parse_many(
+        self,
+        pdf_paths: List[str],
+        output_dirs: List[str],
+        page_ranges: Optional[List[Tuple[int, Optional[int]]]] = None,
+        batch_size: int = 4,
+        return_exceptions: bool = False,
+    ) -> List[Union[ParsedDocument, BaseException]]:
+        """
+        批量解析多个PDF（或同一PDF的多个页码范围）
+        
+        pipeline后端每batch_size个文档调用一次doc_analyze，由MinerU在文档间合并批量推理，
+        再按文档拆分推理结果分别生成Markdown。命中解析缓存的文档不参与推理。
+        其他后端不支持多文档推理，逐个调用parse_pdf。
+        
+        Args:
+            pdf_paths: PDF文件路径列表
+            output_dirs: 与pdf_paths一一对应的输出目录
+            page_ranges: 与pdf_paths一一对应的 (起始页, 结束页)，0-based且不含结束页，
+                结束页为None表示到最后；默认全部页
+            batch_size: 每次doc_analyze处理的文档数
+            return_exceptions: 为True时解析失败的文档在结果中以异常对象返回，
+                否则抛出第一个异常
+        
+        Returns:
+            与输入顺序一致的解析结果列表
+        """
+        if page_ranges is None:
+            page_ranges = [(0, None)] * len(pdf_paths)
+        results: List[Union[ParsedDocument, BaseException, None]] = [None] * len(pdf_paths)
+        
+        def parse_one(index: int) -> None:
+            start_page, end_page = page_ranges[index]
+            try:
+                results[index] = self.parse_pdf(pdf_paths[index], output_dirs[index], start_page, end_page)
+            except Exception as e:
+                results[index] = e
+        
+        if self.backend != "pipeline" or batch_size <= 1:
+            for index in range(len(pdf_paths)):
+                parse_one(index)
+            return self._collect_results(results, return_exceptions)
+        
+        # 先查缓存，只把未命中的文档送入推理
+        pending = []
+        cache_keys: Dict[int, Optional[str]] = {}
+        for index, pdf_path in enumerate(pdf_paths):
+            start_page, end_page = page_ranges[index]
+            try:
+                cache_keys[index], cached = self._load_cached(
+                    Path(pdf_path), str(output_dirs[index]), start_page, end_page,
+                )
+            except OSError as e:
+                results[index] = e
+                continue
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append(index)
+        
+        if pending and not self._check_mineru():
+            raise ImportError("MinerU未安装，请运行: pip install mineru")
+        
+        for group_start in range(0, len(pending), batch_size):
+            group = pending[group_start:group_start + batch_size]
+            try:
+                self._parse_pipeline_group(group, pdf_paths, output_dirs, page_ranges, cache_keys, results)
+            except Exception as e:
+                # 整组推理失败（如某个PDF损坏）时逐个解析，隔离失败的文档
+                logger.warning(f"批量解析失败，改为逐个解析: {e!r}")
+                for index in group:
+                    parse_one(index)
+        
+        return self._collect_results(results, return_exceptions)
+    
+    def _parse_pipeline_group(
+        self,
+        group: List[int],
+        pdf_paths: List[str],
+        output_dirs: List[str],
+        page_ranges: List[Tuple[int, Optional[int]]],
+        cache_keys: Dict[int, Optional[str]],
+        results: list,
+    ) -> None:
+        """一次doc_analyze推理一组文档（page_ranges同parse_many），结果写入results对应位置"""
+        from mineru.cli.common import read_fn
+        from mineru.backend.pipeline.pipeline_analyze import doc_analyze as pipeline_doc_analyze
+        
+        pdf_bytes_list = []
+        for index in group:
+            start_page, end_page = page_ranges[index]
+            pdf_bytes_list.append(self._slice_pages(read_fn(str(pdf_paths[index])), start_page, end_page))
+        
+        logger.info(f"批量解析 {len(group)} 个文档")
+        infer_results, all_image_lists, all_pdf_docs, lang_list, ocr_enabled_list = \
+            pipeline_doc_analyze(
+                pdf_bytes_list,
+                [self.lang] * len(group),
+                parse_method=self.method,
+                formula_enable=self.formula_enable,
+                table_enable=self.table_enable,
+            )
+        
+        for position, index in enumerate(group):
+            try:
+                parsed = self._build_pipeline_document(
+                    str(output_dirs[index]),
+                    Path(pdf_paths[index]).stem,
+                    infer_results[position],
+                    all_image_lists[position],
+                    all_pdf_docs[position],
+                    lang_list[position],
+                    ocr_enabled_list[position],
+                )
+            except Exception as e:
+                logger.exception(f"解析PDF失败: {pdf_paths[index]}")
+                results[index] = e
+                continue
+            if self.cache is not None:
+                self.cache.store(cache_keys[index], parsed)
+            results[index] = parsed
+    
+    @staticmethod
+    def _collect_results(results: list, return_exceptions: bool) -> list:
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        return results
+    
     def parse_pdf_to_file(
         self,
         pdf_path: str,
@@ -210,8 +445,8 @@ class MineruParser:
         Args:
             pdf_path: PDF文件路径
             output_dir: 输出目录
-            start_page: 起始页码
-            end_page: 结束页码
+            start_page: 起始页码 (0-based，包含)
+            end_page: 结束页码 (0-based，不含)，None表示到最后
             dump_images: 是否保存图片
             dump_content_list: 是否保存内容列表JSON
         
@@ -0,0 +1,169 @@
+"""
+MinerU解析结果缓存
+以PDF内容哈希和解析参数为键缓存Markdown、内容列表和图片，重复解析时跳过MinerU
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+from .mineru_parser import ParsedDocument
+
+# 缓存格式版本，缓存内容结构或键的含义变化时递增
+# （2: 结束页改为不含，旧缓存中按页码范围解析的结果多出一页）
+CACHE_VERSION = 2
+
+
+def _mineru_version() -> str:
+    """当前安装的MinerU版本（不同版本的解析结果可能不同）"""
+    try:
+        from importlib.metadata import version
+        return version("mineru")
+    except Exception:
+        return ""
+
+
+class ParseCache:
+    """
+    基于内容寻址的解析缓存
+
+    目录结构::
+
+        <cache_dir>/<key[:2]>/<key>/
+            document.md
+            content_list.json
+            images/
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        初始化解析缓存
+
+        Args:
+            cache_dir: 缓存目录
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(
+        pdf_path: str,
+        backend: str,
+        method: str,
+        lang: str,
+        formula_enable: bool,
+        table_enable: bool,
+        start_page: int = 0,
+        end_page: Optional[int] = None,
+    ) -> str:
+        """
+        生成缓存键
+
+        Args:
+            pdf_path: PDF文件路径（按文件内容计算哈希）
+            backend: MinerU后端
+            method: 解析方法
+            lang: 语言设置
+            formula_enable: 是否启用公式解析
+            table_enable: 是否启用表格解析
+            start_page: 起始页码
+            end_page: 结束页码
+
+        Returns:
+            缓存键
+        """
+        digest = hashlib.sha256()
+        with open(pdf_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        params = json.dumps([
+            CACHE_VERSION,
+            _mineru_version(),
+            backend,
+            method,
+            lang,
+            formula_enable,
+            table_enable,
+            start_page,
+            end_page,
+        ])
+        digest.update(params.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / key
+
+    def load(self, key: str, image_dir: str) -> Optional[ParsedDocument]:
+        """
+        读取缓存，命中时把图片复制到image_dir
+
+        Args:
+            key: 缓存键
+            image_dir: 图片目标目录（与MinerU解析时的图片目录一致）
+
+        Returns:
+            解析结果，未命中返回None
+        """
+        entry = self._entry_dir(key)
+        md_path = entry / "document.md"
+        if not md_path.exists():
+            return None
+
+        markdown_content = md_path.read_text(encoding="utf-8")
+
+        content_list = None
+        content_list_path = entry / "content_list.json"
+        if content_list_path.exists():
+            with open(content_list_path, "r", encoding="utf-8") as f:
+                content_list = json.load(f)
+
+        cached_images = entry / "images"
+        if cached_images.exists():
+            shutil.copytree(cached_images, image_dir, dirs_exist_ok=True)
+        else:
+            os.makedirs(image_dir, exist_ok=True)
+
+        logger.info(f"命中解析缓存: {key[:12]}")
+        return ParsedDocument(
+            markdown_content=markdown_content,
+            images_dir=image_dir,
+            content_list=content_list,
+        )
+
+    def store(self, key: str, parsed: ParsedDocument) -> None:
+        """
+        写入缓存（先写入临时目录再原子重命名）
+
+        Args:
+            key: 缓存键
+            parsed: 解析结果
+        """
+        entry = self._entry_dir(key)
+        if entry.exists():
+            return
+        entry.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f".{key[:12]}-", dir=entry.parent))
+        try:
+            (tmp_dir / "document.md").write_text(parsed.markdown_content, encoding="utf-8")
+            if parsed.content_list is not None:
+                with open(tmp_dir / "content_list.json", "w", encoding="utf-8") as f:
+                    json.dump(parsed.content_list, f, ensure_ascii=False)
+            if parsed.images_dir and os.path.exists(parsed.images_dir):
+                shutil.copytree(parsed.images_dir, tmp_dir / "images")
+            os.replace(tmp_dir, entry)
+        except OSError as e:
+            # 缓存写入失败不影响解析结果（并发写入同一键时也会走到这里）
+            logger.warning(f"写入解析缓存失败: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def clear(self) -> None:
+        """清空解析缓存"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -5,10 +5,16 @@ PDF处理器
 
 import re
 import os
+import copy
+import queue
 import shutil
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, asdict
 from enum import Enum
 from pathlib import Path
-from typing import List, Optional, Callable
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Callable, Tuple, Union
 from tqdm import tqdm
 from loguru import logger
 
@@ -20,7 +26,42 @@ class OutputFormat(Enum):
     BOTH = "both"
 
 from .mineru_parser import MineruParser, ParsedDocument
+from .parse_cache import ParseCache
+from .journal import TranslationJournal, hash_paragraph, journal_meta, load_previous_translations
+from .estimate import CostEstimate, TranslationEstimator
+from .masking import MaskedText, mask_text, strip_spans, unmask_text
+from .content_list import TABLE_BODY, TITLE, ContentUnit, FieldKey, block_page, extract_units, render_block
+from .segmenter import BLANK, HEADER_PREFIX_PATTERN, TABLE, TEXT, Paragraph, should_translate, split_markdown
+from .tables import Cell, extract_cells, fill_cells
+from .writer import MarkdownWriter
+from ..config import DEFAULT_SKIP_SECTIONS
 from ..translators.base import BaseTranslator
+from ..translators.cache import CachedTranslator
+from ..translators.prompts import get_masked_translation_prompt
+from ..utils.text import is_in_language
+
+
+# 标题开头的章节编号，如 "7." "VII." "A." "2.1"
+SECTION_NUMBER_PATTERN = re.compile(
+    r'^(?:\d+(?:\.\d+)*[.．、)]?|[IVXLCivxlc]+[.．、)]|[A-Za-z][.．、)])\s*'
+)
+
+
+@dataclass
+class ProcessReport:
+    """处理统计"""
+    paragraphs: int = 0  # 需要翻译的段落数
+    translated: int = 0  # 实际调用翻译器完成的段落数
+    resumed: int = 0  # 从检查点日志恢复的段落数
+    reused: int = 0  # 从上一次运行（如论文旧版本）复用的段落数
+    failed: int = 0  # 翻译失败、保留原文的段落数
+    skipped: int = 0  # 位于参考文献等章节、原样保留的段落数
+    in_target_lang: int = 0  # 已是目标语言、原样保留的段落数
+    tables: int = 0  # 翻译了单元格的表格数
+    table_cells: int = 0  # 发送翻译的表格单元格数（去重后）
+    
+    def as_dict(self) -> dict:
+        return asdict(self)
 
 
 class PDFProcessor:
@@ -36,6 +77,17 @@ class PDFProcessor:
         mineru_backend: str = "pipeline",
         mineru_lang: str = "ch",
         progress_callback: Optional[Callable[[int, int], None]] = None,
+        batch_size: int = 32,
+        parse_cache: Optional[ParseCache] = None,
+        stream_chunk_pages: int = 0,
+        stream_queue_size: int = 2,
+        mask_spans: bool = True,
+        mask_retries: int = 1,
+        skip_sections: Optional[List[str]] = None,
+        skip_target_language: bool = True,
+        use_content_list: bool = False,
+        translate_tables: bool = True,
+        table_pack_tokens: int = 1024,
     ):
         """
         初始化PDF处理器
@@ -46,157 +98,192 @@ class PDFProcessor:
             mineru_backend: MinerU后端类型
             mineru_lang: MinerU语言设置
             progress_callback: 进度回调函数 (current, total)
+            batch_size: 每次提交给翻译器translate_batch的段落数
+            parse_cache: MinerU解析结果缓存，None表示不缓存
+            stream_chunk_pages: 流式处理时每次解析的页数，解析下一块的同时翻译上一块；
+                0表示先解析完整个文档再翻译
+            stream_queue_size: 流式处理时已解析、等待翻译的最大块数
+            mask_spans: 翻译前把行内公式、文献引用和链接替换为占位符，翻译后还原；
+                同时在翻译器的系统提示词后追加保留占位符的要求
+            mask_retries: 译文中占位符缺失时的重试次数，用尽后改为不遮蔽翻译该段
+            skip_sections: 原样保留的章节标题（如参考文献、致谢），匹配标题开头且不区分大小写；
+                None使用DEFAULT_SKIP_SECTIONS，空列表表示翻译所有章节
+            skip_target_language: 检测到已是目标语言的段落（如中文摘要）原样保留
+            use_content_list: 按MinerU内容列表中的块类型翻译并重新渲染Markdown，
+                标题集中在一起翻译，按页写出并报告进度；没有内容列表时仍翻译Markdown
+            translate_tables: 翻译表格（HTML表格和管道表格）中的文字单元格，保持表格结构不变
+            table_pack_tokens: 表格单元格打包翻译的原文token预算，所有表格的单元格去重后
+                合并为少量请求（不受翻译器pack_tokens设置影响）
         """
         self.translator = translator
         self.bilingual = bilingual
         self.progress_callback = progress_callback
+        self.batch_size = max(1, batch_size)
+        self.stream_chunk_pages = stream_chunk_pages
+        self.stream_queue_size = max(1, stream_queue_size)
+        self.mask_spans = mask_spans
+        self.mask_retries = max(0, mask_retries)
+        if mask_spans:
+            # 不论使用默认还是自定义的系统提示词，都要求模型保留占位符
+            backend = translator.translator if isinstance(translator, CachedTranslator) else translator
+            if getattr(backend, "system_prompt", None):
+                backend.system_prompt = get_masked_translation_prompt(backend.system_prompt)
+        self.skip_sections = tuple(
+            name.strip().casefold()
+            for name in (DEFAULT_SKIP_SECTIONS if skip_sections is None else skip_sections)
+            if name.strip()
+        )
+        self.skip_target_language = skip_target_language
+        self.use_content_list = use_content_list
+        self.translate_tables = translate_tables
+        self.table_pack_tokens = table_pack_tokens
+        # 正在跳过的章节的标题级别（流式处理时跨块保持），None表示不在跳过的章节中
+        self._skip_level: Optional[int] = None
+        
+        self.report = ProcessReport()
+        # 运行指标，与翻译器共享（请求延迟、token用量、缓存命中等由翻译器记录）
+        self.metrics = translator.metrics
+        # 检查点日志及可直接复用的译文 {原文哈希: 译文}，仅在process期间有效
+        self.journal: Optional[TranslationJournal] = None
+        self._resumed_translations: Dict[str, str] = {}
+        self._previous_translations: Dict[str, str] = {}
         
         self.parser = MineruParser(
             backend=mineru_backend,
             lang=mineru_lang,
+            cache=parse_cache,
         )
     
-    def _split_into_paragraphs(self, markdown: str) -> List[dict]:
+    def close(self) -> None:
+        """释放翻译器持有的连接等资源"""
+        self.translator.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def _is_skipped_heading(self, title: str, exact: bool = False) -> bool:
         """
-        将Markdown分割为可翻译的段落
+        标题是否是需要原样保留的章节（如参考文献、致谢）
+        
+        Args:
+            title: 标题文本（不含#标记）
+            exact: 是否要求整个标题与章节名一致（用于没有#标记的单行段落）
+        """
+        title = SECTION_NUMBER_PATTERN.sub('', title.strip().strip('*').strip()).casefold()
+        if not title.startswith(self.skip_sections):
+            return False
+        for name in self.skip_sections:
+            if title.startswith(name):
+                rest = title[len(name):]
+                if exact:
+                    if not rest.strip(' :：*'):
+                        return True
+                elif not rest or not rest[0].isalpha():
+                    return True
+        return False
+    
+    def _in_target_language(self, text: str) -> bool:
+        """段落是否已经是目标语言（忽略公式、引用和链接）"""
+        if not self.skip_target_language:
+            return False
+        return is_in_language(
+            strip_spans(text), self.translator.target_lang, self.translator.source_lang,
+        )
+    
+    def _find_skipped_sections(
+        self,
+        markdown: str,
+        paragraphs: List[Paragraph],
+        level: Optional[int] = None,
+    ) -> Tuple[set, Optional[int]]:
+        """
+        找出位于参考文献、致谢等章节中的段落和表格
+        
+        章节从匹配的标题开始（标题本身照常翻译），到下一个同级或更高级的标题结束。
+        单独成段的无标记标题（如 "REFERENCES"）视为最低级标题。
         
         Args:
             markdown: Markdown内容
+            paragraphs: split_markdown 的结果
+            level: 开始时所在的跳过章节级别（流式处理时为上一块末尾的状态）
         
         Returns:
-            段落列表，每个元素包含 {text, translatable, type}
-        """
-        paragraphs = []
-        lines = markdown.split('\n')
-        
-        current_block = []
-        in_code_block = False
-        in_table = False
-        
-        for line in lines:
-            # 检测代码块
-            if line.strip().startswith('```'):
-                if current_block:
-                    paragraphs.append({
-                        'text': '\n'.join(current_block),
-                        'translatable': not in_code_block and not in_table,
-                        'type': 'text'
-                    })
-                    current_block = []
-                in_code_block = not in_code_block
-                paragraphs.append({
-                    'text': line,
-                    'translatable': False,
-                    'type': 'code_fence'
-                })
-                continue
-            
-            # 代码块内的内容不翻译
-            if in_code_block:
-                paragraphs.append({
-                    'text': line,
-                    'translatable': False,
-                    'type': 'code'
-                })
-                continue
-            
-            # 检测表格
-            if line.strip().startswith('|') or line.strip().startswith('<table'):
-                if current_block:
-                    paragraphs.append({
-                        'text': '\n'.join(current_block),
-                        'translatable': True,
-                        'type': 'text'
-                    })
-                    current_block = []
-                # 表格内容暂不翻译（保持格式）
-                paragraphs.append({
-                    'text': line,
-                    'translatable': False,
-                    'type': 'table'
-                })
-                continue
-            
-            # 检测图片引用
-            if re.match(r'^\s*!\[.*\]\(.*\)\s*$', line):
-                if current_block:
-                    paragraphs.append({
-                        'text': '\n'.join(current_block),
-                        'translatable': True,
-                        'type': 'text'
-                    })
-                    current_block = []
-                paragraphs.append({
-                    'text': line,
-                    'translatable': False,
-                    'type': 'image'
-                })
-                continue
-            
-            # 检测公式块
-            if line.strip().startswith('$$') or line.strip().startswith('$'):
-                if current_block:
-                    paragraphs.append({
-                        'text': '\n'.join(current_block),
-                        'translatable': True,
-                        'type': 'text'
-                    })
-                    current_block = []
-                paragraphs.append({
-                    'text': line,
-                    'translatable': False,
-                    'type': 'formula'
-                })
+            (跳过的段落下标集合, 结束时所在的跳过章节级别)
+        """
+        skipped = set()
+        if not self.skip_sections:
+            return skipped, None
+        
+        for i, para in enumerate(paragraphs):
+            if para.kind != TEXT:
+                if para.kind == TABLE and level is not None:
+                    skipped.add(i)
                 continue
+            line_end = markdown.find('\n', para.start, para.end)
+            if para.level:
+                title_end = para.end if line_end < 0 else line_end
+                is_skipped = self._is_skipped_heading(markdown[para.start + para.level:title_end])
+            elif line_end < 0:
+                is_skipped = self._is_skipped_heading(para.text(markdown), exact=True)
+            else:
+                is_skipped = False
             
-            # 空行分隔段落
-            if not line.strip():
-                if current_block:
-                    paragraphs.append({
-                        'text': '\n'.join(current_block),
-                        'translatable': True,
-                        'type': 'text'
-                    })
-                    current_block = []
-                paragraphs.append({
-                    'text': '',
-                    'translatable': False,
-                    'type': 'empty'
-                })
+            if is_skipped:
+                level = para.level or 6
+                # 标题后直接跟正文（无空行）时，正文部分同样保留
+                if line_end >= 0:
+                    skipped.add(i)
                 continue
-            
-            # 普通文本行
-            current_block.append(line)
+            if para.level and level is not None and para.level <= level:
+                level = None
+            if level is not None:
+                skipped.add(i)
         
-        # 处理最后的块
-        if current_block:
-            paragraphs.append({
-                'text': '\n'.join(current_block),
-                'translatable': True,
-                'type': 'text'
-            })
-        
-        return paragraphs
+        return skipped, level
     
     def _should_translate(self, text: str) -> bool:
         """
         判断文本是否需要翻译
         """
-        text = text.strip()
-        
-        # 太短的文本
-        if len(text) < 3:
-            return False
-        
-        # 纯数字或标点
-        if text.replace('.', '').replace(',', '').replace(' ', '').isdigit():
-            return False
-        
-        # 纯标题标记
-        if re.match(r'^#+\s*$', text):
-            return False
+        return should_translate(text)
+    
+    @staticmethod
+    def _count_pages(
+        parsed: ParsedDocument,
+        start_page: int = 0,
+        end_page: Optional[int] = None,
+    ) -> Optional[int]:
+        """解析结果包含的页数（优先根据内容列表中的页码）"""
+        if parsed.content_list:
+            pages = {item.get("page_idx") for item in parsed.content_list if isinstance(item, dict)}
+            pages.discard(None)
+            if pages:
+                return max(pages) + 1
+        if end_page is not None:
+            return end_page - start_page
+        return None
+    
+    def _record_parse(self, elapsed: float, pages: Optional[int]) -> None:
+        """记录解析耗时"""
+        self.metrics.observe("parse_seconds", elapsed)
+        if pages:
+            self.metrics.inc("pages_parsed_total", pages)
+            self.metrics.observe("parse_seconds_per_page", elapsed / pages)
+    
+    def _split_header(self, text: str) -> Tuple[str, str]:
+        """
+        拆分标题前缀和正文内容
         
-        return True
+        Returns:
+            (标题前缀, 内容)，非标题时前缀为空字符串
+        """
+        header_match = HEADER_PREFIX_PATTERN.match(text)
+        if header_match is None:
+            return '', text
+        return header_match.group(0), text[header_match.end():]
     
     def _translate_paragraph(self, text: str) -> str:
         """
@@ -205,10 +292,7 @@ class PDFProcessor:
         if not self._should_translate(text):
             return text
         
-        # 提取标题前缀
-        header_match = re.match(r'^(#{1,6}\s+)', text)
-        header_prefix = header_match.group(1) if header_match else ''
-        content = text[len(header_prefix):] if header_prefix else text
+        header_prefix, content = self._split_header(text)
         
         # 翻译内容
         try:
@@ -220,67 +304,642 @@ class PDFProcessor:
         
         return header_prefix + translated
     
-    def translate_markdown(self, markdown: str) -> str:
+    def _mask(self, content: str) -> MaskedText:
+        """遮蔽段落中的公式、引用和链接（未启用时原样返回）"""
+        return mask_text(content) if self.mask_spans else MaskedText(content)
+    
+    def _translate_batch(self, contents: List[str], pack_tokens: int = 0) -> List[Optional[str]]:
+        """
+        翻译一批段落内容
+        
+        启用遮蔽时先把公式、引用和链接替换为占位符，翻译后还原。译文中占位符缺失或
+        编号不符的段落丢弃其缓存译文后重试，重试用尽后改为不遮蔽翻译。
+        
+        Args:
+            contents: 段落内容（不含标题标记）
+            pack_tokens: 大于0时调用翻译器的translate_packed按该预算打包，否则调用translate_batch
+        
+        Returns:
+            与输入顺序一致的译文，翻译失败的段落为None
+        """
+        masks = [self._mask(content) for content in contents]
+        results: List[Optional[str]] = [None] * len(contents)
+        
+        pending = []
+        for i, masked in enumerate(masks):
+            if masked.spans and not masked.translatable:
+                # 只有公式、引用等内容，无需翻译
+                results[i] = contents[i]
+            else:
+                pending.append(i)
+        
+        spans = [span for masked in masks for span in masked.spans]
+        if spans:
+            self.metrics.inc("masked_spans_total", len(spans))
+            self.metrics.inc("masked_chars_total", sum(len(span) for span in spans))
+        
+        attempt = 0
+        while pending:
+            unmasked = attempt > self.mask_retries
+            try:
+                texts = [contents[i] if unmasked else masks[i].text for i in pending]
+                if pack_tokens > 0:
+                    translated = self.translator.translate_packed(texts, pack_tokens)
+                else:
+                    translated = self.translator.translate_batch(texts)
+            except Exception as e:
+                # 整批失败（如Google批量请求出错），该批保留原文
+                logger.warning(f"翻译失败: {e}")
+                break
+            
+            retry = []
+            for i, result in zip(pending, translated):
+                if result.error is not None:
+                    continue
+                if unmasked:
+                    results[i] = result.translated
+                    continue
+                restored = unmask_text(result.translated, masks[i])
+                if restored is None:
+                    retry.append(i)
+                else:
+                    results[i] = restored
+            
+            if retry:
+                self.translator.forget([masks[i].text for i in retry])
+                if attempt < self.mask_retries:
+                    self.metrics.inc("mask_retries_total", len(retry))
+                    logger.debug(f"{len(retry)} 段译文的占位符不完整，重新翻译")
+                else:
+                    self.metrics.inc("mask_fallbacks_total", len(retry))
+                    logger.debug(f"{len(retry)} 段译文的占位符仍不完整，改为不遮蔽翻译")
+            pending = retry
+            attempt += 1
+        
+        return results
+    
+    def _reuse_translation(self, text: str, carried: List[Tuple[str, str]]) -> Optional[str]:
+        """
+        检查点日志或上一次运行中已有的译文
+        
+        来自上一次运行的译文同时加入carried，由调用方写入本次日志
+        """
+        text_hash = hash_paragraph(text)
+        resumed = self._resumed_translations.get(text_hash)
+        if resumed is not None:
+            self.report.resumed += 1
+            return resumed
+        reused = self._previous_translations.get(text_hash)
+        if reused is not None:
+            carried.append((text, reused))
+            self.report.reused += 1
+        return reused
+    
+    def _translate_tables(self, tables: List[str]) -> List[str]:
+        """
+        翻译表格中的文字单元格，表格结构保持不变
+        
+        所有表格的单元格去重后一次提交，由翻译器按table_pack_tokens打包为少量请求；
+        纯数字、符号和已是目标语言的单元格不翻译。整张表格的译文写入检查点日志，
+        中断后恢复或复用旧版本时按表格整体匹配。
+        
+        Args:
+            tables: 表格文本列表
+        
+        Returns:
+            与输入顺序一致的表格，翻译失败的单元格保留原文
+        """
+        results = list(tables)
+        pending = []
+        carried = []
+        for idx, table in enumerate(tables):
+            previous = self._reuse_translation(table, carried)
+            if previous is not None:
+                results[idx] = previous
+                self.report.tables += 1
+            else:
+                pending.append((idx, extract_cells(table)))
+        
+        texts = self._unique_cells(cells for _, cells in pending)
+        requested = set(texts)
+        
+        translations: Dict[str, str] = {}
+        if texts:
+            for text, result in zip(texts, self._translate_batch(texts, self.table_pack_tokens)):
+                if result is not None:
+                    translations[text] = result
+            self.report.table_cells += len(texts)
+            if len(translations) < len(texts):
+                logger.warning(f"{len(texts) - len(translations)} 个表格单元格翻译失败，保留原文")
+        
+        completed = []
+        for idx, cells in pending:
+            if not any(text in translations for _, _, text in cells):
+                continue
+            results[idx] = fill_cells(tables[idx], cells, translations)
+            self.report.tables += 1
+            if all(text in translations or text not in requested for _, _, text in cells):
+                completed.append((tables[idx], results[idx]))
+        
+        if self.journal is not None:
+            self.journal.record_many(carried + completed)
+        return results
+    
+    def _unique_cells(self, tables: Iterable[List[Cell]]) -> List[str]:
+        """需要翻译的单元格文本，相同的单元格（如表头、"Yes"/"No"）只保留一次，已是目标语言的不翻译"""
+        unique: Dict[str, None] = {}
+        for cells in tables:
+            for _, _, text in cells:
+                unique.setdefault(text, None)
+        return [text for text in unique if not self._in_target_language(text)]
+    
+    def _with_original(self, translated: str, original: str) -> str:
+        """双语模式：翻译在前，原文在引用块中"""
+        if not self.bilingual:
+            return translated
+        quoted = '\n'.join(f'> {line}' for line in original.split('\n'))
+        return f'{translated}\n\n{quoted}'
+    
+    def _translate_paragraphs(self, texts: List[str]) -> Iterator[Tuple[int, List[str]]]:
+        """
+        批量翻译段落，保留Markdown格式标记
+        
+        按batch_size分批调用翻译器的translate_batch，使翻译器的批量/并发实现生效。
+        翻译失败的段落保留原文。每完成一批产出一次当前进度，调用方可以先写出已完成的部分。
+        
+        Args:
+            texts: 待翻译段落列表（均已通过_should_translate检查）
+        
+        Yields:
+            (ready, translated)：translated 是与输入顺序一致的译文列表（逐批填充），
+            其前 ready 段已是最终结果
+        """
+        translated = list(texts)
+        
+        # 已在检查点日志或上一次运行中翻译过的段落直接复用
+        pending = []
+        carried = []
+        for idx, text in enumerate(texts):
+            previous = self._reuse_translation(text, carried)
+            if previous is not None:
+                translated[idx] = previous
+            else:
+                pending.append(idx)
+        
+        # 复用的译文也写入本次日志，使其可作为下一版本的基准
+        if self.journal is not None:
+            self.journal.record_many(carried)
+        
+        total = len(pending)
+        yield (pending[0] if pending else len(texts)), translated
+        
+        headers = []
+        contents = []
+        for idx in pending:
+            header_prefix, content = self._split_header(texts[idx])
+            headers.append(header_prefix)
+            contents.append(content)
+        
+        done = 0
+        
+        with tqdm(total=total, desc="翻译中", disable=total < 5) as pbar:
+            for start in range(0, total, self.batch_size):
+                batch = contents[start:start + self.batch_size]
+                results = self._translate_batch(batch)
+                
+                completed = []
+                for offset, result in enumerate(results):
+                    if result is None:
+                        self.report.failed += 1
+                        continue
+                    idx = pending[start + offset]
+                    translated[idx] = headers[start + offset] + result
+                    completed.append((texts[idx], translated[idx]))
+                    self.report.translated += 1
+                
+                if self.journal is not None:
+                    self.journal.record_many(completed)
+                
+                done += len(batch)
+                pbar.update(len(batch))
+                if self.progress_callback:
+                    self.progress_callback(done, total)
+                
+                end = start + len(batch)
+                yield (pending[end] if end < total else len(texts)), translated
+    
+    def translate_markdown(self, markdown: str, continuation: bool = False) -> str:
         """
         翻译Markdown内容
         
+        先收集全部可翻译段落分批翻译，再按原顺序重建文档。
+        表格（translate_tables）只翻译其中的文字单元格，
+        参考文献、致谢等章节（skip_sections）原样保留。
+        
         Args:
             markdown: 原始Markdown内容
+            continuation: 是否为同一文档上一块的后续内容（流式处理），
+                是则沿用上一块末尾的章节状态
         
         Returns:
             翻译后的Markdown内容
         """
-        paragraphs = self._split_into_paragraphs(markdown)
+        return ''.join(self.iter_translated_markdown(markdown, continuation))
+    
+    def iter_translated_markdown(self, markdown: str, continuation: bool = False) -> Iterator[str]:
+        """
+        翻译Markdown内容，按文档顺序逐批产出翻译后的文本
         
-        # 统计可翻译段落数
-        translatable_count = sum(1 for p in paragraphs if p['translatable'] and self._should_translate(p['text']))
+        每完成一批翻译，产出从上次位置到下一个未完成段落之前的全部内容，
+        所有产出依次拼接即为完整的翻译结果（与translate_markdown相同）。
         
-        result_parts = []
-        translated_count = 0
+        Args:
+            markdown: 原始Markdown内容
+            continuation: 是否为同一文档上一块的后续内容（流式处理），
+                是则沿用上一块末尾的章节状态
         
-        for para in tqdm(paragraphs, desc="翻译中", disable=translatable_count < 5):
-            if para['translatable'] and self._should_translate(para['text']):
-                translated_text = self._translate_paragraph(para['text'])
-                
-                if self.bilingual:
-                    # 双语模式：翻译在前，原文在引用块中
-                    result_parts.append(translated_text)
-                    result_parts.append('')
-                    # 将原文作为引用
-                    original_lines = para['text'].split('\n')
-                    quoted = '\n'.join(f'> {line}' for line in original_lines)
-                    result_parts.append(quoted)
+        Yields:
+            翻译后的Markdown片段
+        """
+        with self.metrics.timer("split_seconds"):
+            paragraphs = split_markdown(markdown)
+            skipped, self._skip_level = self._find_skipped_sections(
+                markdown, paragraphs, self._skip_level if continuation else None,
+            )
+        
+        # 收集需要翻译的段落
+        pending = []
+        for i, para in enumerate(paragraphs):
+            if not para.translate:
+                continue
+            if i in skipped:
+                self.report.skipped += 1
+            elif self._in_target_language(para.text(markdown)):
+                self.report.in_target_lang += 1
+            else:
+                pending.append(i)
+        self.report.paragraphs += len(pending)
+        
+        # 表格单元格先集中翻译（请求数少），翻译后的表格替换原表格
+        elapsed = 0.0
+        tables: Dict[int, str] = {}
+        if self.translate_tables:
+            table_indices = [
+                i for i, para in enumerate(paragraphs) if para.kind == TABLE and i not in skipped
+            ]
+            if table_indices:
+                start = time.perf_counter()
+                originals = [paragraphs[i].text(markdown) for i in table_indices]
+                for i, original, table in zip(table_indices, originals, self._translate_tables(originals)):
+                    if table != original:
+                        tables[i] = self._with_original(table, original)
+                elapsed += time.perf_counter() - start
+        
+        # 译文替换对应段落，段落之间的原文（代码、图片、公式和空行）原样保留
+        translations = self._translate_paragraphs([paragraphs[i].text(markdown) for i in pending])
+        position = 0  # 已产出的原文位置
+        index = 0  # 下一个要处理的段落
+        k = 0  # 下一个待翻译段落在pending中的位置
+        while True:
+            start = time.perf_counter()
+            progress = next(translations, None)
+            elapsed += time.perf_counter() - start
+            if progress is None:
+                break
+            ready, translated = progress
+            # 下一个未完成段落之前的内容都已确定
+            limit = pending[ready] if ready < len(pending) else len(paragraphs)
+            
+            result_parts = []
+            for i in range(index, limit):
+                para = paragraphs[i]
+                if k < len(pending) and pending[k] == i:
+                    translated_text = self._with_original(translated[k], para.text(markdown))
+                    k += 1
+                elif i in tables:
+                    translated_text = tables[i]
+                elif para.kind == BLANK:
+                    # 只含空白字符的空行输出为空行
+                    translated_text = ''
                 else:
-                    result_parts.append(translated_text)
-                
-                translated_count += 1
-                if self.progress_callback:
-                    self.progress_callback(translated_count, translatable_count)
+                    continue
+                result_parts.append(markdown[position:para.start])
+                result_parts.append(translated_text)
+                position = para.end
+            if limit < len(paragraphs):
+                result_parts.append(markdown[position:paragraphs[limit].start])
+                position = paragraphs[limit].start
+            index = limit
+            yield ''.join(result_parts)
+        self.metrics.observe("translate_seconds", elapsed)
+        
+        yield markdown[position:]
+    
+    def _collect_content_units(
+        self,
+        content_list: List[dict],
+        level: Optional[int] = None,
+    ) -> Tuple[List[ContentUnit], set, Optional[int]]:
+        """
+        提取内容列表中需要翻译的文字，并找出位于参考文献、致谢等章节中的部分
+        
+        章节规则与 _find_skipped_sections 相同，标题级别取自内容列表的 text_level。
+        
+        Args:
+            content_list: MinerU的内容列表
+            level: 开始时所在的跳过章节级别（流式处理时为上一块末尾的状态）
+        
+        Returns:
+            (文本单元列表, 跳过的单元下标集合, 结束时所在的跳过章节级别)
+        """
+        units = extract_units(content_list)
+        skipped = set()
+        if not self.skip_sections:
+            return units, skipped, None
+        
+        for k, unit in enumerate(units):
+            if unit.kind == TITLE:
+                is_skipped = self._is_skipped_heading(unit.text[unit.level:])
             else:
-                result_parts.append(para['text'])
+                is_skipped = '\n' not in unit.text and self._is_skipped_heading(unit.text, exact=True)
+            
+            if is_skipped:
+                level = unit.level or 6
+                continue
+            if unit.kind == TITLE and level is not None and unit.level <= level:
+                level = None
+            if level is not None:
+                skipped.add(k)
         
-        return '\n'.join(result_parts)
+        return units, skipped, level
     
-    def process(
+    def iter_translated_content_list(
         self,
-        input_path: str,
-        output_path: Optional[str] = None,
+        content_list: List[dict],
+        continuation: bool = False,
+    ) -> Iterator[str]:
+        """
+        按MinerU内容列表翻译并渲染为Markdown，按页逐批产出
+        
+        块类型来自解析结果：公式和代码不翻译，正文、标题、列表项以及图片/表格的标题和脚注
+        分别翻译，表格主体只翻译其中的文字单元格。标题排在最前面，通常一次请求即可翻译全部标题。
+        每完成一批翻译，产出所有段落均已完成的页面。
+        
+        Args:
+            content_list: MinerU的内容列表
+            continuation: 是否为同一文档上一块的后续内容（流式处理），
+                是则沿用上一块末尾的章节状态
+        
+        Yields:
+            翻译后的Markdown片段
+        """
+        blocks = [item for item in content_list if isinstance(item, dict)]
+        with self.metrics.timer("split_seconds"):
+            units, skipped, self._skip_level = self._collect_content_units(
+                blocks, self._skip_level if continuation else None,
+            )
+        
+        pending: List[ContentUnit] = []
+        tables: List[ContentUnit] = []
+        for k, unit in enumerate(units):
+            if unit.kind == TABLE_BODY:
+                if self.translate_tables and k not in skipped:
+                    tables.append(unit)
+                continue
+            if not self._should_translate(unit.text):
+                continue
+            if k in skipped:
+                self.report.skipped += 1
+            elif self._in_target_language(unit.text):
+                self.report.in_target_lang += 1
+            else:
+                pending.append(unit)
+        self.report.paragraphs += len(pending)
+        
+        # 标题排在最前面（排序稳定，标题之间和正文之间仍按文档顺序）
+        order = sorted(range(len(pending)), key=lambda k: pending[k].kind != TITLE)
+        titles = sum(1 for unit in pending if unit.kind == TITLE)
+        
+        total_pages = max((block_page(item) for item in blocks), default=-1) + 1
+        overrides: Dict[int, Dict[FieldKey, str]] = {}
+        index = 0  # 下一个要渲染的块
+        done = 0  # 已取得译文的单元数（按order）
+        pages_done = 0
+        emitted = False
+        elapsed = 0.0
+        
+        # 表格单元格先集中翻译（请求数少），翻译后的表格主体替换原表格
+        if tables:
+            start = time.perf_counter()
+            for unit, table in zip(tables, self._translate_tables([unit.text for unit in tables])):
+                if table != unit.text:
+                    overrides.setdefault(unit.block, {})[(unit.key, unit.index)] = self._with_original(
+                        table, unit.text,
+                    )
+            elapsed += time.perf_counter() - start
+        
+        translations = self._translate_paragraphs([pending[k].text for k in order])
+        while True:
+            start = time.perf_counter()
+            progress = next(translations, None)
+            elapsed += time.perf_counter() - start
+            if progress is None:
+                break
+            ready, translated = progress
+            for j in range(done, ready):
+                unit = pending[order[j]]
+                text = self._with_original(translated[j], unit.text)
+                overrides.setdefault(unit.block, {})[(unit.key, unit.index)] = text
+            done = ready
+            
+            # 文档中第一个尚未完成的单元所在页之前的内容都已确定
+            if ready < len(order):
+                first = order[ready]
+                if ready < titles < len(order):
+                    first = min(first, order[titles])
+                limit_block, limit_page = pending[first].block, pending[first].page
+            else:
+                limit_block, limit_page = len(blocks), None
+            
+            parts = []
+            while index < limit_block and (limit_page is None or block_page(blocks[index]) < limit_page):
+                rendered = render_block(blocks[index], overrides.pop(index, None))
+                if rendered:
+                    parts.append(rendered)
+                index += 1
+            if parts:
+                yield ('\n\n' if emitted else '') + '\n\n'.join(parts)
+                emitted = True
+            
+            current = total_pages if limit_page is None else min(limit_page, total_pages)
+            if current > pages_done:
+                self.metrics.inc("pages_translated_total", current - pages_done)
+                pages_done = current
+                logger.info(f"翻译进度: {pages_done}/{total_pages} 页")
+        self.metrics.observe("translate_seconds", elapsed)
+    
+    def _iter_translated(self, parsed: ParsedDocument, continuation: bool = False) -> Iterator[str]:
+        """按处理模式翻译解析结果，逐批产出翻译后的Markdown"""
+        if self.use_content_list and parsed.content_list:
+            return self.iter_translated_content_list(parsed.content_list, continuation)
+        if self.use_content_list:
+            logger.debug("解析结果没有内容列表，改为翻译Markdown")
+        return self.iter_translated_markdown(parsed.markdown_content, continuation)
+    
+    def _estimate_texts(
+        self,
+        candidates: Iterable[Tuple[str, bool]],
+        estimator: Optional[TranslationEstimator] = None,
+        tables: Iterable[str] = (),
+    ) -> CostEstimate:
+        """
+        预估一组段落的翻译用量
+        
+        Args:
+            candidates: 按提交顺序排列的 (段落, 是否位于跳过的章节)，均已通过_should_translate检查
+            estimator: 预估器，默认按当前翻译器和批量大小创建（不含价格）
+            tables: 需要翻译单元格的表格（不在跳过的章节中），translate_tables关闭时忽略
+        """
+        estimator = estimator or TranslationEstimator(self.translator, batch_size=self.batch_size)
+        # 与翻译时相同：跳过参考文献等章节和已是目标语言的段落，标题只发送标记之后的内容，
+        # 公式、引用和链接替换为占位符
+        texts = []
+        skipped_texts = []
+        in_target_lang = 0
+        for text, is_skipped in candidates:
+            if is_skipped:
+                skipped_texts.append(text)
+                continue
+            if self._in_target_language(text):
+                in_target_lang += 1
+                continue
+            masked = self._mask(self._split_header(text)[1])
+            if not masked.spans or masked.translatable:
+                texts.append(masked.text)
+        cells = []
+        if self.translate_tables:
+            for cell in self._unique_cells(extract_cells(table) for table in tables):
+                masked = self._mask(cell)
+                if not masked.spans or masked.translatable:
+                    cells.append(masked.text)
+        estimate = estimator.estimate(texts, skipped_texts, cells, self.table_pack_tokens)
+        estimate.in_target_lang = in_target_lang
+        return estimate
+    
+    def estimate_markdown(
+        self,
+        markdown: str,
+        estimator: Optional[TranslationEstimator] = None,
+    ) -> CostEstimate:
+        """
+        预估翻译Markdown内容的token用量、费用和耗时（不调用翻译接口）
+        
+        Args:
+            markdown: 原始Markdown内容
+            estimator: 预估器，默认按当前翻译器和批量大小创建（不含价格）
+        
+        Returns:
+            预估结果
+        """
+        paragraphs = split_markdown(markdown)
+        skipped, _ = self._find_skipped_sections(markdown, paragraphs)
+        return self._estimate_texts(
+            ((para.text(markdown), i in skipped) for i, para in enumerate(paragraphs) if para.translate),
+            estimator,
+            (
+                para.text(markdown) for i, para in enumerate(paragraphs)
+                if para.kind == TABLE and i not in skipped
+            ),
+        )
+    
+    def estimate_parsed(
+        self,
+        parsed: ParsedDocument,
+        estimator: Optional[TranslationEstimator] = None,
+    ) -> CostEstimate:
+        """
+        预估翻译解析结果的token用量、费用和耗时（与正式翻译使用相同的处理模式）
+        
+        Args:
+            parsed: 解析结果
+            estimator: 预估器，默认按当前翻译器和批量大小创建（不含价格）
+        
+        Returns:
+            预估结果
+        """
+        if not (self.use_content_list and parsed.content_list):
+            return self.estimate_markdown(parsed.markdown_content, estimator)
+        
+        blocks = [item for item in parsed.content_list if isinstance(item, dict)]
+        units, skipped, _ = self._collect_content_units(blocks)
+        candidates = [
+            (unit.text, k in skipped, unit.kind == TITLE)
+            for k, unit in enumerate(units)
+            if unit.kind != TABLE_BODY and self._should_translate(unit.text)
+        ]
+        # 与翻译时相同，标题排在最前面
+        candidates.sort(key=lambda item: not item[2])
+        return self._estimate_texts(
+            ((text, is_skipped) for text, is_skipped, _ in candidates),
+            estimator,
+            (unit.text for k, unit in enumerate(units) if unit.kind == TABLE_BODY and k not in skipped),
+        )
+    
+    def estimate(
+        self,
+        input_path: Union[str, Path],
         pages: Optional[List[int]] = None,
-    ) -> str:
+        estimator: Optional[TranslationEstimator] = None,
+    ) -> CostEstimate:
         """
-        处理PDF文件
+        预估翻译PDF的token用量、费用和耗时
+        
+        解析PDF（启用解析缓存时优先使用缓存，解析结果也会写入缓存供正式翻译复用），
+        按与正式翻译相同的规则切分和过滤段落，不发送任何翻译请求、不写出结果
         
         Args:
             input_path: 输入PDF路径
-            output_path: 输出目录或文件路径
             pages: 要处理的页码列表 (0-based)，默认处理所有页
+            estimator: 预估器，默认按当前翻译器和批量大小创建（不含价格）
         
         Returns:
-            输出的Markdown文件路径
+            预估结果
+        """
+        with tempfile.TemporaryDirectory(prefix="pdf-translator-estimate-") as tmp:
+            parsed = self.parse(input_path, tmp, pages)
+        return self.estimate_parsed(parsed, estimator)
+    
+    def spawn(self) -> "PDFProcessor":
+        """
+        创建共享翻译器、解析器和配置，但拥有独立处理状态的处理器
+        
+        用于在多个线程中同时处理不同文档（如批量模式），返回的处理器无需单独关闭
+        """
+        worker = copy.copy(self)
+        worker.report = ProcessReport()
+        worker.journal = None
+        worker._resumed_translations = {}
+        worker._previous_translations = {}
+        worker._skip_level = None
+        return worker
+    
+    @staticmethod
+    def get_output_paths(
+        input_path: Union[str, Path],
+        output_path: Optional[str] = None,
+    ) -> Tuple[Path, Path]:
+        """
+        确定输出位置
+        
+        Args:
+            input_path: 输入PDF路径
+            output_path: 输出目录或文件路径，默认为PDF同目录下的同名目录
+        
+        Returns:
+            (输出目录, 翻译后Markdown文件路径)
         """
         input_path = Path(input_path)
         
-        # 确定输出路径
         if output_path is None:
             output_dir = input_path.parent / input_path.stem
         else:
@@ -290,46 +949,337 @@ class PDFProcessor:
             else:
                 output_dir = output_path
         
-        output_dir.mkdir(parents=True, exist_ok=True)
+        md_output_path = output_dir / input_path.stem / "auto" / f"{input_path.stem}_translated.md"
+        return output_dir, md_output_path
+    
+    @staticmethod
+    def _page_range(pages: Optional[List[int]]) -> Tuple[int, Optional[int]]:
+        """页码列表 (0-based) 转换为 [起始页, 结束页)，与MineruParser的页码范围约定一致"""
+        if not pages:
+            return 0, None
+        return min(pages), max(pages) + 1
+    
+    def parse(
+        self,
+        input_path: Union[str, Path],
+        output_dir: Union[str, Path],
+        pages: Optional[List[int]] = None,
+    ) -> ParsedDocument:
+        """
+        使用MinerU解析PDF
         
-        # 计算页码范围
-        start_page = 0
-        end_page = None
-        if pages:
-            start_page = min(pages)
-            end_page = max(pages) + 1
+        Args:
+            input_path: 输入PDF路径
+            output_dir: 输出目录（MinerU的中间结果和图片写入其中）
+            pages: 要处理的页码列表 (0-based)，默认处理所有页
         
-        logger.info(f"正在解析PDF: {input_path}")
+        Returns:
+            解析结果
+        """
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        start_page, end_page = self._page_range(pages)
         
-        # 使用MinerU解析PDF
+        logger.info(f"正在解析PDF: {input_path}")
+        start = time.perf_counter()
         parsed = self.parser.parse_pdf(
             str(input_path),
             str(output_dir),
             start_page=start_page,
             end_page=end_page,
         )
+        self._record_parse(time.perf_counter() - start, self._count_pages(parsed, start_page, end_page))
+        return parsed
+    
+    def parse_many(
+        self,
+        input_paths: List[Union[str, Path]],
+        output_dirs: List[Union[str, Path]],
+        batch_size: int = 4,
+    ) -> List[Union[ParsedDocument, BaseException]]:
+        """
+        批量解析多个PDF，pipeline后端在文档间合并推理
         
-        logger.info("PDF解析完成，开始翻译...")
+        Args:
+            input_paths: 输入PDF路径列表
+            output_dirs: 与input_paths一一对应的输出目录
+            batch_size: 每次MinerU推理的文档数
         
-        # 翻译Markdown内容
-        translated_markdown = self.translate_markdown(parsed.markdown_content)
+        Returns:
+            与输入顺序一致的解析结果，解析失败的文档为异常对象
+        """
+        for output_dir in output_dirs:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
         
-        # 保存翻译后的Markdown
-        md_filename = f"{input_path.stem}_translated.md"
-        final_output_dir = output_dir / input_path.stem / "auto"
-        final_output_dir.mkdir(parents=True, exist_ok=True)
+        logger.info(f"正在解析 {len(input_paths)} 个PDF")
+        start = time.perf_counter()
+        results = self.parser.parse_many(
+            [str(path) for path in input_paths],
+            [str(output_dir) for output_dir in output_dirs],
+            batch_size=batch_size,
+            return_exceptions=True,
+        )
+        pages = sum(
+            self._count_pages(parsed) or 0
+            for parsed in results if isinstance(parsed, ParsedDocument)
+        )
+        self._record_parse(time.perf_counter() - start, pages)
+        return results
+    
+    def _begin_document(
+        self,
+        input_path: Path,
+        md_output_path: Path,
+        resume: bool,
+        previous: Union[str, Path, Mapping[str, str], None],
+    ) -> None:
+        """重置统计并打开检查点日志，加载可复用的译文"""
+        md_output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        md_output_path = final_output_dir / md_filename
+        self.report = ProcessReport()
+        self.journal = TranslationJournal(
+            str(md_output_path.parent / f"{input_path.stem}.journal.jsonl"),
+            meta=journal_meta(self.translator),
+        )
+        if resume:
+            self._resumed_translations = self.journal.load()
+            logger.info(f"从检查点日志恢复 {len(self._resumed_translations)} 段译文")
+        if previous is not None:
+            self._previous_translations = load_previous_translations(previous, self.journal.meta)
+            logger.info(f"已加载上一次运行的 {len(self._previous_translations)} 段译文")
+        self.journal.open(resume=resume)
+    
+    def _end_document(self) -> None:
+        """关闭检查点日志并输出段落统计"""
+        if self.journal is not None:
+            self.journal.close()
+        self.journal = None
+        self._resumed_translations = {}
+        self._previous_translations = {}
         
-        with open(md_output_path, 'w', encoding='utf-8') as f:
-            f.write(translated_markdown)
+        report = self.report
+        self.metrics.inc("documents_total")
+        self.metrics.inc("paragraphs_total", report.paragraphs)
+        self.metrics.inc("paragraphs_translated_total", report.translated)
+        self.metrics.inc("paragraphs_resumed_total", report.resumed)
+        self.metrics.inc("paragraphs_reused_total", report.reused)
+        self.metrics.inc("paragraphs_failed_total", report.failed)
+        self.metrics.inc("paragraphs_skipped_total", report.skipped)
+        self.metrics.inc("paragraphs_in_target_lang_total", report.in_target_lang)
+        self.metrics.inc("tables_translated_total", report.tables)
+        self.metrics.inc("table_cells_translated_total", report.table_cells)
+        logger.info(
+            f"段落统计: 共 {report.paragraphs} 段，翻译 {report.translated} 段，"
+            f"从检查点恢复 {report.resumed} 段，复用旧版本 {report.reused} 段，"
+            f"失败 {report.failed} 段，跳过参考文献等章节 {report.skipped} 段，"
+            f"已是目标语言 {report.in_target_lang} 段，"
+            f"表格 {report.tables} 个（{report.table_cells} 个单元格）"
+        )
+    
+    def write_output(
+        self,
+        md_output_path: Path,
+        translated_markdown: str,
+        images_dir: Optional[str],
+    ) -> str:
+        """
+        保存翻译后的Markdown并复制图片
+        
+        Args:
+            md_output_path: Markdown输出路径
+            translated_markdown: 翻译后的Markdown内容
+            images_dir: 解析得到的图片目录
+        
+        Returns:
+            输出的Markdown文件路径
+        """
+        with MarkdownWriter(md_output_path) as writer:
+            writer.write(translated_markdown)
+        return self._finish_output(writer, images_dir)
+    
+    def _finish_output(self, writer: MarkdownWriter, images_dir: Optional[str]) -> str:
+        """记录写出的Markdown并复制图片"""
+        md_output_path = writer.path
+        self.metrics.inc("bytes_written_total", writer.bytes_written)
         
         logger.info(f"翻译完成，已保存到: {md_output_path}")
         
-        if parsed.images_dir and os.path.exists(parsed.images_dir):
-            target_images_dir = final_output_dir / "images"
-            if os.path.realpath(parsed.images_dir) != os.path.realpath(target_images_dir):
+        if images_dir and os.path.exists(images_dir):
+            target_images_dir = md_output_path.parent / "images"
+            if os.path.realpath(images_dir) != os.path.realpath(target_images_dir):
                 if os.path.exists(target_images_dir):
                     shutil.rmtree(target_images_dir)
-                shutil.copytree(parsed.images_dir, target_images_dir)
+                shutil.copytree(images_dir, target_images_dir)
+                self.metrics.inc("bytes_written_total", sum(
+                    p.stat().st_size for p in target_images_dir.rglob("*") if p.is_file()
+                ))
         return str(md_output_path)
+    
+    def translate_parsed(
+        self,
+        input_path: Union[str, Path],
+        parsed: ParsedDocument,
+        md_output_path: Union[str, Path],
+        resume: bool = False,
+        previous: Union[str, Path, Mapping[str, str], None] = None,
+    ) -> str:
+        """
+        翻译已解析的文档并写出结果
+        
+        Args:
+            input_path: 输入PDF路径（用于命名检查点日志）
+            parsed: 解析结果
+            md_output_path: 翻译后Markdown文件路径
+            resume: 是否从上次中断的检查点日志恢复
+            previous: 上一次运行的输出目录/检查点日志，或 {原文: 译文} 映射
+        
+        Returns:
+            输出的Markdown文件路径
+        """
+        md_output_path = Path(md_output_path)
+        self._begin_document(Path(input_path), md_output_path, resume, previous)
+        try:
+            logger.info("PDF解析完成，开始翻译...")
+            # 每完成一批翻译就写出已确定的部分
+            with MarkdownWriter(md_output_path) as writer:
+                for part in self._iter_translated(parsed):
+                    writer.write(part)
+        finally:
+            self._end_document()
+        
+        return self._finish_output(writer, parsed.images_dir)
+    
+    def process(
+        self,
+        input_path: str,
+        output_path: Optional[str] = None,
+        pages: Optional[List[int]] = None,
+        resume: bool = False,
+        previous: Union[str, Path, Mapping[str, str], None] = None,
+    ) -> str:
+        """
+        处理PDF文件（解析、翻译、写出）
+        
+        翻译过程中逐批把完成的段落写入输出目录下的检查点日志，
+        resume为True时从日志恢复已完成的段落，只翻译缺失部分；
+        提供previous时，内容与上一次运行相同的段落直接复用旧译文（增量翻译）
+        
+        Args:
+            input_path: 输入PDF路径
+            output_path: 输出目录或文件路径
+            pages: 要处理的页码列表 (0-based)，默认处理所有页
+            resume: 是否从上次中断的检查点日志恢复
+            previous: 上一次运行的输出目录/检查点日志，或 {原文: 译文} 映射
+        
+        Returns:
+            输出的Markdown文件路径
+        """
+        input_path = Path(input_path)
+        output_dir, md_output_path = self.get_output_paths(input_path, output_path)
+        
+        if self.stream_chunk_pages <= 0:
+            parsed = self.parse(input_path, output_dir, pages)
+            return self.translate_parsed(input_path, parsed, md_output_path, resume, previous)
+        
+        output_dir.mkdir(parents=True, exist_ok=True)
+        start_page, end_page = self._page_range(pages)
+        self._begin_document(input_path, md_output_path, resume, previous)
+        try:
+            with MarkdownWriter(md_output_path) as writer:
+                images_dir = self._process_streaming(
+                    input_path, output_dir, start_page, end_page, writer,
+                )
+        finally:
+            self._end_document()
+        
+        return self._finish_output(writer, images_dir)
+    
+    def _process_streaming(
+        self,
+        input_path: Path,
+        output_dir: Path,
+        start_page: int,
+        end_page: Optional[int],
+        writer: MarkdownWriter,
+    ) -> Optional[str]:
+        """
+        按页分块流式处理：后台线程逐块解析PDF，主线程翻译已解析的块
+        
+        解析与翻译重叠进行，总耗时接近两者中的较大值。已解析未翻译的块数
+        受stream_queue_size限制。跨块边界的段落会被拆成两段分别翻译。
+        翻译结果按块内的批次依次写入writer。
+        
+        Args:
+            input_path: 输入PDF路径
+            output_dir: 输出目录
+            start_page: 起始页码 (0-based)
+            end_page: 结束页码 (不含)，None表示到最后
+            writer: 翻译结果的输出
+        
+        Returns:
+            图片目录
+        """
+        if end_page is None:
+            end_page = self.parser.get_page_count(str(input_path))
+        chunk_pages = self.stream_chunk_pages
+        chunks = [
+            (start, min(start + chunk_pages, end_page))
+            for start in range(start_page, end_page, chunk_pages)
+        ]
+        
+        parsed_queue: queue.Queue = queue.Queue(maxsize=self.stream_queue_size)
+        stop = threading.Event()
+        
+        def put(item) -> bool:
+            # 队列满时阻塞等待，翻译端出错退出后停止解析
+            while not stop.is_set():
+                try:
+                    parsed_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce() -> None:
+            try:
+                for chunk_start, chunk_end in chunks:
+                    if stop.is_set():
+                        return
+                    logger.info(f"正在解析第 {chunk_start + 1}-{chunk_end} 页")
+                    start = time.perf_counter()
+                    parsed = self.parser.parse_pdf(
+                        str(input_path),
+                        str(output_dir),
+                        start_page=chunk_start,
+                        end_page=chunk_end,
+                    )
+                    self._record_parse(time.perf_counter() - start, chunk_end - chunk_start)
+                    if not put(parsed):
+                        return
+            except BaseException as e:
+                put(e)
+                return
+            put(None)
+        
+        producer = threading.Thread(target=produce, name="pdf-parser", daemon=True)
+        producer.start()
+        
+        images_dir = None
+        try:
+            for index in range(len(chunks) + 1):
+                with self.metrics.timer("queue_wait_seconds"):
+                    item = parsed_queue.get()
+                if item is None:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                images_dir = images_dir or item.images_dir
+                logger.info(f"开始翻译第 {index + 1}/{len(chunks)} 块")
+                if index > 0:
+                    writer.write('\n\n')
+                for part in self._iter_translated(item, continuation=index > 0):
+                    writer.write(part)
+        finally:
+            stop.set()
+            producer.join()
+        
+        return images_dir
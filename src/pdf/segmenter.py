@@ -0,0 +1,158 @@
+"""
+Markdown分段
+单次扫描把Markdown切分为段落，段落只记录在原文中的位置，不复制文本
+"""
+
+import re
+from typing import List
+
+# 不属于普通文本的行：代码块标记、表格、图片、公式块、空行
+SPECIAL_LINE_PATTERN = re.compile(
+    r"""
+    ^[^\S\n]*
+    (?:
+        (?P<fence>```)
+        | (?P<table>\| | <table)
+        | !\[.*\]\(.*\)[^\S\n]*$
+        | \$
+        | (?P<blank>$)
+    )
+    """,
+    re.MULTILINE | re.VERBOSE,
+)
+
+# 代码块标记行
+FENCE_PATTERN = re.compile(r'^[^\S\n]*```', re.MULTILINE)
+
+# 段落首行的标题标记，如 "## "
+HEADING_PATTERN = re.compile(r'(#{1,6})[^\S\n]+')
+
+# 标题前缀（与翻译时拆分标题和正文的规则一致）
+HEADER_PREFIX_PATTERN = re.compile(r'#{1,6}\s+')
+
+# 只有标题标记的文本
+BARE_HEADING_PATTERN = re.compile(r'#+\s*$')
+
+# 段落类型
+TEXT = 'text'  # 普通文本
+BLANK = 'blank'  # 只含空白字符的空行，输出时清空
+TABLE = 'table'  # 连续的表格行（以 | 或 <table 开头）
+
+
+def should_translate(text: str) -> bool:
+    """
+    判断文本是否需要翻译
+    """
+    text = text.strip()
+
+    # 太短的文本
+    if len(text) < 3:
+        return False
+
+    # 纯数字或标点（先按首字符过滤，避免对每个段落都做替换）
+    first = text[0]
+    if (first.isdigit() or first in '.,') and text.replace('.', '').replace(',', '').replace(' ', '').isdigit():
+        return False
+
+    # 纯标题标记
+    if first == '#' and BARE_HEADING_PATTERN.match(text):
+        return False
+
+    return True
+
+
+class Paragraph:
+    """
+    段落
+
+    只保存在原文中的起止位置，文本通过 text(source) 按需切片。
+    代码块、图片、公式块和空行不生成段落，重建文档时作为段落之间的原文保留；
+    连续的表格行记录为一个表格段落（只翻译其中的单元格），
+    只含空白字符的空行（代码块外）单独记录，输出时清空。
+    """
+
+    __slots__ = ('start', 'end', 'kind', 'level', 'translate')
+
+    def __init__(self, start: int, end: int, kind: str = TEXT, level: int = 0, translate: bool = False):
+        self.start = start  # 在原文中的起始位置
+        self.end = end  # 在原文中的结束位置（不含）
+        self.kind = kind  # 段落类型: TEXT / BLANK / TABLE
+        self.level = level  # 首行的标题级别，非标题为0
+        self.translate = translate  # 是否需要翻译（已通过should_translate检查）
+
+    def text(self, source: str) -> str:
+        """段落文本"""
+        return source[self.start:self.end]
+
+    def __repr__(self) -> str:
+        return (
+            f"Paragraph({self.start}, {self.end}, {self.kind!r}, "
+            f"level={self.level}, translate={self.translate})"
+        )
+
+
+def _make_paragraph(source: str, start: int, end: int) -> Paragraph:
+    heading = HEADING_PATTERN.match(source, start, end)
+    level = len(heading.group(1)) if heading else 0
+    return Paragraph(start, end, TEXT, level, should_translate(source[start:end]))
+
+
+def split_markdown(source: str) -> List[Paragraph]:
+    """
+    将Markdown分割为段落
+
+    连续的普通文本行组成一个段落；代码块（```之间）、以 | 或 <table 开头的表格行、
+    单独成行的图片、以 $ 开头的公式行和空行都会结束当前段落，且不参与翻译。
+    只逐个查找这些特殊行，两个特殊行之间的文本行整体作为一个段落，代码块整体跳过，
+    相邻的表格行合并为一个TABLE段落。
+
+    Args:
+        source: Markdown内容
+
+    Returns:
+        按原文顺序排列的段落
+    """
+    paragraphs: List[Paragraph] = []
+    length = len(source)
+    search_special = SPECIAL_LINE_PATTERN.search
+    search_fence = FENCE_PATTERN.search
+    find = source.find
+
+    pos = 0
+    while True:
+        match = search_special(source, pos)
+        if match is None:
+            # 剩余的都是普通文本行
+            if pos < length:
+                paragraphs.append(_make_paragraph(source, pos, length))
+            break
+
+        line_start = match.start()
+        if line_start > pos:
+            paragraphs.append(_make_paragraph(source, pos, line_start - 1))
+        line_end = find('\n', line_start)
+        if line_end < 0:
+            line_end = length
+
+        if match.lastgroup == 'fence':
+            # 跳到代码块结束标记所在行，未闭合时其后全部是代码
+            fence = search_fence(source, line_end + 1) if line_end < length else None
+            if fence is None:
+                break
+            line_end = find('\n', fence.end())
+            if line_end < 0:
+                line_end = length
+        elif match.lastgroup == 'table':
+            last = paragraphs[-1] if paragraphs else None
+            if last is not None and last.kind == TABLE and last.end == line_start - 1:
+                last.end = line_end
+            else:
+                paragraphs.append(Paragraph(line_start, line_end, TABLE))
+        elif match.lastgroup == 'blank' and line_end > line_start:
+            paragraphs.append(Paragraph(line_start, line_end, BLANK))
+
+        if line_end >= length:
+            break
+        pos = line_end + 1
+
+    return paragraphs
@@ -0,0 +1,123 @@
+"""
+表格翻译
+从HTML表格（<td>/<th>）和Markdown管道表格中提取单元格文字，翻译后按原位置写回，
+表格结构（标签、属性、分隔行、对齐）保持不变
+"""
+
+import html
+import re
+from typing import List, Mapping, Tuple
+
+from .masking import WORD_PATTERN, strip_spans
+
+# HTML单元格，group(2) 为单元格内容
+HTML_CELL_PATTERN = re.compile(r'(<t[dh]\b[^>]*>)(.*?)(</t[dh]\s*>)', re.IGNORECASE | re.DOTALL)
+
+# 管道表格的行
+PIPE_LINE_PATTERN = re.compile(r'[^\S\n]*\|')
+
+# 管道表格中未转义的分隔符
+PIPE_PATTERN = re.compile(r'(?<!\\)\|')
+
+# 管道表格的分隔行（如 |---|:--:|）只包含这些字符
+SEPARATOR_CHARS = frozenset('|-: \t')
+
+# 单元格: (内容在表格文本中的起始位置, 结束位置, 发送翻译的文本)
+Cell = Tuple[int, int, str]
+
+
+def is_translatable_cell(text: str) -> bool:
+    """单元格是否包含需要翻译的文字（纯数字、符号、公式和单个字母不翻译）"""
+    return len(text) >= 2 and WORD_PATTERN.search(strip_spans(text)) is not None
+
+
+def _strip_span(line: str, start: int, end: int) -> Tuple[int, int]:
+    """去掉首尾空白后的范围"""
+    while start < end and line[start].isspace():
+        start += 1
+    while end > start and line[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def _pipe_cells(line: str, offset: int) -> List[Cell]:
+    """管道表格一行中的单元格"""
+    if SEPARATOR_CHARS.issuperset(line) and '-' in line:
+        return []
+    bounds = [-1] + [match.start() for match in PIPE_PATTERN.finditer(line)] + [len(line)]
+    cells = []
+    for left, right in zip(bounds, bounds[1:]):
+        start, end = _strip_span(line, left + 1, right)
+        if start < end:
+            cells.append((offset + start, offset + end, line[start:end]))
+    return cells
+
+
+def _html_cells(line: str, offset: int) -> List[Cell]:
+    """HTML表格一行中的单元格（含嵌套标签的单元格不翻译）"""
+    cells = []
+    for match in HTML_CELL_PATTERN.finditer(line):
+        start, end = _strip_span(line, match.start(2), match.end(2))
+        content = line[start:end]
+        if start < end and '<' not in content:
+            cells.append((offset + start, offset + end, html.unescape(content)))
+    return cells
+
+
+def extract_cells(table: str) -> List[Cell]:
+    """
+    提取表格中需要翻译的单元格
+
+    以 | 开头的行按管道表格拆分（跳过分隔行，\\| 不作为分隔符），其他行按HTML单元格提取；
+    只返回包含文字的单元格，HTML实体已还原为字符。
+
+    Args:
+        table: 表格文本（一行或连续多行）
+
+    Returns:
+        按位置排列的单元格
+    """
+    cells: List[Cell] = []
+    offset = 0
+    for line in table.split('\n'):
+        if PIPE_LINE_PATTERN.match(line):
+            found = _pipe_cells(line, offset)
+        else:
+            found = _html_cells(line, offset)
+        cells.extend(cell for cell in found if is_translatable_cell(cell[2]))
+        offset += len(line) + 1
+    return cells
+
+
+def _escape(translated: str, pipe: bool) -> str:
+    """把译文转换为可以放回单元格的形式（不能换行，管道表格转义 |，HTML转义 & < >）"""
+    translated = ' '.join(translated.split())
+    if pipe:
+        return PIPE_PATTERN.sub(r'\\|', translated)
+    return html.escape(translated, quote=False)
+
+
+def fill_cells(table: str, cells: List[Cell], translations: Mapping[str, str]) -> str:
+    """
+    把译文写回单元格
+
+    Args:
+        table: 表格文本
+        cells: extract_cells 的结果
+        translations: {单元格文本: 译文}，没有译文的单元格保留原文
+
+    Returns:
+        翻译后的表格
+    """
+    parts = []
+    position = 0
+    for start, end, text in cells:
+        translated = translations.get(text)
+        if translated is None:
+            continue
+        pipe = PIPE_LINE_PATTERN.match(table, table.rfind('\n', 0, start) + 1) is not None
+        parts.append(table[position:start])
+        parts.append(_escape(translated, pipe))
+        position = end
+    parts.append(table[position:])
+    return ''.join(parts)
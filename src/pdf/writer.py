@@ -0,0 +1,81 @@
+"""
+Markdown输出
+翻译过程中按文档顺序把已完成的内容追加写入输出文件，
+可以在翻译过程中查看（tail -f），进程中断时也保留已完成的部分
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Union
+
+from loguru import logger
+
+# 写入过程中使用的文件后缀，完成后重命名为最终文件名
+PARTIAL_SUFFIX = ".partial"
+
+
+class MarkdownWriter:
+    """
+    按顺序写出的Markdown文件
+
+    内容按 write 的调用顺序追加并立即刷新，读取方可以随时看到已完成的部分；
+    可以在多个线程中调用，每次 write 的内容不会交错。
+
+    写入过程中内容保存在 <文件名>.partial 中，正常关闭时重命名为目标文件，
+    出错或中断时保留该文件，已存在的目标文件在完成前不会被覆盖。
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        打开输出文件
+
+        Args:
+            path: 最终输出路径
+        """
+        self.path = Path(path)
+        self.partial_path = self.path.with_name(self.path.name + PARTIAL_SUFFIX)
+        self.bytes_written = 0
+
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.partial_path, "wb")
+
+    def write(self, text: str) -> None:
+        """按调用顺序追加内容"""
+        if not text:
+            return
+        data = text.encode("utf-8")
+        with self._lock:
+            self._file.write(data)
+            # 刷新到操作系统，使读取方能立即看到已完成的内容
+            self._file.flush()
+            self.bytes_written += len(data)
+
+    def close(self) -> None:
+        """写出全部内容并重命名为目标文件"""
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        os.replace(self.partial_path, self.path)
+
+    def abort(self) -> None:
+        """关闭文件但不重命名，保留已写出的部分"""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        logger.warning(f"翻译未完成，已完成的部分保存在: {self.partial_path}")
+
+    def __enter__(self) -> "MarkdownWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,523 @@
+"""
+本地翻译服务
+常驻进程保持MinerU模型和翻译器连接，通过HTTP接收PDF翻译任务；
+同时提供供 translate 命令使用的轻量客户端
+"""
+
+import json
+import queue
+import re
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+from loguru import logger
+
+from .pdf import PDFProcessor
+
+# 任务结束状态
+FINISHED_STATUSES = ("done", "failed")
+
+# 任务ID（任务目录名）
+JOB_ID_PATTERN = re.compile(r"[0-9a-f]{12}")
+
+
+@dataclass
+class Job:
+    """翻译任务"""
+    id: str
+    filename: str
+    input_path: str
+    pages: Optional[List[int]] = None
+    bilingual: bool = False
+    status: str = "queued"  # queued / running / done / failed
+    progress: int = 0  # 已翻译段落数
+    total: int = 0  # 需要翻译的段落数
+    error: Optional[str] = None
+    output_path: Optional[str] = None
+    report: dict = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    version: int = 0  # 每次状态变化递增，用于推送进度
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data.pop("input_path")
+        data["images"] = self.list_images()
+        return data
+
+    def images_dir(self) -> Optional[Path]:
+        if self.output_path is None:
+            return None
+        return Path(self.output_path).parent / "images"
+
+    def list_images(self) -> List[str]:
+        images_dir = self.images_dir()
+        if images_dir is None or not images_dir.exists():
+            return []
+        return sorted(p.name for p in images_dir.iterdir() if p.is_file())
+
+
+class TranslationService:
+    """
+    翻译任务队列
+
+    所有任务共享同一个PDFProcessor（翻译器、缓存、MinerU模型常驻内存），
+    由workers个工作线程依次处理，每个任务的输出写入 <work_dir>/<任务ID>/。
+    已结束的任务超过保留时间或数量上限时，连同其目录一起删除
+    """
+
+    def __init__(
+        self,
+        processor: PDFProcessor,
+        work_dir: str,
+        workers: int = 1,
+        info: Optional[dict] = None,
+        max_jobs: int = 100,
+        job_ttl: float = 0,
+    ):
+        """
+        初始化翻译服务
+
+        Args:
+            processor: PDF处理器
+            work_dir: 任务输入输出目录
+            workers: 同时处理的任务数
+            info: 通过 /health 返回的服务信息（翻译器、模型、语言对等）
+            max_jobs: 最多保留的已结束任务数
+            job_ttl: 已结束任务的保留时间（秒），0表示不按时间清理
+        """
+        self.processor = processor
+        self.work_dir = Path(work_dir).expanduser()
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.info = info or {}
+        self.max_jobs = max(1, max_jobs)
+        self.job_ttl = job_ttl
+        self._remove_stale_dirs()
+
+        self.jobs: Dict[str, Job] = {}
+        self._queue: queue.Queue = queue.Queue()
+        self._changed = threading.Condition()
+        self._workers = [
+            threading.Thread(target=self._work, name=f"translate-job-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(
+        self,
+        filename: str,
+        data: bytes,
+        pages: Optional[List[int]] = None,
+        bilingual: bool = False,
+    ) -> Job:
+        """
+        提交翻译任务
+
+        Args:
+            filename: 原始文件名
+            data: PDF内容
+            pages: 要翻译的页码列表 (0-based)
+            bilingual: 是否生成双语对照
+
+        Returns:
+            新建的任务
+        """
+        job_id = uuid.uuid4().hex[:12]
+        filename = Path(filename).name
+        if not filename.lower().endswith(".pdf"):
+            filename = "input.pdf"
+
+        job_dir = self.work_dir / job_id
+        job_dir.mkdir(parents=True)
+        input_path = job_dir / filename
+        input_path.write_bytes(data)
+
+        job = Job(
+            id=job_id,
+            filename=filename,
+            input_path=str(input_path),
+            pages=pages,
+            bilingual=bilingual,
+        )
+        with self._changed:
+            self.jobs[job_id] = job
+        self._queue.put(job_id)
+        self._evict()
+        logger.info(f"新任务 {job_id}: {filename}")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def queued(self) -> int:
+        """排队中的任务数"""
+        return sum(1 for job in self.jobs.values() if job.status == "queued")
+
+    def _update(self, job: Job, **changes) -> None:
+        with self._changed:
+            for name, value in changes.items():
+                setattr(job, name, value)
+            job.version += 1
+            self._changed.notify_all()
+
+    def wait_for_update(self, job: Job, version: int, timeout: float) -> bool:
+        """
+        等待任务状态变化
+
+        Args:
+            job: 任务
+            version: 调用方已知的版本号
+            timeout: 最长等待秒数
+
+        Returns:
+            状态是否已变化
+        """
+        with self._changed:
+            return self._changed.wait_for(lambda: job.version != version, timeout)
+
+    def _remove_stale_dirs(self) -> None:
+        """删除上次运行遗留的、超过保留时间的任务目录（重启后这些任务已无法访问）"""
+        if self.job_ttl <= 0:
+            return
+        now = time.time()
+        for path in self.work_dir.iterdir():
+            if JOB_ID_PATTERN.fullmatch(path.name) and path.is_dir() and now - path.stat().st_mtime > self.job_ttl:
+                shutil.rmtree(path, ignore_errors=True)
+                logger.info(f"已清理遗留的任务目录 {path}")
+
+    def _evict(self) -> None:
+        """删除超过保留时间或数量上限的已结束任务及其目录"""
+        now = time.time()
+        with self._changed:
+            finished = sorted(
+                (job for job in self.jobs.values() if job.status in FINISHED_STATUSES),
+                key=lambda job: job.finished_at or 0,
+            )
+            expired = finished[:max(0, len(finished) - self.max_jobs)]
+            if self.job_ttl > 0:
+                expired += [
+                    job for job in finished[len(expired):]
+                    if now - (job.finished_at or 0) > self.job_ttl
+                ]
+            for job in expired:
+                del self.jobs[job.id]
+        for job in expired:
+            shutil.rmtree(self.work_dir / job.id, ignore_errors=True)
+            logger.info(f"已清理任务 {job.id}")
+
+    def _work(self) -> None:
+        while True:
+            job = self.jobs[self._queue.get()]
+            self._run(job)
+            self._evict()
+
+    def _run(self, job: Job) -> None:
+        worker = self.processor.spawn()
+        worker.bilingual = job.bilingual
+        worker.progress_callback = lambda done, total: self._update(job, progress=done, total=total)
+
+        self._update(job, status="running", started_at=time.time())
+        try:
+            output_path = worker.process(
+                job.input_path,
+                output_path=str(self.work_dir / job.id),
+                pages=job.pages,
+            )
+        except Exception as e:
+            logger.exception(f"任务 {job.id} 失败")
+            self._update(job, status="failed", error=repr(e), finished_at=time.time(),
+                         report=worker.report.as_dict())
+            return
+        self._update(job, status="done", output_path=output_path, finished_at=time.time(),
+                     report=worker.report.as_dict())
+        logger.info(f"任务 {job.id} 完成")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    HTTP接口
+
+    - GET  /health                     服务信息
+    - POST /jobs?filename=&pages=&bilingual=   请求体为PDF内容，返回任务
+    - GET  /jobs                       全部任务
+    - GET  /jobs/<id>                  任务状态
+    - GET  /jobs/<id>/events           以Server-Sent Events推送任务进度，任务结束后关闭
+    - GET  /jobs/<id>/result           翻译后的Markdown
+    - GET  /jobs/<id>/images/<name>    图片
+    - GET  /metrics                    运行指标（Prometheus文本格式）
+    """
+
+    server_version = "academic-pdf-translator"
+
+    @property
+    def service(self) -> TranslationService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send_json(self, data, status: int = 200) -> None:
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str) -> None:
+        self._send_json({"error": message}, status)
+
+    def _send_file(self, path: Path, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(path.stat().st_size))
+        self.end_headers()
+        with open(path, "rb") as f:
+            shutil.copyfileobj(f, self.wfile)
+
+    def do_GET(self):
+        parts = [p for p in urlparse(self.path).path.split("/") if p]
+
+        if parts == ["health"]:
+            self._send_json({"status": "ok", "queued": self.service.queued(), **self.service.info})
+            return
+        if parts == ["metrics"]:
+            self.service.processor.metrics.set("jobs_queued", self.service.queued())
+            body = self.service.processor.metrics.to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if parts == ["jobs"]:
+            self._send_json([job.as_dict() for job in self.service.jobs.values()])
+            return
+        if len(parts) < 2 or parts[0] != "jobs":
+            self._send_error(404, "not found")
+            return
+
+        job = self.service.get(parts[1])
+        if job is None:
+            self._send_error(404, "job not found")
+            return
+
+        if len(parts) == 2:
+            self._send_json(job.as_dict())
+        elif parts[2:] == ["events"]:
+            self._stream_events(job)
+        elif parts[2:] == ["result"]:
+            if job.status != "done":
+                self._send_error(409, f"job is {job.status}")
+                return
+            self._send_file(Path(job.output_path), "text/markdown; charset=utf-8")
+        elif len(parts) == 4 and parts[2] == "images":
+            images_dir = job.images_dir()
+            name = Path(unquote(parts[3])).name
+            if images_dir is None or not (images_dir / name).is_file():
+                self._send_error(404, "image not found")
+                return
+            suffix = Path(name).suffix.lower().lstrip(".")
+            content_type = "image/jpeg" if suffix in ("jpg", "jpeg") else f"image/{suffix or 'png'}"
+            self._send_file(images_dir / name, content_type)
+        else:
+            self._send_error(404, "not found")
+
+    def _stream_events(self, job: Job) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        version = -1
+        try:
+            while True:
+                if job.version != version:
+                    version = job.version
+                    data = json.dumps(job.as_dict(), ensure_ascii=False)
+                    self.wfile.write(f"data: {data}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    if job.status in FINISHED_STATUSES:
+                        return
+                elif not self.service.wait_for_update(job, version, timeout=15.0):
+                    # 保持连接
+                    self.wfile.write(b": keep-alive\n\n")
+                    self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/jobs":
+            self._send_error(404, "not found")
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            self._send_error(400, "empty body")
+            return
+        if length > self.server.max_upload_bytes:
+            self._send_error(413, "file too large")
+            return
+        data = self.rfile.read(length)
+
+        params = parse_qs(url.query)
+        try:
+            pages = [int(p) for p in params["pages"][0].split(",")] if "pages" in params else None
+        except ValueError:
+            self._send_error(400, "invalid pages")
+            return
+        job = self.service.submit(
+            filename=params.get("filename", ["input.pdf"])[0],
+            data=data,
+            pages=pages,
+            bilingual=params.get("bilingual", ["0"])[0] in ("1", "true"),
+        )
+        self._send_json(job.as_dict(), status=201)
+
+
+def serve(
+    service: TranslationService,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    max_upload_mb: int = 200,
+) -> None:
+    """
+    启动HTTP服务（阻塞直到中断）
+
+    Args:
+        service: 翻译服务
+        host: 监听地址
+        port: 监听端口
+        max_upload_mb: 单个PDF的大小上限（MB）
+    """
+    httpd = ThreadingHTTPServer((host, port), _Handler)
+    httpd.daemon_threads = True
+    httpd.service = service
+    httpd.max_upload_bytes = max_upload_mb * 1024 * 1024
+    logger.info(f"翻译服务已启动: http://{host}:{port}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+
+class ServiceClient:
+    """翻译服务客户端"""
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        """
+        初始化客户端
+
+        Args:
+            base_url: 服务地址，如 http://127.0.0.1:8765
+            timeout: 普通请求超时（秒）
+        """
+        import httpx
+
+        self.base_url = base_url.rstrip("/")
+        self.client = httpx.Client(base_url=self.base_url, timeout=timeout)
+
+    def health(self) -> Optional[dict]:
+        """查询服务信息，服务未运行时返回None"""
+        import httpx
+
+        try:
+            response = self.client.get("/health", timeout=1.0)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError:
+            return None
+
+    def submit(
+        self,
+        pdf_path: str,
+        pages: Optional[List[int]] = None,
+        bilingual: bool = False,
+    ) -> dict:
+        """上传PDF并创建任务"""
+        params = {"filename": Path(pdf_path).name, "bilingual": "1" if bilingual else "0"}
+        if pages:
+            params["pages"] = ",".join(str(p) for p in pages)
+        response = self.client.post(
+            "/jobs",
+            params=params,
+            content=Path(pdf_path).read_bytes(),
+            headers={"Content-Type": "application/pdf"},
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def status(self, job_id: str) -> dict:
+        """查询任务状态"""
+        response = self.client.get(f"/jobs/{job_id}")
+        response.raise_for_status()
+        return response.json()
+
+    def wait(self, job_id: str, on_progress: Optional[Callable[[dict], None]] = None) -> dict:
+        """
+        等待任务结束
+
+        Args:
+            job_id: 任务ID
+            on_progress: 每次收到任务状态时的回调
+
+        Returns:
+            最终任务状态
+        """
+        job = None
+        with self.client.stream("GET", f"/jobs/{job_id}/events", timeout=None) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line.startswith("data: "):
+                    continue
+                job = json.loads(line[len("data: "):])
+                if on_progress:
+                    on_progress(job)
+                if job["status"] in FINISHED_STATUSES:
+                    break
+        return job or self.status(job_id)
+
+    def download(self, job: dict, md_output_path: Path) -> str:
+        """
+        下载翻译结果和图片
+
+        Args:
+            job: 已完成的任务状态
+            md_output_path: Markdown保存路径，图片保存到同目录的images/下
+
+        Returns:
+            Markdown文件路径
+        """
+        md_output_path.parent.mkdir(parents=True, exist_ok=True)
+        response = self.client.get(f"/jobs/{job['id']}/result")
+        response.raise_for_status()
+        md_output_path.write_bytes(response.content)
+
+        images_dir = md_output_path.parent / "images"
+        for name in job.get("images", []):
+            response = self.client.get(f"/jobs/{job['id']}/images/{quote(name)}")
+            response.raise_for_status()
+            images_dir.mkdir(exist_ok=True)
+            (images_dir / name).write_bytes(response.content)
+        return str(md_output_path)
+
+    def close(self) -> None:
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
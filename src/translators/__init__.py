@@ -1,12 +1,14 @@
 """
 翻译器模块
-支持多种翻译后端：Google Translate、OpenAI、本地LLM
+支持多种翻译后端：Google Translate、OpenAI、本地LLM，以及用于测试的模拟翻译器
 """
 
 from .base import BaseTranslator, TranslationResult
 from .google import GoogleTranslator
 from .openai import OpenAITranslator
 from .local_llm import LocalLLMTranslator
+from .mock import MockTranslator
+from .cache import TranslationCache, CachedTranslator
 
 __all__ = [
     "BaseTranslator",
@@ -14,6 +16,9 @@ __all__ = [
     "GoogleTranslator",
     "OpenAITranslator",
     "LocalLLMTranslator",
+    "MockTranslator",
+    "TranslationCache",
+    "CachedTranslator",
     "get_translator",
 ]
 
@@ -23,7 +28,7 @@ def get_translator(name: str, **kwargs) -> BaseTranslator:
     获取翻译器实例
     
     Args:
-        name: 翻译器名称 (google, openai, local_llm)
+        name: 翻译器名称 (google, openai, local_llm, mock)
         **kwargs: 传递给翻译器的配置参数
     
     Returns:
@@ -33,6 +38,7 @@ def get_translator(name: str, **kwargs) -> BaseTranslator:
         "google": GoogleTranslator,
         "openai": OpenAITranslator,
         "local_llm": LocalLLMTranslator,
+        "mock": MockTranslator,
     }
     
     if name not in translators:
@@ -3,9 +3,23 @@
 定义翻译器接口和通用功能
 """
 
+import asyncio
+import threading
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Coroutine, List, Optional, TypeVar
+
+from loguru import logger
+
+from .rate_limit import THROTTLE_STATUS_CODES
+from .retry import HedgingPolicy, RequestStats, RetryPolicy
+from ..utils.metrics import Metrics
+
+if TYPE_CHECKING:
+    from .rate_limit import RateLimiter
+
+T = TypeVar("T")
 
 
 @dataclass
@@ -15,6 +29,7 @@ class TranslationResult:
     translated: str
     source_lang: str
     target_lang: str
+    error: Optional[str] = None  # 翻译失败时的错误信息，此时translated为原文
     
 
 class BaseTranslator(ABC):
@@ -23,16 +38,36 @@ class BaseTranslator(ABC):
     所有翻译器实现都需要继承此类
     """
     
-    def __init__(self, source_lang: str = "en", target_lang: str = "zh"):
+    # 是否支持把多段文本打包为一次请求（需要实现_chat_async和max_concurrency）
+    supports_packing = False
+    
+    def __init__(
+        self,
+        source_lang: str = "en",
+        target_lang: str = "zh",
+        retry_policy: Optional[RetryPolicy] = None,
+        hedging: Optional[HedgingPolicy] = None,
+    ):
         """
         初始化翻译器
         
         Args:
             source_lang: 源语言代码
             target_lang: 目标语言代码
+            retry_policy: 请求重试策略，None表示不重试
+            hedging: 请求对冲策略（仅异步请求），None表示不对冲
         """
         self.source_lang = source_lang
         self.target_lang = target_lang
+        self.retry_policy = retry_policy
+        self.hedging = hedging
+        self.request_stats = RequestStats()
+        self.metrics = Metrics()
+        
+        # 异步批量翻译使用的事件循环（在独立线程中运行，延迟创建）
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
     
     @abstractmethod
     def translate(self, text: str) -> TranslationResult:
@@ -60,6 +95,207 @@ class BaseTranslator(ABC):
         """
         return [self.translate(text) for text in texts]
     
+    def translate_packed(self, texts: List[str], token_budget: int) -> List[TranslationResult]:
+        """
+        把大量短文本（如表格单元格）打包为少量请求翻译
+        supports_packing为True的翻译器不论pack_tokens设置都按token_budget打包，
+        其他翻译器（如Google）等同于translate_batch
+        
+        Args:
+            texts: 要翻译的文本列表
+            token_budget: 每次请求的原文token预算，不大于0时等同于translate_batch
+        
+        Returns:
+            翻译结果列表
+        """
+        if not texts or token_budget <= 0 or not self.supports_packing:
+            return self.translate_batch(texts)
+        from .packing import translate_packed_async
+        return self._run_async(translate_packed_async(
+            self, texts, token_budget, self.max_concurrency,
+        ))
+    
+    async def translate_async(self, text: str) -> TranslationResult:
+        """
+        异步翻译单段文本
+        默认在线程池中调用同步的translate，子类可以覆盖为原生异步实现
+        
+        Args:
+            text: 要翻译的文本
+        
+        Returns:
+            TranslationResult对象
+        """
+        return await asyncio.to_thread(self.translate, text)
+    
+    async def _translate_batch_async(
+        self,
+        texts: List[str],
+        max_concurrency: int,
+    ) -> List[TranslationResult]:
+        """
+        并发翻译多段文本，同时进行中的请求数不超过max_concurrency
+        
+        结果顺序与输入一致；单段翻译失败不会影响其他段落，
+        失败的段落返回原文并在error字段中记录错误信息
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def worker(text: str) -> TranslationResult:
+            async with semaphore:
+                return await self.translate_async(text)
+        
+        outcomes = await asyncio.gather(
+            *(worker(text) for text in texts),
+            return_exceptions=True,
+        )
+        
+        results = []
+        for text, outcome in zip(texts, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning(f"翻译失败: {outcome!r}")
+                results.append(self._create_error_result(text, outcome))
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                results.append(outcome)
+        return results
+    
+    def _timed(self, request: Callable[[], T]) -> Callable[[], T]:
+        """包装同步请求，记录每次实际发出的请求的耗时和错误数"""
+        def timed() -> T:
+            self.metrics.inc("requests_total")
+            start = time.perf_counter()
+            try:
+                result = request()
+            except Exception:
+                self.metrics.inc("request_errors_total")
+                raise
+            self.metrics.observe("request_latency_seconds", time.perf_counter() - start)
+            return result
+        return timed
+    
+    def _timed_async(self, request: Callable[[], Awaitable[T]]) -> Callable[[], Awaitable[T]]:
+        """包装异步请求，记录每次实际发出的请求（含重试和对冲副本）的耗时和错误数"""
+        async def timed() -> T:
+            self.metrics.inc("requests_total")
+            start = time.perf_counter()
+            try:
+                result = await request()
+            except Exception:
+                self.metrics.inc("request_errors_total")
+                raise
+            self.metrics.observe("request_latency_seconds", time.perf_counter() - start)
+            return result
+        return timed
+    
+    def _record_usage(self, usage: Any) -> None:
+        """
+        记录响应中的token用量
+        
+        Args:
+            usage: OpenAI SDK的usage对象，或OpenAI兼容接口返回的usage字典
+        """
+        if not usage:
+            return
+        if isinstance(usage, dict):
+            prompt_tokens = usage.get("prompt_tokens")
+            completion_tokens = usage.get("completion_tokens")
+        else:
+            prompt_tokens = getattr(usage, "prompt_tokens", None)
+            completion_tokens = getattr(usage, "completion_tokens", None)
+        if prompt_tokens:
+            self.metrics.inc("tokens_in_total", prompt_tokens)
+        if completion_tokens:
+            self.metrics.inc("tokens_out_total", completion_tokens)
+    
+    def _call_with_retry(self, request: Callable[[], T]) -> T:
+        """按重试策略执行同步请求"""
+        request = self._timed(request)
+        if self.retry_policy is None:
+            return request()
+        return self.retry_policy.call(request, self.request_stats)
+    
+    async def _call_with_retry_async(
+        self,
+        request: Callable[[], Awaitable[T]],
+        rate_limiter: Optional["RateLimiter"] = None,
+        tokens: int = 0,
+    ) -> T:
+        """
+        按重试、限流和对冲策略执行异步请求
+        
+        每次重试都重新经过限流器；对冲副本单独经过限流器，占用自己的并发槽位和RPM/TPM预算。
+        限流器已经按max_throttle_retries重试429/503，重试策略不再重复重试这些状态码
+        
+        Args:
+            request: 返回协程的请求函数
+            rate_limiter: 限流器
+            tokens: 本次请求预计消耗的token数
+        
+        Returns:
+            请求结果
+        """
+        request = self._timed_async(request)
+        retry_policy = self.retry_policy
+        attempt = request
+        if rate_limiter is not None:
+            limited = lambda: rate_limiter.run(request, tokens)
+            if self.hedging is not None:
+                # 原请求在限流槽位内计时，对冲副本重新申请槽位和预算
+                attempt = lambda: rate_limiter.run(
+                    lambda: self.hedging.call_async(request, self.request_stats, hedge_fn=limited),
+                    tokens,
+                )
+            else:
+                attempt = limited
+            if retry_policy is not None:
+                retry_policy = retry_policy.excluding(THROTTLE_STATUS_CODES)
+        elif self.hedging is not None:
+            attempt = lambda: self.hedging.call_async(request, self.request_stats)
+        if retry_policy is None:
+            return await attempt()
+        return await retry_policy.call_async(attempt, self.request_stats)
+    
+    def _run_async(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """
+        在翻译器自有的事件循环中运行协程并等待结果
+        
+        事件循环在后台线程中长期运行，异步客户端可以跨多次批量调用复用，
+        调用方本身是否处于事件循环中也不受影响
+        """
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name=f"{type(self).__name__}-loop",
+                    daemon=True,
+                )
+                self._loop_thread.start()
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+    
+    def forget(self, texts: List[str]) -> None:
+        """
+        丢弃这些文本已保存的译文，使下次翻译重新请求（无缓存的翻译器不做任何事）
+        
+        Args:
+            texts: 原文列表
+        """
+    
+    def close(self) -> None:
+        """释放翻译器持有的资源（事件循环、连接等）"""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = None
+            self._loop_thread = None
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(loop.stop)
+            if thread is not None:
+                thread.join()
+            loop.close()
+    
     def _should_skip(self, text: str) -> bool:
         """
         判断是否应该跳过翻译
@@ -92,3 +328,13 @@ class BaseTranslator(ABC):
             source_lang=self.source_lang,
             target_lang=self.target_lang,
         )
+    
+    def _create_error_result(self, text: str, error: Exception) -> TranslationResult:
+        """创建翻译失败的结果（保留原文，记录错误）"""
+        return TranslationResult(
+            original=text,
+            translated=text,
+            source_lang=self.source_lang,
+            target_lang=self.target_lang,
+            error=str(error) or type(error).__name__,
+        )
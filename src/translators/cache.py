@@ -0,0 +1,379 @@
+"""
+翻译记忆缓存
+基于SQLite的持久化缓存，所有翻译器共享，避免重复翻译相同段落
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from loguru import logger
+
+from .base import BaseTranslator, TranslationResult
+
+
+class TranslationCache:
+    """
+    SQLite翻译缓存
+
+    以 (原文, 后端, 模型, 系统提示词哈希, 语言对) 为键保存译文，
+    超过容量上限时按最近访问时间淘汰（LRU）
+    """
+
+    def __init__(self, path: str, max_entries: int = 200000):
+        """
+        初始化翻译缓存
+
+        Args:
+            path: SQLite数据库文件路径
+            max_entries: 最大缓存条目数，超出后淘汰最久未使用的条目
+        """
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " key TEXT PRIMARY KEY,"
+            " translated TEXT NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_translations_last_access"
+            " ON translations (last_access)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        text: str,
+        backend: str,
+        model: str,
+        system_prompt: str,
+        source_lang: str,
+        target_lang: str,
+    ) -> str:
+        """生成缓存键"""
+        prompt_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+        raw = json.dumps(
+            [text, backend, model, prompt_hash, source_lang, target_lang],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, str]:
+        """
+        批量查询缓存，命中的条目会刷新访问时间
+
+        Args:
+            keys: 缓存键列表
+
+        Returns:
+            命中的 {键: 译文}
+        """
+        found: Dict[str, str] = {}
+        unique_keys = list(dict.fromkeys(keys))
+
+        with self._lock:
+            # SQLite单条语句的参数数量有限，分块查询
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, translated FROM translations WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                found.update(rows)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE translations SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+
+        return found
+
+    def contains_many(self, keys: List[str]) -> Set[str]:
+        """
+        查询哪些键已有缓存（只读，不刷新访问时间也不计入命中统计）
+
+        Args:
+            keys: 缓存键列表
+
+        Returns:
+            已缓存的键集合
+        """
+        found: Set[str] = set()
+        unique_keys = list(dict.fromkeys(keys))
+
+        with self._lock:
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key FROM translations WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                found.update(key for key, in rows)
+
+        return found
+
+    def get(self, key: str) -> Optional[str]:
+        """查询单条缓存"""
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Dict[str, str]) -> None:
+        """
+        批量写入缓存，写入后按容量上限淘汰旧条目
+
+        Args:
+            items: {键: 译文}
+        """
+        if not items:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations (key, translated, last_access) VALUES (?, ?, ?)",
+                [(key, translated, now) for key, translated in items.items()],
+            )
+            self._evict()
+            self._conn.commit()
+
+    def put(self, key: str, translated: str) -> None:
+        """写入单条缓存"""
+        self.put_many({key: translated})
+
+    def _evict(self) -> None:
+        """淘汰超出容量上限的最久未使用条目（调用方需持有锁）"""
+        if self.max_entries <= 0:
+            return
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM translations WHERE key IN ("
+                " SELECT key FROM translations ORDER BY last_access ASC LIMIT ?)",
+                (excess,),
+            )
+            logger.debug(f"翻译缓存淘汰 {excess} 条旧记录")
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()
+        return count
+
+    def delete_many(self, keys: List[str]) -> None:
+        """删除指定的缓存条目"""
+        if not keys:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM translations WHERE key = ?",
+                [(key,) for key in keys],
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._conn.execute("DELETE FROM translations")
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+
+    @property
+    def hit_ratio(self) -> float:
+        """缓存命中率"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        """缓存统计信息"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio,
+            "entries": len(self),
+        }
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+class CachedTranslator(BaseTranslator):
+    """
+    带翻译记忆缓存的翻译器包装
+    命中缓存的段落直接返回，未命中的交给内部翻译器并写回缓存
+    """
+
+    def __init__(self, translator: BaseTranslator, cache: TranslationCache):
+        """
+        初始化缓存翻译器
+
+        Args:
+            translator: 实际执行翻译的翻译器
+            cache: 翻译缓存
+        """
+        super().__init__(translator.source_lang, translator.target_lang)
+        self.translator = translator
+        self.cache = cache
+        # 共享内部翻译器的请求统计和运行指标
+        self.request_stats = translator.request_stats
+        self.metrics = translator.metrics
+
+    def _key(self, text: str) -> str:
+        return self.cache.make_key(
+            text,
+            backend=type(self.translator).__name__,
+            model=getattr(self.translator, "model", "") or "",
+            system_prompt=getattr(self.translator, "system_prompt", "") or "",
+            source_lang=self.source_lang,
+            target_lang=self.target_lang,
+        )
+
+    def _record_lookup(self, hits: int, misses: int) -> None:
+        """记录缓存查询结果"""
+        self.metrics.inc("cache_hits_total", hits)
+        self.metrics.inc("cache_misses_total", misses)
+        self.metrics.set("cache_hit_ratio", self.cache.hit_ratio)
+    
+    def _create_cached_result(self, text: str, translated: str) -> TranslationResult:
+        return TranslationResult(
+            original=text,
+            translated=translated,
+            source_lang=self.source_lang,
+            target_lang=self.target_lang,
+        )
+
+    def is_cached(self, texts: List[str]) -> List[bool]:
+        """
+        查询各段文本是否已有缓存译文（用于预估，不调用翻译器）
+
+        Args:
+            texts: 文本列表
+
+        Returns:
+            与texts一一对应的是否已缓存
+        """
+        keys = [self._key(text) for text in texts]
+        found = self.cache.contains_many(keys)
+        return [key in found for key in keys]
+
+    def translate(self, text: str) -> TranslationResult:
+        """
+        翻译单段文本（优先使用缓存）
+
+        Args:
+            text: 要翻译的文本
+
+        Returns:
+            翻译结果
+        """
+        return self.translate_batch([text])[0]
+
+    async def translate_async(self, text: str) -> TranslationResult:
+        """异步翻译单段文本（优先使用缓存）"""
+        if self.translator._should_skip(text):
+            return self._create_skip_result(text)
+
+        key = self._key(text)
+        cached = self.cache.get(key)
+        self._record_lookup(int(cached is not None), int(cached is None))
+        if cached is not None:
+            return self._create_cached_result(text, cached)
+
+        result = await self.translator.translate_async(text)
+        if result.error is None:
+            self.cache.put(key, result.translated)
+        return result
+
+    def translate_batch(self, texts: List[str]) -> List[TranslationResult]:
+        """
+        批量翻译，只把未命中缓存的文本交给内部翻译器
+
+        Args:
+            texts: 文本列表
+
+        Returns:
+            翻译结果列表
+        """
+        return self._translate_missing(texts, self.translator.translate_batch)
+
+    def translate_packed(self, texts: List[str], token_budget: int) -> List[TranslationResult]:
+        """
+        打包翻译，只把未命中缓存的文本交给内部翻译器打包
+
+        Args:
+            texts: 文本列表
+            token_budget: 每次请求的原文token预算
+
+        Returns:
+            翻译结果列表
+        """
+        return self._translate_missing(
+            texts, lambda missing: self.translator.translate_packed(missing, token_budget),
+        )
+
+    def _translate_missing(
+        self,
+        texts: List[str],
+        translate: Callable[[List[str]], List[TranslationResult]],
+    ) -> List[TranslationResult]:
+        """查询缓存，未命中的文本交给translate翻译，成功的译文写入缓存"""
+        results: List[Optional[TranslationResult]] = [None] * len(texts)
+        keys: Dict[int, str] = {}
+
+        for i, text in enumerate(texts):
+            if self.translator._should_skip(text):
+                results[i] = self._create_skip_result(text)
+            else:
+                keys[i] = self._key(text)
+
+        cached = self.cache.get_many(list(keys.values()))
+
+        missing = []
+        for i, key in keys.items():
+            if key in cached:
+                results[i] = self._create_cached_result(texts[i], cached[key])
+            else:
+                missing.append(i)
+        self._record_lookup(len(keys) - len(missing), len(missing))
+
+        if missing:
+            translated = translate([texts[i] for i in missing])
+            new_entries = {}
+            for i, result in zip(missing, translated):
+                results[i] = result
+                if result.error is None:
+                    new_entries[keys[i]] = result.translated
+            self.cache.put_many(new_entries)
+
+        return results
+
+    def forget(self, texts: List[str]) -> None:
+        """从缓存中删除这些文本的译文（如译文校验失败需要重新翻译时）"""
+        self.cache.delete_many([self._key(text) for text in texts])
+
+    def close(self) -> None:
+        """关闭内部翻译器和缓存"""
+        self.translator.close()
+        self.cache.close()
+        super().close()
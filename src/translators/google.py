@@ -6,6 +6,7 @@ Google Translate API 翻译器
 from typing import List, Optional
 
 from .base import BaseTranslator, TranslationResult
+from .retry import RetryPolicy
 
 
 class GoogleTranslator(BaseTranslator):
@@ -21,6 +22,7 @@ class GoogleTranslator(BaseTranslator):
         source_lang: str = "en",
         target_lang: str = "zh",
         project_id: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None,
     ):
         """
         初始化Google翻译器
@@ -29,8 +31,9 @@ class GoogleTranslator(BaseTranslator):
             source_lang: 源语言代码
             target_lang: 目标语言代码
             project_id: GCP项目ID
+            retry_policy: 请求重试策略
         """
-        super().__init__(source_lang, target_lang)
+        super().__init__(source_lang, target_lang, retry_policy)
         self.project_id = project_id
         self._client = None
     
@@ -60,11 +63,11 @@ class GoogleTranslator(BaseTranslator):
         if self._should_skip(text):
             return self._create_skip_result(text)
         
-        result = self.client.translate(
+        result = self._call_with_retry(lambda: self.client.translate(
             text,
             target_language=self.target_lang,
             source_language=self.source_lang,
-        )
+        ))
         
         return TranslationResult(
             original=text,
@@ -101,11 +104,11 @@ class GoogleTranslator(BaseTranslator):
         
         # 批量翻译
         if to_translate:
-            batch_results = self.client.translate(
+            batch_results = self._call_with_retry(lambda: self.client.translate(
                 to_translate,
                 target_language=self.target_lang,
                 source_language=self.source_lang,
-            )
+            ))
             
             for idx, result in zip(to_translate_indices, batch_results):
                 results[idx] = TranslationResult(
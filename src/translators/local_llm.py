@@ -9,6 +9,9 @@ import httpx
 
 from .base import BaseTranslator, TranslationResult
 from .prompts import get_translation_prompt
+from .rate_limit import RateLimiter
+from .retry import HedgingPolicy, RetryPolicy
+from ..utils.text import estimate_tokens
 
 
 # 默认的学术翻译提示词（已优化）
@@ -21,6 +24,8 @@ class LocalLLMTranslator(BaseTranslator):
     支持任何提供OpenAI兼容API的本地LLM服务（如vLLM、Ollama、LocalAI等）
     """
     
+    supports_packing = True
+    
     def __init__(
         self,
         source_lang: str = "en",
@@ -30,6 +35,15 @@ class LocalLLMTranslator(BaseTranslator):
         api_key: str = "not-needed",
         system_prompt: Optional[str] = None,
         timeout: float = 120.0,
+        max_concurrency: int = 8,
+        max_connections: int = 32,
+        max_keepalive_connections: int = 16,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        pack_tokens: int = 0,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        hedging: Optional[HedgingPolicy] = None,
     ):
         """
         初始化本地LLM翻译器
@@ -42,15 +56,36 @@ class LocalLLMTranslator(BaseTranslator):
             api_key: API密钥（本地部署通常不需要）
             system_prompt: 自定义系统提示词
             timeout: 请求超时时间（本地模型可能较慢）
+            max_concurrency: 批量翻译时同时进行的最大请求数
+            max_connections: 连接池最大连接数
+            max_keepalive_connections: 连接池保持的最大空闲长连接数
+            keepalive_expiry: 空闲长连接的保持时间（秒）
+            http2: 是否启用HTTP/2（需要安装 h2）
+            pack_tokens: 打包翻译的原文token预算，批量翻译时将连续短段落合并为
+                一次请求；0表示不打包
+            rate_limiter: 限流器，控制批量翻译的请求速率并处理429/503
+            retry_policy: 请求重试策略
+            hedging: 慢请求对冲策略（仅批量翻译）
         """
-        super().__init__(source_lang, target_lang)
+        super().__init__(source_lang, target_lang, retry_policy, hedging)
         self.base_url = base_url.rstrip("/")
         self.model = model
         self.api_key = api_key
         self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self.pack_tokens = pack_tokens
+        self.rate_limiter = rate_limiter
         self.system_prompt = system_prompt or get_translation_prompt(
             target_lang=self._get_lang_name(target_lang)
         )
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
     
     def _get_lang_name(self, code: str) -> str:
         """将语言代码转换为语言名称"""
@@ -62,6 +97,81 @@ class LocalLLMTranslator(BaseTranslator):
         }
         return lang_map.get(code, code)
     
+    def _client_kwargs(self) -> dict:
+        """同步/异步客户端共用的连接池配置"""
+        if self.http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                raise ImportError("启用HTTP/2需要安装 h2: pip install 'httpx[http2]'")
+        return {
+            "timeout": self.timeout,
+            "limits": self.limits,
+            "http2": self.http2,
+            "headers": {
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {self.api_key}",
+            },
+        }
+    
+    @property
+    def client(self) -> httpx.Client:
+        """长连接复用的同步HTTP客户端（延迟创建）"""
+        if self._client is None:
+            self._client = httpx.Client(**self._client_kwargs())
+        return self._client
+    
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """长连接复用的异步HTTP客户端（延迟创建，用于并发批量翻译）"""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(**self._client_kwargs())
+        return self._async_client
+    
+    def _build_payload(self, text: str, system_prompt: Optional[str] = None) -> dict:
+        """构建OpenAI兼容的请求体"""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt or self.system_prompt},
+                {"role": "user", "content": text},
+            ],
+            "temperature": 0.3,
+        }
+    
+    def _extract_content(self, response: httpx.Response) -> str:
+        """从响应中取出模型输出文本"""
+        response.raise_for_status()
+        result = response.json()
+        self._record_usage(result.get("usage"))
+        return result["choices"][0]["message"]["content"].strip()
+    
+    def _create_result(self, text: str, translated: str) -> TranslationResult:
+        return TranslationResult(
+            original=text,
+            translated=translated,
+            source_lang=self.source_lang,
+            target_lang=self.target_lang,
+        )
+    
+    async def _request_async(self, system_prompt: str, content: str) -> str:
+        """发送一次异步对话请求，返回模型输出文本"""
+        response = await self.async_client.post(
+            f"{self.base_url}/chat/completions",
+            json=self._build_payload(content, system_prompt),
+        )
+        return self._extract_content(response)
+    
+    async def _chat_async(self, system_prompt: str, content: str) -> str:
+        """发送异步对话请求（经过限流、重试和对冲）"""
+        # 预计消耗：提示词 + 原文 + 与原文相当的输出
+        tokens = estimate_tokens(system_prompt) + 2 * estimate_tokens(content)
+        return await self._call_with_retry_async(
+            lambda: self._request_async(system_prompt, content),
+            self.rate_limiter,
+            tokens,
+        )
+    
     def translate(self, text: str) -> TranslationResult:
         """
         使用本地LLM翻译文本
@@ -76,37 +186,33 @@ class LocalLLMTranslator(BaseTranslator):
             return self._create_skip_result(text)
         
         # 使用OpenAI兼容的API格式
-        url = f"{self.base_url}/chat/completions"
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}",
-        }
-        payload = {
-            "model": self.model,
-            "messages": [
-                {"role": "system", "content": self.system_prompt},
-                {"role": "user", "content": text},
-            ],
-            "temperature": 0.3,
-        }
+        translated = self._call_with_retry(lambda: self._extract_content(self.client.post(
+            f"{self.base_url}/chat/completions",
+            json=self._build_payload(text),
+        )))
+        return self._create_result(text, translated)
+    
+    async def translate_async(self, text: str) -> TranslationResult:
+        """
+        使用异步客户端翻译文本
         
-        with httpx.Client(timeout=self.timeout) as client:
-            response = client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            result = response.json()
+        Args:
+            text: 要翻译的文本
         
-        translated = result["choices"][0]["message"]["content"].strip()
+        Returns:
+            翻译结果
+        """
+        if self._should_skip(text):
+            return self._create_skip_result(text)
         
-        return TranslationResult(
-            original=text,
-            translated=translated,
-            source_lang=self.source_lang,
-            target_lang=self.target_lang,
-        )
+        translated = await self._chat_async(self.system_prompt, text)
+        return self._create_result(text, translated)
     
     def translate_batch(self, texts: List[str]) -> List[TranslationResult]:
         """
-        批量翻译
+        批量翻译（asyncio并发，复用连接池，同时进行的请求数不超过max_concurrency）
+        
+        设置了pack_tokens时，连续短段落会合并为一次请求
         
         Args:
             texts: 文本列表
@@ -114,7 +220,11 @@ class LocalLLMTranslator(BaseTranslator):
         Returns:
             翻译结果列表
         """
-        return [self.translate(text) for text in texts]
+        if not texts:
+            return []
+        if self.pack_tokens > 0:
+            return self.translate_packed(texts, self.pack_tokens)
+        return self._run_async(self._translate_batch_async(texts, self.max_concurrency))
     
     def check_connection(self) -> bool:
         """
@@ -124,9 +234,17 @@ class LocalLLMTranslator(BaseTranslator):
             连接是否成功
         """
         try:
-            url = f"{self.base_url}/models"
-            with httpx.Client(timeout=5.0) as client:
-                response = client.get(url)
-                return response.status_code == 200
+            response = self.client.get(f"{self.base_url}/models", timeout=5.0)
+            return response.status_code == 200
         except Exception:
             return False
+    
+    def close(self) -> None:
+        """关闭连接池和事件循环"""
+        if self._async_client is not None:
+            self._run_async(self._async_client.aclose())
+            self._async_client = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+        super().close()
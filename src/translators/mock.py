@@ -0,0 +1,384 @@
+"""
+模拟翻译器
+离线生成确定性的伪译文，可配置延迟分布、错误率和429限流率，用于基准测试和无网络环境；
+同时提供OpenAI兼容的本地HTTP模拟服务，用于端到端压测OpenAI/本地LLM翻译器
+"""
+
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+from loguru import logger
+
+from .base import BaseTranslator, TranslationResult
+from .packing import SEGMENT_PATTERN
+from .prompts import get_translation_prompt
+from .rate_limit import RateLimiter
+from .retry import HedgingPolicy, RetryPolicy
+from ..utils.text import estimate_tokens
+
+# 支持的延迟分布
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+
+def pseudo_translate(text: str, target_lang: str = "zh") -> str:
+    """
+    确定性的伪翻译：相同输入总是得到相同输出
+
+    每段前加上目标语言标记，打包请求的分段标记保持不变，便于按段拆分
+    """
+    matches = list(SEGMENT_PATTERN.finditer(text))
+    if not matches:
+        return f"[{target_lang}] {text.strip()}"
+
+    parts = []
+    for m, next_m in zip(matches, matches[1:] + [None]):
+        end = next_m.start() if next_m else len(text)
+        parts.append(f"{m.group(0).strip()}\n[{target_lang}] {text[m.end():end].strip()}")
+    return "\n\n".join(parts)
+
+
+class _MockResponse:
+    """模拟错误响应，供重试/限流逻辑读取状态码和Retry-After"""
+
+    def __init__(self, status_code: int, headers: dict):
+        self.status_code = status_code
+        self.headers = headers
+
+
+class MockAPIError(Exception):
+    """模拟的API错误（带HTTP状态码）"""
+
+    def __init__(self, status_code: int, retry_after: Optional[float] = None):
+        headers = {}
+        if retry_after is not None:
+            headers["retry-after"] = str(retry_after)
+        self.status_code = status_code
+        self.response = _MockResponse(status_code, headers)
+        super().__init__(f"mock error {status_code}")
+
+
+@dataclass
+class MockBehavior:
+    """模拟的服务特性：延迟分布与故障注入"""
+    latency: float = 0.05  # 每个请求的基础延迟（秒）
+    latency_per_token: float = 0.0  # 每个输出token增加的延迟（秒）
+    distribution: str = "fixed"  # 延迟分布: fixed / uniform / exponential / lognormal
+    spread: float = 0.5  # uniform为±比例，lognormal为sigma
+    error_rate: float = 0.0  # 返回500错误的概率
+    throttle_rate: float = 0.0  # 返回429限流的概率
+    retry_after: float = 1.0  # 429响应的Retry-After（秒）
+    seed: Optional[int] = None  # 随机种子，相同种子得到相同的延迟和故障序列
+    _random: random.Random = field(init=False, repr=False)
+    _lock: threading.Lock = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if self.distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"未知的延迟分布: {self.distribution}，可用选项: {list(LATENCY_DISTRIBUTIONS)}")
+        self._random = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    def sample_latency(self, tokens: int) -> float:
+        """按分布抽取一次请求的延迟"""
+        mean = self.latency + self.latency_per_token * tokens
+        with self._lock:
+            if self.distribution == "uniform":
+                return max(0.0, mean * (1 + self.spread * (2 * self._random.random() - 1)))
+            if self.distribution == "exponential":
+                return self._random.expovariate(1 / mean) if mean > 0 else 0.0
+            if self.distribution == "lognormal":
+                # 保持均值不变的对数正态分布
+                mu = math.log(mean) - self.spread ** 2 / 2 if mean > 0 else 0.0
+                return self._random.lognormvariate(mu, self.spread) if mean > 0 else 0.0
+            return mean
+
+    def sample_failure(self) -> Optional[int]:
+        """抽取本次请求注入的错误状态码，不出错时返回None"""
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 500
+        return None
+
+
+class MockTranslator(BaseTranslator):
+    """
+    模拟翻译器
+
+    不访问网络，按MockBehavior模拟延迟和故障，返回确定性的伪译文。
+    批量翻译与OpenAI翻译器走相同的并发/打包/限流/重试/对冲路径，
+    用于在不消耗API配额的情况下测试这些机制
+    """
+
+    supports_packing = True
+
+    def __init__(
+        self,
+        source_lang: str = "en",
+        target_lang: str = "zh",
+        latency: float = 0.05,
+        latency_per_token: float = 0.0,
+        distribution: str = "fixed",
+        spread: float = 0.5,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: Optional[int] = None,
+        max_concurrency: int = 8,
+        pack_tokens: int = 0,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        hedging: Optional[HedgingPolicy] = None,
+    ):
+        """
+        初始化模拟翻译器
+
+        Args:
+            source_lang: 源语言代码
+            target_lang: 目标语言代码
+            latency: 每个请求的基础延迟（秒）
+            latency_per_token: 每个输出token增加的延迟（秒）
+            distribution: 延迟分布 (fixed, uniform, exponential, lognormal)
+            spread: 分布参数，uniform为±比例，lognormal为sigma
+            error_rate: 返回500错误的概率
+            throttle_rate: 返回429限流的概率
+            retry_after: 429响应的Retry-After（秒）
+            seed: 随机种子
+            max_concurrency: 批量翻译时同时进行的最大请求数
+            pack_tokens: 打包翻译的原文token预算，0表示不打包
+            rate_limiter: 限流器
+            retry_policy: 请求重试策略
+            hedging: 慢请求对冲策略（仅批量翻译）
+        """
+        super().__init__(source_lang, target_lang, retry_policy, hedging)
+        self.model = "mock"
+        self.system_prompt = get_translation_prompt()
+        self.behavior = MockBehavior(
+            latency=latency,
+            latency_per_token=latency_per_token,
+            distribution=distribution,
+            spread=spread,
+            error_rate=error_rate,
+            throttle_rate=throttle_rate,
+            retry_after=retry_after,
+            seed=seed,
+        )
+        self.max_concurrency = max_concurrency
+        self.pack_tokens = pack_tokens
+        self.rate_limiter = rate_limiter
+
+    def _prepare(self, content: str):
+        """生成译文并抽取延迟和故障"""
+        output = pseudo_translate(content, self.target_lang)
+        delay = self.behavior.sample_latency(estimate_tokens(output))
+        failure = self.behavior.sample_failure()
+        return output, delay, failure
+
+    def _finish(self, system_prompt: str, content: str, output: str, failure: Optional[int]) -> str:
+        if failure is not None:
+            raise MockAPIError(failure, self.behavior.retry_after if failure == 429 else None)
+        self._record_usage({
+            "prompt_tokens": estimate_tokens(system_prompt) + estimate_tokens(content),
+            "completion_tokens": estimate_tokens(output),
+        })
+        return output
+
+    def _request(self, system_prompt: str, content: str) -> str:
+        """模拟一次同步请求"""
+        output, delay, failure = self._prepare(content)
+        time.sleep(delay)
+        return self._finish(system_prompt, content, output, failure)
+
+    async def _request_async(self, system_prompt: str, content: str) -> str:
+        """模拟一次异步请求"""
+        output, delay, failure = self._prepare(content)
+        await asyncio.sleep(delay)
+        return self._finish(system_prompt, content, output, failure)
+
+    async def _chat_async(self, system_prompt: str, content: str) -> str:
+        """发送模拟请求（经过限流、重试和对冲）"""
+        tokens = estimate_tokens(system_prompt) + 2 * estimate_tokens(content)
+        return await self._call_with_retry_async(
+            lambda: self._request_async(system_prompt, content),
+            self.rate_limiter,
+            tokens,
+        )
+
+    def _create_result(self, text: str, translated: str) -> TranslationResult:
+        return TranslationResult(
+            original=text,
+            translated=translated,
+            source_lang=self.source_lang,
+            target_lang=self.target_lang,
+        )
+
+    def translate(self, text: str) -> TranslationResult:
+        """
+        模拟翻译单段文本
+
+        Args:
+            text: 要翻译的文本
+
+        Returns:
+            翻译结果
+        """
+        if self._should_skip(text):
+            return self._create_skip_result(text)
+        translated = self._call_with_retry(lambda: self._request(self.system_prompt, text))
+        return self._create_result(text, translated)
+
+    async def translate_async(self, text: str) -> TranslationResult:
+        """模拟异步翻译单段文本"""
+        if self._should_skip(text):
+            return self._create_skip_result(text)
+        translated = await self._chat_async(self.system_prompt, text)
+        return self._create_result(text, translated)
+
+    def translate_batch(self, texts: List[str]) -> List[TranslationResult]:
+        """
+        批量翻译（asyncio并发，同时进行的请求数不超过max_concurrency）
+
+        Args:
+            texts: 文本列表
+
+        Returns:
+            翻译结果列表
+        """
+        if not texts:
+            return []
+        if self.pack_tokens > 0:
+            return self.translate_packed(texts, self.pack_tokens)
+        return self._run_async(self._translate_batch_async(texts, self.max_concurrency))
+
+
+class _MockAPIHandler(BaseHTTPRequestHandler):
+    """OpenAI兼容接口: GET /v1/models, POST /v1/chat/completions"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send_json(self, data, status: int = 200, headers: Optional[dict] = None) -> None:
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str, headers: Optional[dict] = None) -> None:
+        self._send_json({"error": {"message": message, "type": "mock_error", "code": status}}, status, headers)
+
+    def do_GET(self):
+        if self.path.rstrip("/") in ("/v1/models", "/models"):
+            self._send_json({"object": "list", "data": [{"id": "mock", "object": "model", "owned_by": "mock"}]})
+        else:
+            self._send_error(404, "not found")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        if self.path.rstrip("/") not in ("/v1/chat/completions", "/chat/completions"):
+            self._send_error(404, "not found")
+            return
+        try:
+            request = json.loads(body)
+            messages = request["messages"]
+        except (ValueError, KeyError, TypeError):
+            self._send_error(400, "invalid request")
+            return
+
+        server = self.server
+        with server.lock:
+            throttled = server.max_concurrency and server.in_flight >= server.max_concurrency
+            if not throttled:
+                server.in_flight += 1
+        if throttled:
+            self._send_error(429, "too many concurrent requests",
+                             {"Retry-After": str(server.behavior.retry_after)})
+            return
+
+        try:
+            system_prompt = "".join(m.get("content", "") for m in messages if m.get("role") == "system")
+            content = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+            output = pseudo_translate(content, server.target_lang)
+            time.sleep(server.behavior.sample_latency(estimate_tokens(output)))
+            failure = server.behavior.sample_failure()
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+        if failure == 429:
+            self._send_error(429, "rate limited", {"Retry-After": str(server.behavior.retry_after)})
+            return
+        if failure is not None:
+            self._send_error(failure, "injected error")
+            return
+
+        prompt_tokens = estimate_tokens(system_prompt) + estimate_tokens(content)
+        completion_tokens = estimate_tokens(output)
+        self._send_json({
+            "id": f"mock-{time.monotonic_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": output},
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+
+class _MockAPIServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # 压测时会有大量并发连接
+    request_queue_size = 1024
+
+
+def serve_mock_api(
+    behavior: MockBehavior,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    target_lang: str = "zh",
+    max_concurrency: int = 0,
+) -> None:
+    """
+    启动OpenAI兼容的模拟服务（阻塞直到中断）
+
+    Args:
+        behavior: 延迟分布与故障注入设置
+        host: 监听地址
+        port: 监听端口
+        target_lang: 伪译文使用的目标语言标记
+        max_concurrency: 同时处理的最大请求数，超出时返回429；0表示不限制
+    """
+    httpd = _MockAPIServer((host, port), _MockAPIHandler)
+    httpd.behavior = behavior
+    httpd.target_lang = target_lang
+    httpd.max_concurrency = max_concurrency
+    httpd.in_flight = 0
+    httpd.lock = threading.Lock()
+    logger.info(f"模拟翻译服务已启动: http://{host}:{port}/v1")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
@@ -7,6 +7,9 @@ from typing import List, Optional
 
 from .base import BaseTranslator, TranslationResult
 from .prompts import get_translation_prompt
+from .rate_limit import RateLimiter
+from .retry import HedgingPolicy, RetryPolicy
+from ..utils.text import estimate_tokens
 
 
 # 默认的学术翻译提示词（已优化）
@@ -19,6 +22,8 @@ class OpenAITranslator(BaseTranslator):
     使用GPT模型进行高质量学术翻译
     """
     
+    supports_packing = True
+    
     def __init__(
         self,
         source_lang: str = "en",
@@ -27,6 +32,11 @@ class OpenAITranslator(BaseTranslator):
         model: str = "gpt-4o",
         base_url: str = "https://api.openai.com/v1",
         system_prompt: Optional[str] = None,
+        max_concurrency: int = 8,
+        pack_tokens: int = 0,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        hedging: Optional[HedgingPolicy] = None,
     ):
         """
         初始化OpenAI翻译器
@@ -38,15 +48,25 @@ class OpenAITranslator(BaseTranslator):
             model: 使用的模型
             base_url: API基础URL
             system_prompt: 自定义系统提示词
+            max_concurrency: 批量翻译时同时进行的最大请求数
+            pack_tokens: 打包翻译的原文token预算，批量翻译时将连续短段落合并为
+                一次请求；0表示不打包
+            rate_limiter: 限流器，控制批量翻译的请求速率并处理429/503
+            retry_policy: 请求重试策略
+            hedging: 慢请求对冲策略（仅批量翻译）
         """
-        super().__init__(source_lang, target_lang)
+        super().__init__(source_lang, target_lang, retry_policy, hedging)
         self.api_key = api_key
         self.model = model
         self.base_url = base_url
         self.system_prompt = system_prompt or get_translation_prompt(
             target_lang=self._get_lang_name(target_lang)
         )
+        self.max_concurrency = max_concurrency
+        self.pack_tokens = pack_tokens
+        self.rate_limiter = rate_limiter
         self._client = None
+        self._async_client = None
     
     def _get_lang_name(self, code: str) -> str:
         """将语言代码转换为语言名称"""
@@ -67,14 +87,65 @@ class OpenAITranslator(BaseTranslator):
         if self._client is None:
             try:
                 from openai import OpenAI
+                kwargs = {}
+                if self.retry_policy is not None:
+                    # 由重试策略负责重试，避免与SDK内部重试叠加
+                    kwargs["max_retries"] = 0
                 self._client = OpenAI(
                     api_key=self.api_key,
                     base_url=self.base_url,
+                    **kwargs,
                 )
             except ImportError:
                 raise ImportError("请安装 openai: pip install openai")
         return self._client
     
+    @property
+    def async_client(self):
+        """延迟加载OpenAI异步客户端（用于并发批量翻译）"""
+        if self._async_client is None:
+            try:
+                from openai import AsyncOpenAI
+                kwargs = {}
+                if self.rate_limiter is not None or self.retry_policy is not None:
+                    # 由限流器和重试策略负责重试，避免SDK内部重试绕过限流
+                    kwargs["max_retries"] = 0
+                self._async_client = AsyncOpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    **kwargs,
+                )
+            except ImportError:
+                raise ImportError("请安装 openai: pip install openai")
+        return self._async_client
+    
+    def _build_messages(self, text: str, system_prompt: Optional[str] = None) -> List[dict]:
+        """构建对话消息"""
+        return [
+            {"role": "system", "content": system_prompt or self.system_prompt},
+            {"role": "user", "content": text},
+        ]
+    
+    async def _request_async(self, system_prompt: str, content: str) -> str:
+        """发送一次异步对话请求，返回模型输出文本"""
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=self._build_messages(content, system_prompt),
+            temperature=0.3,
+        )
+        self._record_usage(response.usage)
+        return response.choices[0].message.content.strip()
+    
+    async def _chat_async(self, system_prompt: str, content: str) -> str:
+        """发送异步对话请求（经过限流、重试和对冲）"""
+        # 预计消耗：提示词 + 原文 + 与原文相当的输出
+        tokens = estimate_tokens(system_prompt) + 2 * estimate_tokens(content)
+        return await self._call_with_retry_async(
+            lambda: self._request_async(system_prompt, content),
+            self.rate_limiter,
+            tokens,
+        )
+    
     def translate(self, text: str) -> TranslationResult:
         """
         使用OpenAI翻译文本
@@ -88,14 +159,12 @@ class OpenAITranslator(BaseTranslator):
         if self._should_skip(text):
             return self._create_skip_result(text)
         
-        response = self.client.chat.completions.create(
+        response = self._call_with_retry(lambda: self.client.chat.completions.create(
             model=self.model,
-            messages=[
-                {"role": "system", "content": self.system_prompt},
-                {"role": "user", "content": text},
-            ],
+            messages=self._build_messages(text),
             temperature=0.3,  # 翻译任务使用较低温度保证一致性
-        )
+        ))
+        self._record_usage(response.usage)
         
         translated = response.choices[0].message.content.strip()
         
@@ -106,9 +175,34 @@ class OpenAITranslator(BaseTranslator):
             target_lang=self.target_lang,
         )
     
+    async def translate_async(self, text: str) -> TranslationResult:
+        """
+        使用OpenAI异步客户端翻译文本
+        
+        Args:
+            text: 要翻译的文本
+        
+        Returns:
+            翻译结果
+        """
+        if self._should_skip(text):
+            return self._create_skip_result(text)
+        
+        translated = await self._chat_async(self.system_prompt, text)
+        
+        return TranslationResult(
+            original=text,
+            translated=translated,
+            source_lang=self.source_lang,
+            target_lang=self.target_lang,
+        )
+    
     def translate_batch(self, texts: List[str]) -> List[TranslationResult]:
         """
-        批量翻译（逐个调用，可以考虑使用异步优化）
+        批量翻译（asyncio并发，同时进行的请求数不超过max_concurrency）
+        
+        结果顺序与输入一致，单段翻译失败时该段返回原文并记录error。
+        设置了pack_tokens时，连续短段落会合并为一次请求。
         
         Args:
             texts: 文本列表
@@ -116,6 +210,18 @@ class OpenAITranslator(BaseTranslator):
         Returns:
             翻译结果列表
         """
-        # 对于需要高质量翻译的场景，逐个翻译以保证质量
-        # 如果需要加速，可以使用 asyncio 并发
-        return [self.translate(text) for text in texts]
+        if not texts:
+            return []
+        if self.pack_tokens > 0:
+            return self.translate_packed(texts, self.pack_tokens)
+        return self._run_async(self._translate_batch_async(texts, self.max_concurrency))
+    
+    def close(self) -> None:
+        """关闭客户端连接和事件循环"""
+        if self._async_client is not None:
+            self._run_async(self._async_client.close())
+            self._async_client = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+        super().close()
@@ -0,0 +1,169 @@
+"""
+多段打包翻译
+将连续的短段落按token预算合并为一次LLM请求，减少系统提示词的重复开销
+"""
+
+import asyncio
+import re
+from typing import TYPE_CHECKING, List, Optional
+
+from loguru import logger
+
+from .base import TranslationResult
+from .prompts import get_packed_translation_prompt
+from ..utils.text import estimate_tokens
+
+if TYPE_CHECKING:
+    from .base import BaseTranslator
+
+
+SEGMENT_MARKER = "<<<SEG {}>>>"
+SEGMENT_PATTERN = re.compile(r"^[ \t]*<<<\s*SEG\s+(\d+)\s*>>>[ \t]*\n?", re.MULTILINE)
+
+# 单次打包的最大段落数，段落过多时模型更容易漏段
+MAX_SEGMENTS_PER_REQUEST = 20
+
+
+def pack_texts(
+    texts: List[str],
+    token_budget: int,
+    max_segments: int = MAX_SEGMENTS_PER_REQUEST,
+) -> List[List[int]]:
+    """
+    将连续文本按token预算分组
+
+    Args:
+        texts: 文本列表
+        token_budget: 每组文本的token预算，超过预算的单段文本独占一组
+        max_segments: 每组最多包含的段落数
+
+    Returns:
+        分组后的下标列表，保持原顺序
+    """
+    groups: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+
+    for i, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if current and (
+            current_tokens + tokens > token_budget or len(current) >= max_segments
+        ):
+            groups.append(current)
+            current = []
+            current_tokens = 0
+        current.append(i)
+        current_tokens += tokens
+
+    if current:
+        groups.append(current)
+
+    return groups
+
+
+def build_packed_input(texts: List[str]) -> str:
+    """将多段文本拼接为带分段标记的请求内容"""
+    return "\n\n".join(
+        f"{SEGMENT_MARKER.format(n)}\n{text}" for n, text in enumerate(texts, start=1)
+    )
+
+
+def split_packed_output(output: str, count: int) -> Optional[List[str]]:
+    """
+    按分段标记拆分模型输出
+
+    Args:
+        output: 模型返回的完整文本
+        count: 期望的段落数
+
+    Returns:
+        每段的译文；标记缺失、重复或乱序时返回None
+    """
+    matches = list(SEGMENT_PATTERN.finditer(output))
+    if len(matches) != count:
+        return None
+    if [int(m.group(1)) for m in matches] != list(range(1, count + 1)):
+        return None
+    if output[:matches[0].start()].strip():
+        return None
+
+    segments = []
+    for m, next_m in zip(matches, matches[1:] + [None]):
+        end = next_m.start() if next_m else len(output)
+        segment = output[m.end():end].strip()
+        if not segment:
+            return None
+        segments.append(segment)
+    return segments
+
+
+async def translate_packed_async(
+    translator: "BaseTranslator",
+    texts: List[str],
+    token_budget: int,
+    max_concurrency: int,
+) -> List[TranslationResult]:
+    """
+    打包并发翻译
+
+    连续短段落合并为一次请求，拆分失败（段数不符等）时该组退回逐段翻译。
+    翻译器需要提供 system_prompt 属性和 _chat_async(system_prompt, content) 方法。
+
+    Args:
+        translator: LLM翻译器
+        texts: 文本列表
+        token_budget: 每次请求的原文token预算
+        max_concurrency: 同时进行的最大请求数
+
+    Returns:
+        与输入顺序一致的翻译结果
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    packed_prompt = get_packed_translation_prompt(translator.system_prompt)
+    results: List[Optional[TranslationResult]] = [None] * len(texts)
+
+    indices = []
+    for i, text in enumerate(texts):
+        if translator._should_skip(text):
+            results[i] = translator._create_skip_result(text)
+        else:
+            indices.append(i)
+
+    async def run_single(i: int) -> None:
+        async with semaphore:
+            try:
+                results[i] = await translator.translate_async(texts[i])
+            except Exception as e:
+                logger.warning(f"翻译失败: {e!r}")
+                results[i] = translator._create_error_result(texts[i], e)
+
+    async def run_group(group: List[int]) -> None:
+        if len(group) == 1:
+            await run_single(group[0])
+            return
+
+        batch = [texts[i] for i in group]
+        segments = None
+        async with semaphore:
+            try:
+                output = await translator._chat_async(packed_prompt, build_packed_input(batch))
+                segments = split_packed_output(output, len(batch))
+            except Exception as e:
+                logger.warning(f"打包翻译失败: {e!r}")
+
+        if segments is None:
+            logger.debug(f"打包翻译结果无法按段拆分，退回逐段翻译 ({len(batch)} 段)")
+            await asyncio.gather(*(run_single(i) for i in group))
+            return
+
+        for i, segment in zip(group, segments):
+            results[i] = TranslationResult(
+                original=texts[i],
+                translated=segment,
+                source_lang=translator.source_lang,
+                target_lang=translator.target_lang,
+            )
+
+    groups = pack_texts([texts[i] for i in indices], token_budget)
+    await asyncio.gather(*(run_group([indices[j] for j in group]) for group in groups))
+    return results
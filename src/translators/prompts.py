@@ -65,6 +65,52 @@ OPTIMIZED_ACADEMIC_PROMPT = """角色定位：顶尖英汉翻译专家与中文
 """
 
 
+# 多段打包翻译时追加到系统提示词后的格式要求
+PACKED_SEGMENTS_INSTRUCTION = """多段翻译格式要求
+
+本次输入包含多个独立段落，每段以一行 <<<SEG n>>> 标记开头（n为段落编号）。请逐段翻译，并严格遵守：
+
+- 原样输出每个 <<<SEG n>>> 标记，标记独占一行，编号和顺序保持不变。
+- 每个标记之后紧跟该段的译文，不要合并、拆分、遗漏或新增段落。
+- 标记之外不要输出任何其他内容。
+"""
+
+
+# 翻译前遮蔽公式、引用和链接时追加到系统提示词后的占位符要求
+PLACEHOLDER_INSTRUCTION = """占位符要求
+
+原文中形如 {{1}} 的占位符代表公式、文献引用或链接。请在译文的对应位置原样保留每个占位符，不要翻译、改写、合并或删除。
+"""
+
+
+def get_masked_translation_prompt(system_prompt: str) -> str:
+    """
+    获取遮蔽占位符时使用的系统提示词
+    
+    Args:
+        system_prompt: 当前使用的系统提示词（默认或用户配置的）
+    
+    Returns:
+        追加了占位符要求的提示词，已包含该要求时原样返回
+    """
+    if PLACEHOLDER_INSTRUCTION in system_prompt:
+        return system_prompt
+    return f"{system_prompt.rstrip()}\n\n{PLACEHOLDER_INSTRUCTION}"
+
+
+def get_packed_translation_prompt(system_prompt: str) -> str:
+    """
+    获取多段打包翻译使用的系统提示词
+    
+    Args:
+        system_prompt: 单段翻译使用的系统提示词
+    
+    Returns:
+        追加了分段格式要求的提示词
+    """
+    return f"{system_prompt.rstrip()}\n\n{PACKED_SEGMENTS_INSTRUCTION}"
+
+
 def get_translation_prompt(target_lang: str = "中文") -> str:
     """
     获取翻译提示词
@@ -0,0 +1,235 @@
+"""
+自适应限流
+按每分钟请求数/token数预算控制请求速率，并根据429/503响应自动调整并发数
+"""
+
+import asyncio
+import email.utils
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+# 视为限流/过载的HTTP状态码
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def get_status_code(error: BaseException) -> Optional[int]:
+    """从openai/httpx等异常中取出HTTP状态码"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """
+    从异常携带的响应头中解析Retry-After（秒）
+
+    支持 retry-after-ms、秒数和HTTP日期三种格式
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class TokenBucket:
+    """令牌桶，按每分钟配额匀速补充"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float) -> None:
+        """取出amount个令牌，不足时等待补充"""
+        amount = min(amount, self.capacity)
+        while True:
+            self._refill()
+            if self.level >= amount:
+                self.level -= amount
+                return
+            await asyncio.sleep((amount - self.level) / self.rate)
+
+
+class RateLimiter:
+    """
+    自适应限流器
+
+    - 每分钟请求数(RPM)和token数(TPM)预算，0表示不限制
+    - AIMD并发控制：遇到429/503时并发上限减半，连续成功后逐步加一
+    - 遵守Retry-After：限流期间暂停发出新请求
+    - 被限流的请求会自动重新排队，不会丢弃
+
+    同一限流器的异步方法需要在同一个事件循环中调用
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_throttle_retries: int = 8,
+    ):
+        """
+        初始化限流器
+
+        Args:
+            requests_per_minute: 每分钟请求数上限，0表示不限制
+            tokens_per_minute: 每分钟token数上限，0表示不限制
+            max_concurrency: 并发上限的最大值
+            min_concurrency: 并发上限的最小值
+            max_throttle_retries: 单个请求被限流后的最大重试次数
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.max_throttle_retries = max_throttle_retries
+
+        self._request_bucket = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+
+        self.concurrency_limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.throttled = 0
+
+        self._successes = 0
+        self._consecutive_throttles = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+        self._condition_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._condition_loop is not loop:
+            self._condition = asyncio.Condition()
+            self._condition_loop = loop
+        return self._condition
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """等待暂停期结束、并发槽位以及RPM/TPM预算"""
+        condition = self._get_condition()
+        while True:
+            # 限流暂停期间不占用并发槽位，暂停结束后按新的并发上限依次放行
+            delay = self._paused_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            async with condition:
+                if time.monotonic() < self._paused_until:
+                    continue
+                if self.in_flight < int(self.concurrency_limit):
+                    self.in_flight += 1
+                    break
+                await condition.wait()
+
+        try:
+            if self._request_bucket is not None:
+                await self._request_bucket.acquire(1)
+            if self._token_bucket is not None and tokens > 0:
+                await self._token_bucket.acquire(tokens)
+        except BaseException:
+            await self.release()
+            raise
+
+    async def release(self) -> None:
+        """释放并发槽位"""
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+    def on_success(self) -> None:
+        """请求成功：连续成功达到当前并发上限后，上限加一"""
+        self._consecutive_throttles = 0
+        self._successes += 1
+        if self._successes >= self.concurrency_limit and self.concurrency_limit < self.max_concurrency:
+            self.concurrency_limit = min(self.max_concurrency, self.concurrency_limit + 1)
+            self._successes = 0
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """请求被限流：并发上限减半，并暂停发出新请求"""
+        now = time.monotonic()
+        self.throttled += 1
+        self._successes = 0
+        self._consecutive_throttles += 1
+
+        # 同一波并发请求同时收到429时只减一次
+        if now - self._last_decrease >= 1.0:
+            self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit / 2)
+            self._last_decrease = now
+            logger.info(f"请求被限流，并发上限降为 {int(self.concurrency_limit)}")
+
+        if retry_after is None:
+            retry_after = min(60.0, 0.5 * 2 ** (self._consecutive_throttles - 1))
+        self._paused_until = max(self._paused_until, now + retry_after)
+
+    async def run(self, request: Callable[[], Awaitable[T]], tokens: int = 0) -> T:
+        """
+        在限流控制下执行请求，被限流时自动等待后重试
+
+        Args:
+            request: 返回协程的请求函数（每次重试重新调用）
+            tokens: 本次请求预计消耗的token数
+
+        Returns:
+            请求结果
+        """
+        attempt = 0
+        while True:
+            await self.acquire(tokens)
+            try:
+                result = await request()
+            except Exception as e:
+                await self.release()
+                if get_status_code(e) in THROTTLE_STATUS_CODES and attempt < self.max_throttle_retries:
+                    attempt += 1
+                    self.on_throttle(get_retry_after(e))
+                    continue
+                raise
+            except BaseException:
+                # 被取消（如对冲中落败的请求）时同样释放槽位
+                await self.release()
+                raise
+            await self.release()
+            self.on_success()
+            return result
+
+    def stats(self) -> dict:
+        """限流统计信息"""
+        return {
+            "concurrency_limit": int(self.concurrency_limit),
+            "in_flight": self.in_flight,
+            "throttled": self.throttled,
+        }
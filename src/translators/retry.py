@@ -0,0 +1,239 @@
+"""
+请求重试与对冲
+指数退避重试瞬时错误；对超过延迟阈值的慢请求发送副本，取先完成的结果
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, asdict, replace
+from typing import Awaitable, Callable, Iterable, Optional, Tuple, TypeVar
+
+from loguru import logger
+
+from .rate_limit import get_status_code, get_retry_after
+
+T = TypeVar("T")
+
+
+@dataclass
+class RequestStats:
+    """请求统计计数"""
+    retries: int = 0  # 重试次数
+    hedges: int = 0  # 发送对冲副本的次数
+    hedge_wins: int = 0  # 对冲副本先于原请求完成的次数
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _is_connection_error(error: BaseException) -> bool:
+    """判断是否为连接/超时等网络层错误"""
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    try:
+        import httpx
+        if isinstance(error, httpx.TransportError):
+            return True
+    except ImportError:
+        pass
+    try:
+        import openai
+        if isinstance(error, openai.APIConnectionError):
+            return True
+    except ImportError:
+        pass
+    return False
+
+
+@dataclass
+class RetryPolicy:
+    """
+    重试策略
+
+    对可重试的HTTP状态码和网络错误按指数退避重试，退避时间带随机抖动；
+    响应带有Retry-After时至少等待该时长
+    """
+    max_attempts: int = 3  # 总尝试次数（含首次）
+    base_delay: float = 1.0  # 首次重试的基础等待时间（秒）
+    max_delay: float = 30.0  # 单次等待时间上限（秒）
+    jitter: float = 0.5  # 抖动比例，实际等待时间在 [1-jitter, 1] 倍之间
+    retryable_status: Tuple[int, ...] = (408, 409, 429, 500, 502, 503, 504)
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """判断错误是否可以重试"""
+        status = get_status_code(error)
+        if status is None:
+            # Google API的异常使用code属性保存HTTP状态码
+            code = getattr(error, "code", None)
+            status = code if isinstance(code, int) else None
+        if status is not None:
+            return status in self.retryable_status
+        return _is_connection_error(error)
+
+    def excluding(self, statuses: Iterable[int]) -> "RetryPolicy":
+        """不再重试这些状态码的策略（如已由限流器重试的429/503）"""
+        statuses = set(statuses)
+        return replace(
+            self,
+            retryable_status=tuple(status for status in self.retryable_status if status not in statuses),
+        )
+
+    def get_delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """第attempt次重试前的等待时间（attempt从1开始）"""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay *= 1 - self.jitter * random.random()
+        retry_after = get_retry_after(error) if error is not None else None
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def call(self, fn: Callable[[], T], stats: Optional[RequestStats] = None) -> T:
+        """
+        同步执行并按策略重试
+
+        Args:
+            fn: 请求函数
+            stats: 请求统计
+
+        Returns:
+            请求结果
+        """
+        attempt = 1
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                if attempt >= self.max_attempts or not self.is_retryable(e):
+                    raise
+                delay = self.get_delay(attempt, e)
+                logger.debug(f"请求失败，{delay:.1f}秒后重试 ({attempt}/{self.max_attempts - 1}): {e!r}")
+                if stats is not None:
+                    stats.retries += 1
+                attempt += 1
+                time.sleep(delay)
+
+    async def call_async(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        stats: Optional[RequestStats] = None,
+    ) -> T:
+        """
+        异步执行并按策略重试
+
+        Args:
+            fn: 返回协程的请求函数（每次重试重新调用）
+            stats: 请求统计
+
+        Returns:
+            请求结果
+        """
+        attempt = 1
+        while True:
+            try:
+                return await fn()
+            except Exception as e:
+                if attempt >= self.max_attempts or not self.is_retryable(e):
+                    raise
+                delay = self.get_delay(attempt, e)
+                logger.debug(f"请求失败，{delay:.1f}秒后重试 ({attempt}/{self.max_attempts - 1}): {e!r}")
+                if stats is not None:
+                    stats.retries += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+
+
+class HedgingPolicy:
+    """
+    请求对冲
+
+    记录最近请求的延迟，请求耗时超过指定分位数（默认p95）仍未完成时，
+    再发送一个相同的请求，取先成功的结果并取消另一个
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        window: int = 200,
+        min_delay: float = 0.5,
+    ):
+        """
+        初始化对冲策略
+
+        Args:
+            percentile: 触发对冲的延迟分位数
+            min_samples: 样本数达到该值后才启用对冲
+            window: 参与统计的最近请求数
+            min_delay: 对冲阈值的下限（秒），避免对极快的请求也发送副本
+        """
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._latencies: deque = deque(maxlen=window)
+
+    def record(self, latency: float) -> None:
+        """记录一次成功请求的延迟"""
+        self._latencies.append(latency)
+
+    def threshold(self) -> Optional[float]:
+        """当前的对冲阈值（秒），样本不足时返回None"""
+        if len(self._latencies) < self.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile))
+        return max(self.min_delay, ordered[index])
+
+    async def call_async(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        stats: Optional[RequestStats] = None,
+        hedge_fn: Optional[Callable[[], Awaitable[T]]] = None,
+    ) -> T:
+        """
+        执行请求，超过阈值时发送对冲副本
+
+        Args:
+            fn: 返回协程的请求函数
+            stats: 请求统计
+            hedge_fn: 发送对冲副本的请求函数（如需要单独经过限流器），默认与fn相同
+
+        Returns:
+            先成功完成的请求结果
+        """
+        async def timed(hedge: bool) -> Tuple[T, bool]:
+            start = time.monotonic()
+            result = await (hedge_fn if hedge and hedge_fn is not None else fn)()
+            self.record(time.monotonic() - start)
+            return result, hedge
+
+        primary = asyncio.ensure_future(timed(False))
+        pending = {primary}
+        try:
+            threshold = self.threshold()
+            if threshold is None:
+                return (await primary)[0]
+
+            done, _ = await asyncio.wait(pending, timeout=threshold)
+            if done:
+                return primary.result()[0]
+
+            if stats is not None:
+                stats.hedges += 1
+            pending.add(asyncio.ensure_future(timed(True)))
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    result, hedge = task.result()
+                    if hedge and stats is not None:
+                        stats.hedge_wins += 1
+                    return result
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
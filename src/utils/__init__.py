@@ -2,6 +2,13 @@
 工具模块
 """
 
-from .text import clean_text, split_sentences
+from .text import (
+    clean_text, split_sentences, estimate_tokens, estimate_output_tokens,
+    detect_language, is_in_language,
+)
+from .metrics import Metrics
 
-__all__ = ["clean_text", "split_sentences"]
+__all__ = [
+    "clean_text", "split_sentences", "estimate_tokens", "estimate_output_tokens",
+    "detect_language", "is_in_language", "Metrics",
+]
@@ -0,0 +1,204 @@
+"""
+运行指标
+线程安全的计数器、仪表和直方图，可导出为JSON快照或Prometheus文本格式
+"""
+
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+# 默认直方图分桶（秒）
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+# 内置指标的说明
+METRIC_DESCRIPTIONS: Dict[str, str] = {
+    "requests_total": "Translation API requests sent, including retries and hedges",
+    "request_errors_total": "Translation API requests that raised an error",
+    "request_latency_seconds": "Latency of individual translation API requests",
+    "tokens_in_total": "Prompt tokens reported by the API usage field",
+    "tokens_out_total": "Completion tokens reported by the API usage field",
+    "cache_hits_total": "Paragraphs served from the translation cache",
+    "cache_misses_total": "Paragraphs not found in the translation cache",
+    "cache_hit_ratio": "Translation cache hit ratio since start",
+    "parse_seconds": "MinerU parse time per call",
+    "parse_seconds_per_page": "MinerU parse time divided by pages parsed",
+    "pages_parsed_total": "Pages parsed by MinerU (including parse cache hits)",
+    "pages_translated_total": "Pages fully translated and written in content_list mode",
+    "split_seconds": "Time to split markdown into paragraphs",
+    "translate_seconds": "Time to translate one markdown document or chunk",
+    "queue_wait_seconds": "Time parsed documents or chunks wait before translation",
+    "documents_total": "Documents translated",
+    "paragraphs_total": "Paragraphs that needed translation",
+    "paragraphs_translated_total": "Paragraphs translated by the backend",
+    "paragraphs_resumed_total": "Paragraphs restored from the checkpoint journal",
+    "paragraphs_reused_total": "Paragraphs reused from a previous run",
+    "paragraphs_failed_total": "Paragraphs left untranslated after errors",
+    "paragraphs_skipped_total": "Paragraphs in references, acknowledgements and other skipped sections",
+    "paragraphs_in_target_lang_total": "Paragraphs already in the target language, passed through untranslated",
+    "tables_translated_total": "Tables whose text cells were translated",
+    "table_cells_translated_total": "Unique table cells sent for translation in packed requests",
+    "masked_spans_total": "Inline math, citations and URLs replaced by placeholders before translation",
+    "masked_chars_total": "Characters kept out of translation requests by placeholders",
+    "mask_retries_total": "Paragraphs retranslated because placeholders were missing from the output",
+    "mask_fallbacks_total": "Paragraphs translated without masking after placeholder retries failed",
+    "bytes_written_total": "Bytes of markdown and images written to output",
+    "jobs_queued": "Jobs waiting in the translation service queue",
+}
+
+
+class Histogram:
+    """
+    直方图
+
+    按固定分桶累计计数（用于Prometheus导出），并保留最近的样本用于计算分位数
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, window: int = 2048):
+        self.buckets = tuple(sorted(buckets))
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._samples: deque = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self._samples.append(value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+    def quantile(self, q: float) -> Optional[float]:
+        """最近样本的分位数"""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def snapshot(self) -> dict:
+        if not self.count:
+            return {"count": 0, "sum": 0.0}
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6),
+            "min": round(self.min, 6),
+            "max": round(self.max, 6),
+            "p50": round(self.quantile(0.5), 6),
+            "p95": round(self.quantile(0.95), 6),
+            "p99": round(self.quantile(0.99), 6),
+        }
+
+
+class Metrics:
+    """
+    指标集合
+
+    - 计数器 (inc)：只增不减，如请求数、token数、写入字节数
+    - 仪表 (set)：当前值，如缓存命中率
+    - 直方图 (observe / timer)：耗时分布
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self.descriptions: Dict[str, str] = dict(METRIC_DESCRIPTIONS)
+        self.started = time.time()
+
+    def describe(self, name: str, description: str) -> None:
+        """设置指标说明（Prometheus导出时作为HELP）"""
+        self.descriptions[name] = description
+
+    def inc(self, name: str, value: float = 1) -> None:
+        """计数器增加value"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name: str, value: float) -> None:
+        """设置仪表的当前值"""
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe(self, name: str, value: float, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """记录一次直方图样本"""
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """记录代码块耗时（秒）到直方图"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def counter(self, name: str) -> float:
+        return self.counters.get(name, 0)
+
+    def snapshot(self) -> dict:
+        """当前全部指标"""
+        with self._lock:
+            return {
+                "uptime_seconds": round(time.time() - self.started, 3),
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "histograms": {name: h.snapshot() for name, h in self.histograms.items()},
+            }
+
+    def save(self, path: Union[str, Path]) -> None:
+        """以JSON格式保存快照"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self, prefix: str = "pdf_translator") -> str:
+        """导出为Prometheus文本格式"""
+        lines = []
+
+        def header(name: str, full_name: str, kind: str) -> None:
+            if name in self.descriptions:
+                lines.append(f"# HELP {full_name} {self.descriptions[name]}")
+            lines.append(f"# TYPE {full_name} {kind}")
+
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                full_name = f"{prefix}_{name}"
+                header(name, full_name, "counter")
+                lines.append(f"{full_name} {value}")
+
+            for name, value in sorted(self.gauges.items()):
+                full_name = f"{prefix}_{name}"
+                header(name, full_name, "gauge")
+                lines.append(f"{full_name} {value}")
+
+            for name, histogram in sorted(self.histograms.items()):
+                full_name = f"{prefix}_{name}"
+                header(name, full_name, "histogram")
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.bucket_counts):
+                    cumulative += count
+                    lines.append(f'{full_name}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f'{full_name}_bucket{{le="+Inf"}} {histogram.count}')
+                lines.append(f"{full_name}_sum {histogram.sum}")
+                lines.append(f"{full_name}_count {histogram.count}")
+
+        return "\n".join(lines) + "\n"
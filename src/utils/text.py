@@ -3,7 +3,7 @@
 """
 
 import re
-from typing import List
+from typing import List, Optional
 
 
 def clean_text(text: str) -> str:
@@ -45,6 +45,138 @@ def is_cjk_text(text: str) -> bool:
     return cjk_count > len(text) * 0.3
 
 
+# 拉丁字母语言的常见虚词，用于区分使用相同字母的语言
+LATIN_STOPWORDS = {
+    "en": frozenset(
+        "the and of to in is that for with as are by this be on which from we was were "
+        "these an or it not".split()
+    ),
+    "de": frozenset(
+        "der die das und ist nicht mit von zu den ein eine für auf dem des im wir sich "
+        "werden wurde sind auch".split()
+    ),
+    "fr": frozenset(
+        "le la les des et est une dans pour que qui du sur pas par au nous avec ce sont "
+        "été ont aux".split()
+    ),
+    "es": frozenset(
+        "el la los las y que en es un una por para con del se no al como más fue "
+        "son entre".split()
+    ),
+    "it": frozenset(
+        "il lo gli le di che è e un una per con del della sono non nel da si dei "
+        "nella anche".split()
+    ),
+    "pt": frozenset(
+        "o os as de que e é um uma para com não do da em no na dos das foi "
+        "são pelo".split()
+    ),
+}
+
+LATIN_WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+# 语言检测至少需要的字符数（汉字、字母等），更短的文本不做判断
+MIN_DETECT_LETTERS = 10
+
+# 主要文字系统至少占全部字符的比例，否则视为混排文本不做判断
+DOMINANT_SCRIPT_RATIO = 2 / 3
+
+
+def normalize_lang(code: str) -> str:
+    """语言代码规范化，如 zh-CN / zh_Hans -> zh"""
+    return code.lower().replace("_", "-").split("-")[0]
+
+
+def detect_language(text: str) -> Optional[str]:
+    """
+    快速检测文本的主要语言（纯本地规则，不依赖模型）
+    
+    先按字符所属的文字系统判断（汉字、假名、谚文、西里尔字母、阿拉伯字母、拉丁字母），
+    字符总数少于MIN_DETECT_LETTERS或没有一种文字系统占明显多数（混排的图表标题等）时
+    不做判断；拉丁字母文本再按常见虚词区分具体语言。
+    
+    Returns:
+        语言代码（zh/ja/ko/ru/ar/en/de/fr/es/it/pt），无法判断时返回None
+    """
+    han = kana = hangul = cyrillic = arabic = latin = 0
+    for c in text:
+        if c < '\u0080':
+            if c.isalpha():
+                latin += 1
+        elif '\u4e00' <= c <= '\u9fff' or '\u3400' <= c <= '\u4dbf':
+            han += 1
+        elif '\u3040' <= c <= '\u30ff':
+            kana += 1
+        elif '\uac00' <= c <= '\ud7af':
+            hangul += 1
+        elif '\u0400' <= c <= '\u04ff':
+            cyrillic += 1
+        elif '\u0600' <= c <= '\u06ff':
+            arabic += 1
+        elif c < '\u0250' and c.isalpha():
+            latin += 1
+    
+    ideographic = han + kana + hangul
+    total = ideographic + latin + cyrillic + arabic
+    if total < MIN_DETECT_LETTERS:
+        return None
+    
+    # 主要文字系统的字符数须达到总数的DOMINANT_SCRIPT_RATIO
+    script, count = max(
+        (("cjk", ideographic), ("latin", latin), ("ru", cyrillic), ("ar", arabic)),
+        key=lambda item: item[1],
+    )
+    if count < total * DOMINANT_SCRIPT_RATIO:
+        return None
+    if script == "cjk":
+        if kana * 10 >= han and kana > 0:
+            return "ja"
+        if hangul > han:
+            return "ko"
+        return "zh"
+    if script != "latin":
+        return script
+    
+    scores = dict.fromkeys(LATIN_STOPWORDS, 0)
+    for word in LATIN_WORD_PATTERN.findall(text.lower()):
+        for lang, stopwords in LATIN_STOPWORDS.items():
+            if word in stopwords:
+                scores[lang] += 1
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    if ranked[0][1] == 0 or ranked[0][1] == ranked[1][1]:
+        return None
+    return ranked[0][0]
+
+
+def is_in_language(text: str, lang: str, source_lang: Optional[str] = None) -> bool:
+    """
+    判断文本是否已经是指定语言
+    
+    Args:
+        text: 文本
+        lang: 语言代码（如目标语言）
+        source_lang: 源语言代码，与lang相同时总是返回False
+    
+    Returns:
+        检测到的语言与lang一致时返回True，无法判断时返回False
+    """
+    lang = normalize_lang(lang)
+    if source_lang is not None and normalize_lang(source_lang) == lang:
+        return False
+    return detect_language(text) == lang
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    粗略估算文本的token数（不依赖具体分词器）
+    
+    CJK字符约每字1个token，其余字符约每4个字符1个token
+    """
+    cjk_count = sum(1 for c in text if '\u4e00' <= c <= '\u9fff')
+    other_count = len(text) - cjk_count
+    return cjk_count + (other_count + 3) // 4
+
+
 def estimate_translation_length(
     text: str, 
     source_lang: str, 
@@ -73,3 +205,16 @@ def estimate_translation_length(
     }
     
     return length_ratios.get((source_lang, target_lang), 1.0)
+
+
+def estimate_output_tokens(text: str, source_lang: str, target_lang: str) -> int:
+    """
+    估算译文的token数
+    
+    按 estimate_translation_length 的长度比例推算译文字符数，
+    目标语言为中日韩时约每字1个token，其余约每4个字符1个token
+    """
+    chars = len(text) * estimate_translation_length(text, source_lang, target_lang)
+    if target_lang in ("zh", "ja", "ko"):
+        return int(chars + 0.5)
+    return int((chars + 3) // 4)
@@ -0,0 +1,82 @@
+"""
+批量处理测试
+"""
+
+import threading
+import time
+
+from src.pdf.batch import BatchProcessor
+from src.pdf.mineru_parser import ParsedDocument
+from src.pdf.processor import PDFProcessor
+from src.translators import MockTranslator
+
+
+class FakeParser:
+    """记录已解析文档数的解析器，可指定解析失败的文件"""
+
+    def __init__(self, fail: str = ""):
+        self.fail = fail
+        self.parsed = 0
+        self.lock = threading.Lock()
+
+    def parse_many(self, pdf_paths, output_dirs, page_ranges=None, batch_size=4, return_exceptions=False):
+        results = []
+        for path in pdf_paths:
+            with self.lock:
+                self.parsed += 1
+            if self.fail and path.endswith(self.fail):
+                results.append(RuntimeError("broken pdf"))
+            else:
+                results.append(ParsedDocument(f"Text of {path}.", None, None))
+        return results
+
+
+def make_pdfs(root, count):
+    root.mkdir()
+    for i in range(count):
+        (root / f"paper{i:02d}.pdf").write_bytes(b"%PDF")
+    return root
+
+
+def test_parsed_documents_are_bounded(tmp_path, monkeypatch):
+    source = make_pdfs(tmp_path / "in", 30)
+    parser = FakeParser(fail="paper05.pdf")
+    processor = PDFProcessor(MockTranslator(latency=0))
+    processor.parser = parser
+
+    translated = []
+    backlog = []
+    translate_parsed = PDFProcessor.translate_parsed
+
+    def slow_translate_parsed(self, input_path, parsed, md_output_path, resume=False, previous=None):
+        backlog.append(parser.parsed - len(translated))
+        time.sleep(0.01)
+        try:
+            return translate_parsed(self, input_path, parsed, md_output_path, resume, previous)
+        finally:
+            translated.append(input_path)
+
+    monkeypatch.setattr(PDFProcessor, "translate_parsed", slow_translate_parsed)
+    batch = BatchProcessor(processor, parse_workers=2, translate_workers=2, parse_batch_size=2)
+    summary = batch.run(str(source), str(tmp_path / "out"))
+
+    assert batch.max_parsed == 4
+    assert summary.count("done") == 29
+    assert summary.count("failed") == 1
+    # 解析远快于翻译，积压的文档数仍不超过上限（失败的文档立即归还名额）
+    assert max(backlog) <= batch.max_parsed + 1
+    assert (tmp_path / "out" / "batch_summary.json").exists()
+
+
+def test_group_larger_than_translate_workers_does_not_deadlock(tmp_path):
+    source = make_pdfs(tmp_path / "in", 9)
+    processor = PDFProcessor(MockTranslator(latency=0))
+    processor.parser = FakeParser()
+    batch = BatchProcessor(processor, parse_workers=3, translate_workers=1, parse_batch_size=4)
+    assert batch.max_parsed == 4
+
+    thread = threading.Thread(target=batch.run, args=(str(source), str(tmp_path / "out")), daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+    assert len(list((tmp_path / "out").rglob("*_translated.md"))) == 9
@@ -0,0 +1,33 @@
+"""
+翻译缓存测试
+"""
+
+from src.translators.cache import CachedTranslator, TranslationCache
+from src.translators.mock import MockTranslator
+
+
+def test_forget_removes_only_given_texts(tmp_path):
+    cache = TranslationCache(str(tmp_path / "cache.db"))
+    backend = MockTranslator(latency=0)
+    translator = CachedTranslator(backend, cache)
+    texts = ["First paragraph.", "Second paragraph.", "Third paragraph."]
+    try:
+        results = translator.translate_batch(texts)
+        assert [r.translated for r in results] == [f"[zh] {text}" for text in texts]
+        assert translator.is_cached(texts) == [True, True, True]
+        sent = backend.metrics.counter("requests_total")
+
+        translator.forget([texts[1]])
+        assert translator.is_cached(texts) == [True, False, True]
+        assert len(cache) == 2
+
+        # 只有被删除的文本重新请求翻译
+        results = translator.translate_batch(texts)
+        assert [r.translated for r in results] == [f"[zh] {text}" for text in texts]
+        assert backend.metrics.counter("requests_total") == sent + 1
+        assert translator.is_cached(texts) == [True, True, True]
+
+        translator.forget([])
+        assert len(cache) == 3
+    finally:
+        translator.close()
@@ -0,0 +1,25 @@
+"""
+配置测试
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from src.config import DEFAULT_SKIP_SECTIONS, Config
+
+
+def test_skip_sections_default():
+    config = Config()
+    assert config.pdf.skip_sections == list(DEFAULT_SKIP_SECTIONS)
+    config.pdf.skip_sections.append("Appendix")
+    assert "Appendix" not in Config().pdf.skip_sections
+
+
+def test_config_does_not_import_processing_stack():
+    code = "import sys, src.config; print(sorted(m for m in sys.modules if m.startswith('src.')))"
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parent.parent, capture_output=True, text=True, check=True,
+    ).stdout
+    assert output.strip() == "['src.config']"
@@ -0,0 +1,30 @@
+"""
+翻译预估测试
+"""
+
+from src.main import echo_estimate
+from src.pdf.estimate import TranslationEstimator
+from src.translators import MockTranslator
+
+TEXTS = ["The proposed method is evaluated on two datasets."] * 10
+
+
+def test_unpriced_estimate_says_price_is_not_configured(capsys):
+    estimate = TranslationEstimator(MockTranslator(latency=0)).estimate(TEXTS, ["[1] A. Ref."])
+    assert not estimate.priced
+    assert estimate.cost == 0
+    echo_estimate(estimate)
+    output = capsys.readouterr().out
+    assert "未配置价格" in output
+    assert "0.0000 USD" not in output
+
+
+def test_priced_estimate_reports_cost(capsys):
+    estimator = TranslationEstimator(MockTranslator(latency=0), input_price=2.5, output_price=10.0)
+    estimate = estimator.estimate(TEXTS)
+    assert estimate.priced
+    expected = estimate.input_tokens / 1e6 * 2.5 + estimate.output_tokens / 1e6 * 10.0
+    assert abs(estimate.cost - expected) < 1e-12
+    assert estimator.combine([estimate, estimate]).priced
+    echo_estimate(estimate)
+    assert f"预计费用: {estimate.cost:.4f} USD" in capsys.readouterr().out
@@ -0,0 +1,44 @@
+"""
+翻译检查点日志测试
+"""
+
+from src.pdf.journal import TranslationJournal, hash_paragraph, journal_meta
+from src.translators import CachedTranslator, MockTranslator
+from src.translators.cache import TranslationCache
+
+
+def write_journal(path, meta):
+    journal = TranslationJournal(str(path), meta=meta)
+    journal.open(resume=False)
+    journal.record("Hello world", "你好世界")
+    journal.close()
+
+
+def test_meta_matches_cache_key_inputs(tmp_path):
+    translator = MockTranslator(latency=0)
+    meta = journal_meta(translator)
+    assert meta["backend"] == "MockTranslator"
+    assert meta["model"] == "mock"
+    assert (meta["source_lang"], meta["target_lang"]) == ("en", "zh")
+
+    cache = TranslationCache(str(tmp_path / "cache.db"))
+    try:
+        assert journal_meta(CachedTranslator(translator, cache)) == meta
+    finally:
+        cache.close()
+
+
+def test_resume_ignores_journal_from_other_model_or_prompt(tmp_path):
+    translator = MockTranslator(latency=0)
+    path = tmp_path / "doc.journal.jsonl"
+    write_journal(path, journal_meta(translator))
+    assert TranslationJournal.read(str(path), journal_meta(translator)) == {
+        hash_paragraph("Hello world"): "你好世界",
+    }
+
+    translator.model = "other"
+    assert TranslationJournal.read(str(path), journal_meta(translator)) == {}
+
+    translator.model = "mock"
+    translator.system_prompt += "\n保持术语一致。"
+    assert TranslationJournal.read(str(path), journal_meta(translator)) == {}
@@ -0,0 +1,108 @@
+"""
+占位符遮蔽测试
+"""
+
+import random
+
+from src.pdf.masking import MaskedText, mask_text, strip_spans, unmask_text
+from src.pdf.processor import PDFProcessor
+from src.translators import CachedTranslator, MockTranslator, TranslationCache
+from src.translators.prompts import PLACEHOLDER_INSTRUCTION
+
+
+def test_roundtrip_restores_spans():
+    text = "The loss $\\mathcal{L}_{total}$ follows [12, 14-16], see https://example.com/paper."
+    masked = mask_text(text)
+    assert masked.spans == ["$\\mathcal{L}_{total}$", "[12, 14-16]", "https://example.com/paper"]
+    assert masked.text == "The loss {{1}} follows {{2}}, see {{3}}."
+    assert unmask_text(masked.text, masked) == text
+
+
+def test_translated_order_may_change():
+    masked = mask_text("Both $\\alpha + \\beta$ and $\\gamma + \\delta$ are learned.")
+    translated = "{{2}} 和 {{1}} 都是学习得到的。"
+    assert unmask_text(translated, masked) == "$\\gamma + \\delta$ 和 $\\alpha + \\beta$ 都是学习得到的。"
+
+
+def test_short_spans_are_kept():
+    masked = mask_text("as in [1] with $x$")
+    assert masked.spans == []
+    assert masked.text == "as in [1] with $x$"
+
+
+def test_trailing_punctuation_stays_outside_url():
+    masked = mask_text("Code: www.github.com/org/repository, and doi:10.1234/abcd.5678.")
+    assert masked.spans == ["www.github.com/org/repository", "doi:10.1234/abcd.5678"]
+    assert masked.text == "Code: {{1}}, and {{2}}."
+
+
+def test_escaped_dollar_is_not_formula():
+    masked = mask_text("costs \\$5 and \\$10 respectively")
+    assert masked.spans == []
+
+
+def test_currency_amounts_are_not_formulas():
+    text = "The kit costs $5 and the upgrade costs $10 per month."
+    masked = mask_text(text)
+    assert masked.spans == []
+    assert masked.text == text
+
+    masked = mask_text("Prices from $5, while $x^2 + y^2$ is a formula; $ a + b $ is not.")
+    assert masked.spans == ["$x^2 + y^2$"]
+
+
+def test_missing_or_unknown_placeholders():
+    masked = mask_text("See [12, 13] and $a^2 + b^2$.")
+    assert len(masked.spans) == 2
+    assert unmask_text("见 {{1}}。", masked) is None
+    assert unmask_text("见 {{1}} 和 {{2}} 及 {{3}}。", masked) is None
+    assert unmask_text("见 {{ 1 }} 和 {{2}}。", masked) == "见 [12, 13] 和 $a^2 + b^2$。"
+
+
+def test_existing_placeholders_are_not_masked():
+    text = "template {{1}} with [12, 13, 14]"
+    masked = mask_text(text)
+    assert masked == MaskedText(text)
+    assert unmask_text("模板 {{1}}", masked) == "模板 {{1}}"
+
+
+def test_translatable():
+    assert not mask_text("[12, 13] $a^2 + b^2$").translatable
+    assert mask_text("see [12, 13]").translatable
+
+
+def test_strip_spans():
+    assert strip_spans("$x^2 + y^2$ [1, 2]").split() == []
+
+
+def test_random_roundtrip():
+    pieces = [
+        "word", "文字", "$x$", "$a + b = c$", "[1]", "[12, 13]", "[1-5]", "https://a.io/x",
+        "doi:10.1000/xyz123", "\\$", ",", ".", " ", "  ", "$$E = mc^2$$", "(see)",
+    ]
+    rng = random.Random(3)
+    for _ in range(2000):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 20)))
+        masked = mask_text(text)
+        assert unmask_text(masked.text, masked) == text, repr(text)
+
+
+def test_placeholder_instruction_added_to_custom_prompt(tmp_path):
+    translator = MockTranslator(latency=0)
+    translator.system_prompt = "Translate into Chinese."
+    PDFProcessor(translator)
+    PDFProcessor(translator)
+    assert translator.system_prompt.startswith("Translate into Chinese.")
+    assert translator.system_prompt.count(PLACEHOLDER_INSTRUCTION) == 1
+
+    cache = TranslationCache(str(tmp_path / "cache.db"))
+    try:
+        inner = MockTranslator(latency=0)
+        PDFProcessor(CachedTranslator(inner, cache))
+        assert PLACEHOLDER_INSTRUCTION in inner.system_prompt
+    finally:
+        cache.close()
+
+    unmasked = MockTranslator(latency=0)
+    PDFProcessor(unmasked, mask_spans=False)
+    assert PLACEHOLDER_INSTRUCTION not in unmasked.system_prompt
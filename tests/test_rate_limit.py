@@ -0,0 +1,152 @@
+"""
+自适应限流测试
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.translators.rate_limit import RateLimiter, TokenBucket, get_retry_after, get_status_code
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(status_code)
+        self.response = FakeResponse(status_code, headers)
+
+
+def test_status_code_and_retry_after():
+    assert get_status_code(HTTPError(429)) == 429
+    assert get_status_code(ValueError()) is None
+    assert get_retry_after(HTTPError(429, {"retry-after": "2"})) == 2.0
+    assert get_retry_after(HTTPError(429, {"retry-after-ms": "250", "retry-after": "9"})) == 0.25
+    assert 0 < get_retry_after(HTTPError(429, {
+        "retry-after": time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 30)),
+    })) <= 30
+    assert get_retry_after(HTTPError(429, {"retry-after": "soon"})) is None
+    assert get_retry_after(HTTPError(429)) is None
+
+
+def test_concurrency_never_exceeds_limit():
+    limiter = RateLimiter(max_concurrency=3)
+    active = []
+    peak = []
+
+    async def request():
+        active.append(1)
+        peak.append(len(active))
+        await asyncio.sleep(0.005)
+        active.pop()
+        return True
+
+    async def main():
+        return await asyncio.gather(*(limiter.run(request) for _ in range(20)))
+
+    assert all(asyncio.run(main()))
+    assert max(peak) == 3
+    assert limiter.in_flight == 0
+
+
+def test_throttled_request_waits_and_retries():
+    limiter = RateLimiter(max_concurrency=8, max_throttle_retries=3)
+    calls = []
+
+    async def request():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            raise HTTPError(429, {"retry-after": "0.1"})
+        return "ok"
+
+    assert asyncio.run(limiter.run(request)) == "ok"
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.09
+    assert limiter.throttled == 1
+    assert limiter.concurrency_limit == 4
+    assert limiter.in_flight == 0
+
+
+def test_throttle_retries_are_bounded():
+    limiter = RateLimiter(max_throttle_retries=2)
+    calls = []
+
+    async def request():
+        calls.append(1)
+        raise HTTPError(503, {"retry-after": "0"})
+
+    with pytest.raises(HTTPError):
+        asyncio.run(limiter.run(request))
+    assert len(calls) == 3
+    assert limiter.in_flight == 0
+
+
+def test_other_errors_are_not_retried():
+    limiter = RateLimiter()
+    calls = []
+
+    async def request():
+        calls.append(1)
+        raise HTTPError(500)
+
+    with pytest.raises(HTTPError):
+        asyncio.run(limiter.run(request))
+    assert len(calls) == 1
+    assert limiter.throttled == 0
+    assert limiter.in_flight == 0
+
+
+def test_cancelled_request_releases_slot():
+    limiter = RateLimiter(max_concurrency=1)
+
+    async def main():
+        task = asyncio.ensure_future(limiter.run(lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0.01)
+        assert limiter.in_flight == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert limiter.in_flight == 0
+
+        async def quick():
+            return "next"
+        return await asyncio.wait_for(limiter.run(quick), timeout=1)
+
+    assert asyncio.run(main()) == "next"
+
+
+def test_concurrency_recovers_after_successes():
+    limiter = RateLimiter(max_concurrency=4)
+    limiter.on_throttle(retry_after=0)
+    assert limiter.concurrency_limit == 2
+    for _ in range(2):
+        limiter.on_success()
+    assert limiter.concurrency_limit == 3
+
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(600)  # 每秒补充10个
+    bucket.level = 0
+
+    async def main():
+        start = time.monotonic()
+        await bucket.acquire(1)
+        return time.monotonic() - start
+
+    assert 0.08 <= asyncio.run(main()) < 1.0
+
+
+def test_tokens_per_minute_budget_is_charged():
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=6000)
+
+    async def request():
+        return 1
+
+    asyncio.run(limiter.run(request, tokens=1000))
+    assert round(limiter._request_bucket.level) == 599
+    assert round(limiter._token_bucket.level) == 5000
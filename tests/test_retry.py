@@ -0,0 +1,136 @@
+"""
+重试与对冲测试
+"""
+
+import asyncio
+
+import pytest
+
+from src.translators.mock import MockAPIError, MockTranslator
+from src.translators.rate_limit import THROTTLE_STATUS_CODES, RateLimiter
+from src.translators.retry import HedgingPolicy, RequestStats, RetryPolicy
+
+
+def failing(status_code, failures):
+    """前failures次调用抛出指定状态码的错误"""
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise MockAPIError(status_code, retry_after=0)
+        return "ok"
+
+    return fn, calls
+
+
+def test_excluding_returns_new_policy():
+    policy = RetryPolicy()
+    narrowed = policy.excluding(THROTTLE_STATUS_CODES)
+    assert 429 not in narrowed.retryable_status
+    assert 503 not in narrowed.retryable_status
+    assert set(narrowed.retryable_status) == set(policy.retryable_status) - {429, 503}
+    assert 429 in policy.retryable_status
+    assert not narrowed.is_retryable(MockAPIError(429))
+    assert narrowed.is_retryable(MockAPIError(500))
+
+
+def test_call_retries_up_to_max_attempts():
+    policy = RetryPolicy(max_attempts=3, base_delay=0, jitter=0)
+    stats = RequestStats()
+
+    fn, calls = failing(500, failures=2)
+    assert policy.call(fn, stats) == "ok"
+    assert len(calls) == 3
+    assert stats.retries == 2
+
+    fn, calls = failing(500, failures=3)
+    with pytest.raises(MockAPIError):
+        policy.call(fn)
+    assert len(calls) == 3
+
+
+def test_call_does_not_retry_client_errors():
+    policy = RetryPolicy(base_delay=0)
+    fn, calls = failing(400, failures=1)
+    with pytest.raises(MockAPIError):
+        policy.call(fn)
+    assert len(calls) == 1
+
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError):
+        policy.call(broken)
+    assert len(calls) == 1
+
+
+def test_call_async_retries():
+    policy = RetryPolicy(max_attempts=3, base_delay=0, jitter=0)
+    fn, calls = failing(502, failures=2)
+
+    async def request():
+        return fn()
+
+    assert asyncio.run(policy.call_async(request)) == "ok"
+    assert len(calls) == 3
+
+
+def _translator(**kwargs) -> MockTranslator:
+    return MockTranslator(latency=0, retry_policy=RetryPolicy(max_attempts=3, base_delay=0, jitter=0), **kwargs)
+
+
+def test_throttle_retries_are_not_multiplied():
+    """429由限流器重试，重试策略不再叠加重试"""
+    translator = _translator()
+    limiter = RateLimiter(max_throttle_retries=2)
+    fn, calls = failing(429, failures=100)
+
+    async def request():
+        return fn()
+
+    with pytest.raises(MockAPIError):
+        asyncio.run(translator._call_with_retry_async(request, limiter))
+    assert len(calls) == 3
+    assert limiter.in_flight == 0
+
+
+def test_server_errors_are_retried_with_limiter():
+    translator = _translator()
+    limiter = RateLimiter()
+    fn, calls = failing(500, failures=100)
+
+    async def request():
+        return fn()
+
+    with pytest.raises(MockAPIError):
+        asyncio.run(translator._call_with_retry_async(request, limiter))
+    assert len(calls) == 3
+    assert limiter.throttled == 0
+    assert limiter.in_flight == 0
+
+
+def test_hedge_goes_through_limiter():
+    hedging = HedgingPolicy(min_samples=1, min_delay=0.01)
+    hedging.record(0.01)
+    translator = MockTranslator(latency=0, hedging=hedging)
+    limiter = RateLimiter(requests_per_minute=600)
+    calls = []
+
+    async def request():
+        calls.append(1)
+        if len(calls) == 1:
+            await asyncio.sleep(0.2)
+            return "slow"
+        return "fast"
+
+    assert asyncio.run(translator._call_with_retry_async(request, limiter)) == "fast"
+    assert len(calls) == 2
+    assert translator.request_stats.hedges == 1
+    assert translator.request_stats.hedge_wins == 1
+    # 原请求和对冲副本各占用一次RPM预算
+    assert limiter._request_bucket.level < 599
+    assert limiter.in_flight == 0
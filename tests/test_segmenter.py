@@ -0,0 +1,140 @@
+"""
+Markdown分段测试
+
+split_markdown 替换了原先逐行构建段落字典的实现（_split_into_paragraphs），
+重建后的文档必须与旧实现逐字节一致。旧实现保留在本文件中作为对照。
+"""
+
+import random
+import re
+
+import pytest
+
+from src.pdf.segmenter import BLANK, TABLE, TEXT, should_translate, split_markdown
+
+
+def reference_split(markdown: str) -> list:
+    """旧实现：逐行扫描，返回 {text, translatable} 列表"""
+    paragraphs = []
+    current = []
+    in_code = False
+
+    def flush(translatable: bool = True) -> None:
+        if current:
+            paragraphs.append({'text': '\n'.join(current), 'translatable': translatable})
+            current.clear()
+
+    for line in markdown.split('\n'):
+        stripped = line.strip()
+        if stripped.startswith('```'):
+            flush(not in_code)
+            in_code = not in_code
+            paragraphs.append({'text': line, 'translatable': False})
+        elif in_code:
+            paragraphs.append({'text': line, 'translatable': False})
+        elif (
+            stripped.startswith(('|', '<table', '$'))
+            or re.match(r'^\s*!\[.*\]\(.*\)\s*$', line)
+        ):
+            flush()
+            paragraphs.append({'text': line, 'translatable': False})
+        elif not stripped:
+            flush()
+            paragraphs.append({'text': '', 'translatable': False})
+        else:
+            current.append(line)
+    flush()
+    return paragraphs
+
+
+def translate(text: str) -> str:
+    return f"<<{text.upper()}>>"
+
+
+def reference_rebuild(markdown: str) -> str:
+    """旧实现的重建：需要翻译的段落替换为译文，其余原样，按行拼接"""
+    return '\n'.join(
+        translate(para['text']) if para['translatable'] and should_translate(para['text']) else para['text']
+        for para in reference_split(markdown)
+    )
+
+
+def rebuild(markdown: str) -> str:
+    """新实现的重建：段落之间的原文保留，空白行清空"""
+    parts = []
+    position = 0
+    for para in split_markdown(markdown):
+        if para.translate:
+            replacement = translate(para.text(markdown))
+        elif para.kind == BLANK:
+            replacement = ''
+        else:
+            continue
+        parts.append(markdown[position:para.start])
+        parts.append(replacement)
+        position = para.end
+    parts.append(markdown[position:])
+    return ''.join(parts)
+
+
+EDGE_CASE = (
+    "# Title\n\nSome text here\nsecond line\n```python\ncode line\n| not table\n```\n"
+    "| a | b |\n|---|---|\n  ![img](x.png)  \n![img](x.png) caption\n$$\nx=1\n$$\n"
+    "$inline start\ntext after formula\n\n\n#\nfoo\n# \n## References\n[1] A. ref\n\n"
+    "[2] B ref\n# Next\n12.3\nab\n  \t \n<table><tr></tr></table>\n###### six\n"
+    "####### seven\nREFERENCES\n\ntext\r\nmore\r\n\r\nend"
+)
+
+PIECES = [
+    "  ```py", "\t|x", " <table>", "![a](b)  ", "![a](b) c", "\r", "$", "# H", "## References",
+    "text line", "", "```", "| t", "$x$", "![a](b)", "  ", "Acknowledgements", "#", "# ", "12",
+    "more text\r", "x",
+]
+
+
+def random_documents(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "\n".join(rng.choice(PIECES) for _ in range(rng.randint(0, 30)))
+
+
+@pytest.mark.parametrize("markdown", [
+    "",
+    "\n\n",
+    "```\nunclosed\ncode",
+    EDGE_CASE,
+    EDGE_CASE + "\n",
+])
+def test_edge_cases_match_reference(markdown):
+    assert rebuild(markdown) == reference_rebuild(markdown)
+
+
+def test_random_documents_match_reference():
+    for markdown in random_documents(2000):
+        assert rebuild(markdown) == reference_rebuild(markdown), repr(markdown)
+
+
+def test_translatable_paragraphs_match_reference():
+    for markdown in random_documents(500, seed=2):
+        expected = [
+            para['text'] for para in reference_split(markdown)
+            if para['translatable'] and should_translate(para['text'])
+        ]
+        actual = [para.text(markdown) for para in split_markdown(markdown) if para.translate]
+        assert actual == expected, repr(markdown)
+
+
+def test_paragraph_kinds_and_levels():
+    markdown = "## Methods\nbody\n\n| a | b |\n|---|---|\n\n  \ntext"
+    paragraphs = split_markdown(markdown)
+    assert [(para.kind, para.level) for para in paragraphs] == [
+        (TEXT, 2), (TABLE, 0), (BLANK, 0), (TEXT, 0),
+    ]
+    assert paragraphs[0].text(markdown) == "## Methods\nbody"
+    assert paragraphs[1].text(markdown) == "| a | b |\n|---|---|"
+
+
+def test_table_lines_inside_code_are_not_tables():
+    markdown = "```\n| a |\n```\n| b |"
+    tables = [para.text(markdown) for para in split_markdown(markdown) if para.kind == TABLE]
+    assert tables == ["| b |"]
@@ -0,0 +1,67 @@
+"""
+翻译服务任务清理测试
+"""
+
+import os
+import time
+from pathlib import Path
+
+from src.pdf.processor import ProcessReport
+from src.server import TranslationService
+
+
+class FakeWorker:
+    bilingual = False
+    progress_callback = None
+
+    def __init__(self):
+        self.report = ProcessReport()
+
+    def process(self, input_path, output_path, pages=None):
+        return str(Path(output_path) / "out.md")
+
+
+class FakeProcessor:
+    def spawn(self):
+        return FakeWorker()
+
+
+def wait_finished(job):
+    deadline = time.monotonic() + 5
+    while job.status != "done":
+        assert time.monotonic() < deadline, "job did not finish"
+        time.sleep(0.01)
+
+
+def test_keeps_at_most_max_jobs(tmp_path):
+    service = TranslationService(FakeProcessor(), str(tmp_path), max_jobs=2)
+    jobs = [service.submit("paper.pdf", b"%PDF") for _ in range(4)]
+    for job in jobs:
+        wait_finished(job)
+    service._evict()
+    assert sorted(service.jobs) == sorted(job.id for job in jobs[2:])
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(service.jobs)
+
+
+def test_expired_jobs_and_stale_dirs_are_removed(tmp_path):
+    stale = tmp_path / "0123456789ab"
+    stale.mkdir()
+    other = tmp_path / "keep-me"
+    other.mkdir()
+    old = time.time() - 7200
+    for path in (stale, other):
+        os.utime(path, (old, old))
+
+    service = TranslationService(FakeProcessor(), str(tmp_path), job_ttl=3600)
+    assert not stale.exists()
+    assert other.exists()
+
+    job = service.submit("paper.pdf", b"%PDF")
+    wait_finished(job)
+    service._evict()
+    assert job.id in service.jobs
+
+    job.finished_at -= 7200
+    service._evict()
+    assert job.id not in service.jobs
+    assert not (tmp_path / job.id).exists()
@@ -0,0 +1,160 @@
+"""
+流式处理测试：按页分块解析与翻译重叠进行
+"""
+
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from src.pdf.mineru_parser import MineruParser, ParsedDocument
+from src.pdf.processor import PDFProcessor
+from src.translators import MockTranslator
+
+
+class FakeParser:
+    """按页生成Markdown的解析器，记录每次请求的页码范围 [start_page, end_page)"""
+
+    def __init__(self, page_count: int, fail_at: int = -1, delay: float = 0.0):
+        self.page_count = page_count
+        self.fail_at = fail_at
+        self.delay = delay
+        self.calls = []
+        self.on_parse = None
+
+    def get_page_count(self, pdf_path: str) -> int:
+        return self.page_count
+
+    def parse_pdf(self, pdf_path, output_dir=None, start_page=0, end_page=None):
+        end_page = self.page_count if end_page is None else end_page
+        if self.on_parse is not None:
+            self.on_parse(len(self.calls))
+        self.calls.append((start_page, end_page))
+        if len(self.calls) - 1 == self.fail_at:
+            raise RuntimeError("parse failed")
+        time.sleep(self.delay)
+        markdown = "\n\n".join(f"Page {page} has some text." for page in range(start_page, end_page))
+        return ParsedDocument(markdown_content=markdown, images_dir=None, content_list=None)
+
+
+def make_processor(parser: FakeParser, chunk_pages: int, queue_size: int = 2) -> PDFProcessor:
+    processor = PDFProcessor(
+        MockTranslator(latency=0),
+        stream_chunk_pages=chunk_pages,
+        stream_queue_size=queue_size,
+    )
+    processor.parser = parser
+    return processor
+
+
+def requested_pages(calls):
+    return [page for start, end in calls for page in range(start, end)]
+
+
+@pytest.mark.parametrize("page_count, chunk_pages, pages", [
+    (16, 8, None),
+    (17, 4, None),
+    (5, 8, None),
+    (20, 3, [4, 5, 6, 7, 8, 9, 10]),
+])
+def test_every_page_is_parsed_and_written_once(tmp_path, page_count, chunk_pages, pages):
+    parser = FakeParser(page_count)
+    with make_processor(parser, chunk_pages) as processor:
+        output = processor.process(str(tmp_path / "paper.pdf"), str(tmp_path / "out"), pages=pages)
+
+    expected = list(range(min(pages), max(pages) + 1)) if pages else list(range(page_count))
+    assert requested_pages(parser.calls) == expected
+    assert all(end - start <= chunk_pages for start, end in parser.calls)
+
+    markdown = open(output, encoding="utf-8").read()
+    for page in range(page_count):
+        assert markdown.count(f"[zh] Page {page} has") == (page in expected), page
+    assert processor.metrics.counter("pages_parsed_total") == len(expected)
+
+
+def test_parsing_stays_bounded_ahead_of_translation(tmp_path):
+    parser = FakeParser(12)
+    processor = make_processor(parser, chunk_pages=1, queue_size=1)
+    started = []
+    ahead = []
+    parser.on_parse = lambda index: ahead.append(index - len(started))
+
+    iter_translated = processor._iter_translated
+
+    def slow_iter_translated(parsed, continuation=False):
+        started.append(parsed)
+        time.sleep(0.02)
+        return iter_translated(parsed, continuation)
+
+    processor._iter_translated = slow_iter_translated
+    with processor:
+        processor.process(str(tmp_path / "paper.pdf"), str(tmp_path / "out"))
+
+    assert len(started) == 12
+    # 解析线程最多领先：队列中的1块 + 正在等待放入队列的1块
+    assert max(ahead) <= 2
+    assert max(ahead) >= 1
+
+
+def test_parse_error_stops_and_keeps_partial(tmp_path):
+    parser = FakeParser(12, fail_at=2)
+    with make_processor(parser, chunk_pages=2) as processor:
+        with pytest.raises(RuntimeError, match="parse failed"):
+            processor.process(str(tmp_path / "paper.pdf"), str(tmp_path / "out"))
+
+    assert len(parser.calls) == 3
+    outputs = list((tmp_path / "out").rglob("*_translated.md*"))
+    assert [path.suffix for path in outputs] == [".partial"]
+    assert "[zh] Page 3 has" in outputs[0].read_text(encoding="utf-8")
+
+
+def test_translation_error_stops_parser(tmp_path):
+    parser = FakeParser(40, delay=0.01)
+    processor = make_processor(parser, chunk_pages=1, queue_size=1)
+    iter_translated = processor._iter_translated
+    count = []
+
+    def failing_iter_translated(parsed, continuation=False):
+        count.append(parsed)
+        if len(count) == 2:
+            raise ValueError("translate failed")
+        return iter_translated(parsed, continuation)
+
+    processor._iter_translated = failing_iter_translated
+    with processor:
+        with pytest.raises(ValueError):
+            processor.process(str(tmp_path / "paper.pdf"), str(tmp_path / "out"))
+    assert len(parser.calls) < 40
+
+
+def test_parser_converts_to_inclusive_mineru_end_page(monkeypatch):
+    calls = []
+    common = types.ModuleType("mineru.cli.common")
+    common.convert_pdf_bytes_to_bytes_by_pypdfium2 = lambda data, start, end: calls.append((start, end)) or data
+    monkeypatch.setitem(sys.modules, "mineru", types.ModuleType("mineru"))
+    monkeypatch.setitem(sys.modules, "mineru.cli", types.ModuleType("mineru.cli"))
+    monkeypatch.setitem(sys.modules, "mineru.cli.common", common)
+
+    MineruParser._slice_pages(b"pdf", 8, 16)
+    MineruParser._slice_pages(b"pdf", 0, None)
+    assert calls == [(8, 15), (0, None)]
+
+
+@pytest.mark.parametrize("pages, expected", [
+    (None, (0, None)),
+    ([0], (0, 1)),
+    ([2, 3, 4], (2, 5)),
+    ([7, 3], (3, 8)),
+])
+def test_page_range_is_end_exclusive(pages, expected):
+    assert PDFProcessor._page_range(pages) == expected
+
+
+def test_parse_requests_selected_pages_only(tmp_path):
+    parser = FakeParser(10)
+    with make_processor(parser, chunk_pages=0) as processor:
+        processor.parse(str(tmp_path / "paper.pdf"), str(tmp_path / "out"), pages=[2, 3, 4])
+    assert requested_pages(parser.calls) == [2, 3, 4]
+    assert processor.metrics.counter("pages_parsed_total") == 3
@@ -0,0 +1,68 @@
+"""
+表格单元格提取与写回测试
+"""
+
+from src.pdf.tables import extract_cells, fill_cells, is_translatable_cell
+
+
+def texts(table: str) -> list:
+    return [text for _, _, text in extract_cells(table)]
+
+
+def test_pipe_table_skips_separator_and_numbers():
+    table = "| Method | Accuracy |\n|:---|---:|\n| Baseline model | 0.91 |\n| - | 12.5% |"
+    assert texts(table) == ["Method", "Accuracy", "Baseline model"]
+
+
+def test_cell_positions_point_into_table():
+    table = "| Method | Accuracy |\n|---|---|\n|  Our model  | 0.95 |"
+    for start, end, text in extract_cells(table):
+        assert table[start:end] == text
+
+
+def test_escaped_pipe_is_not_a_separator():
+    assert texts("| a \\| b text | other |") == ["a \\| b text", "other"]
+
+
+def test_html_cells():
+    table = '<table><tr><th colspan="2">Age &amp; sex</th><td>12</td></tr><tr><td> Male </td></tr></table>'
+    assert texts(table) == ["Age & sex", "Male"]
+
+
+def test_html_cells_with_nested_tags_are_skipped():
+    assert texts("<table><tr><td><b>Bold</b></td><td>Plain</td></tr></table>") == ["Plain"]
+
+
+def test_is_translatable_cell():
+    assert is_translatable_cell("Sex (M:F)")
+    assert not is_translatable_cell("x")
+    assert not is_translatable_cell("40.23 ± 11.85")
+    assert not is_translatable_cell("$\\alpha + \\beta$")
+    assert not is_translatable_cell("[12, 13]")
+
+
+def test_fill_pipe_table_escapes_pipes_and_newlines():
+    table = "| Method | Accuracy |\n|---|---|\n| Baseline | 0.91 |"
+    cells = extract_cells(table)
+    filled = fill_cells(table, cells, {"Method": "方法|名称", "Baseline": "基线\n模型"})
+    assert filled == "| 方法\\|名称 | Accuracy |\n|---|---|\n| 基线 模型 | 0.91 |"
+
+
+def test_fill_html_table_escapes_entities():
+    table = '<table><tr><td class="x">Age &amp; sex</td><td>Count</td></tr></table>'
+    filled = fill_cells(table, extract_cells(table), {"Age & sex": "年龄<和>性别 & 其他"})
+    assert filled == '<table><tr><td class="x">年龄&lt;和&gt;性别 &amp; 其他</td><td>Count</td></tr></table>'
+
+
+def test_fill_preserves_structure():
+    table = (
+        "| Name | Value |\n| :-- | --: |\n| Total | 12 |\n"
+        "<table><tr><td rowspan=\"2\">Group</td><td>1.0</td></tr></table>"
+    )
+    cells = extract_cells(table)
+    filled = fill_cells(table, cells, {text: text.upper() for _, _, text in cells})
+    assert filled == (
+        "| NAME | VALUE |\n| :-- | --: |\n| TOTAL | 12 |\n"
+        "<table><tr><td rowspan=\"2\">GROUP</td><td>1.0</td></tr></table>"
+    )
+    assert fill_cells(table, cells, {}) == table
@@ -0,0 +1,40 @@
+"""
+语言检测测试
+"""
+
+import pytest
+
+from src.utils.text import detect_language, is_in_language
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("本文提出了一种基于深度学习的颅面异常检测方法。", "zh"),
+    ("我们使用ResNet-50作为骨干网络进行特征提取和分类。", "zh"),
+    ("これは日本語の文章です。テストします。", "ja"),
+    ("이 문장은 한국어로 작성되었습니다 테스트", "ko"),
+    ("Это предложение написано на русском языке.", "ru"),
+    ("The proposed method is evaluated on the dataset.", "en"),
+    ("Der Hund ist in dem Haus und die Katze auch.", "de"),
+])
+def test_detects_dominant_language(text, expected):
+    assert detect_language(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "中文",
+    "OK 好",
+    "Hello",
+    "42 $x$",
+    "Table 1: 实验结果",
+    "Fig. 3 模型架构",
+    "Figure 2: 不同方法的结果",
+])
+def test_short_or_mixed_text_is_undetermined(text):
+    assert detect_language(text) is None
+
+
+def test_is_in_language():
+    text = "本文提出了一种基于深度学习的颅面异常检测方法。"
+    assert is_in_language(text, "zh-CN")
+    assert not is_in_language(text, "zh", source_lang="zh")
+    assert not is_in_language("Table 1: 实验结果", "zh")
@@ -0,0 +1,77 @@
+"""
+Markdown输出测试
+"""
+
+import threading
+
+import pytest
+
+from src.pdf.writer import PARTIAL_SUFFIX, MarkdownWriter
+
+
+def test_writes_in_order_and_renames_on_close(tmp_path):
+    path = tmp_path / "out" / "doc.md"
+    writer = MarkdownWriter(path)
+    partial = path.with_name(path.name + PARTIAL_SUFFIX)
+    writer.write("# 标题\n\n")
+    writer.write("")
+    writer.write("正文")
+
+    # 写入过程中内容已刷新到 .partial，目标文件尚不存在
+    assert partial.read_text(encoding="utf-8") == "# 标题\n\n正文"
+    assert not path.exists()
+    assert writer.bytes_written == len("# 标题\n\n正文".encode("utf-8"))
+
+    writer.close()
+    assert path.read_text(encoding="utf-8") == "# 标题\n\n正文"
+    assert not partial.exists()
+    writer.close()
+
+
+def test_existing_target_kept_until_close(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text("old", encoding="utf-8")
+    with MarkdownWriter(path) as writer:
+        writer.write("new")
+        assert path.read_text(encoding="utf-8") == "old"
+    assert path.read_text(encoding="utf-8") == "new"
+
+
+def test_abort_keeps_partial(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text("old", encoding="utf-8")
+    writer = MarkdownWriter(path)
+    writer.write("half")
+    writer.abort()
+    writer.close()
+    assert path.read_text(encoding="utf-8") == "old"
+    assert writer.partial_path.read_text(encoding="utf-8") == "half"
+
+
+def test_context_manager_aborts_on_exception(tmp_path):
+    path = tmp_path / "doc.md"
+    with pytest.raises(RuntimeError):
+        with MarkdownWriter(path) as writer:
+            writer.write("done ")
+            raise RuntimeError("interrupted")
+    assert not path.exists()
+    assert writer.partial_path.read_text(encoding="utf-8") == "done "
+
+
+def test_concurrent_writes_are_not_interleaved(tmp_path):
+    path = tmp_path / "doc.md"
+    chunk = {name: name * 1000 + "\n" for name in "abcd"}
+
+    with MarkdownWriter(path) as writer:
+        def worker(name):
+            for _ in range(50):
+                writer.write(chunk[name])
+        threads = [threading.Thread(target=worker, args=(name,)) for name in chunk]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+    assert len(lines) == 200
+    assert all(line in chunk.values() for line in lines)